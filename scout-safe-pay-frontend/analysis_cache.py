@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Incremental Analysis Cache
+Stores per-file findings on disk, keyed by file path, content hash and the
+rule that produced them, so re-runs only re-analyze files that changed
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+# Bump when the cache layout or the meaning of stored findings changes
+ANALYZER_VERSION = '1'
+
+DEFAULT_MAX_ENTRIES = 20000
+
+_fingerprints = {}
+
+_MISSING = object()
+
+
+def content_hash(data):
+    """Stable hash of raw file bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def rule_fingerprint(rule):
+    """Hash of a rule's source, so editing a rule invalidates its cached findings
+
+    Rules built on helper modules list them in a `uses` attribute; their
+    source is part of the fingerprint too.
+    """
+    if rule not in _fingerprints:
+        try:
+            source = inspect.getsource(rule)
+            for module in getattr(rule, 'uses', ()):
+                source += inspect.getsource(module)
+        except (OSError, TypeError):
+            source = rule.__qualname__
+        _fingerprints[rule] = hashlib.blake2b(
+            f'{ANALYZER_VERSION}:{source}'.encode('utf-8'), digest_size=8
+        ).hexdigest()
+    return _fingerprints[rule]
+
+
+class AnalysisCache:
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.entries = {}
+        self.run = 0
+        self._load()
+
+    def _load(self):
+        """Read the cache file, discarding it if it was written by another version"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('analyzer_version') != ANALYZER_VERSION:
+            return
+        self.entries = data.get('files', {})
+        self.run = data.get('run', 0)
+
+    def _entry(self, source, digest=None, read=True):
+        """Cache entry for a file, revalidated against its size, mtime and hash
+
+        `digest` is the content hash when the caller already has it; with
+        `read=False` a file changed on disk gets None instead of being read.
+        """
+        st = os.stat(source.path)
+        entry = self.entries.get(source.relative_path)
+        if entry is not None and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            # Unchanged on disk - trust the stored hash without reading the file
+            entry['used'] = self.run + 1
+            return entry
+        if digest is None and not read:
+            return None
+
+        digest = digest or content_hash(source.data)
+        if entry is None or entry['hash'] != digest:
+            entry = {'hash': digest, 'checks': {}}
+            self.entries[source.relative_path] = entry
+        entry['size'] = st.st_size
+        entry['mtime_ns'] = st.st_mtime_ns
+        entry['used'] = self.run + 1
+        return entry
+
+    def has(self, source, rule):
+        """Whether up-to-date findings of `rule` for `source` are cached"""
+        cached = self._entry(source)['checks'].get(rule.__name__)
+        return cached is not None and cached['rule'] == rule_fingerprint(rule)
+
+    def cached(self, source, rule, default=None, read=True):
+        """Up-to-date cached findings of `rule` for `source`, or `default` without computing them
+
+        With `read=False` only the file's size and mtime are checked, so a file
+        changed on disk is a miss even if its content hash would still match.
+        """
+        entry = self._entry(source, read=read)
+        cached = entry['checks'].get(rule.__name__) if entry is not None else None
+        if cached is None or cached['rule'] != rule_fingerprint(rule):
+            return default
+        self.hits += 1
+        return cached['findings']
+
+    def store(self, source, rule, result, digest=None):
+        """Record findings computed elsewhere, e.g. in a worker process that also hashed the file"""
+        self.misses += 1
+        self._entry(source, digest)['checks'][rule.__name__] = {
+            'rule': rule_fingerprint(rule),
+            'findings': result,
+        }
+
+    def findings(self, source, rule):
+        """Return cached findings of `rule` for `source`, computing them on a miss"""
+        result = self.cached(source, rule, _MISSING)
+        if result is not _MISSING:
+            return result
+
+        result = rule(source.text)
+        self.store(source, rule, result)
+        return result
+
+    def prune(self, live_paths):
+        """Evict deleted files, then the least recently used entries over the size bound"""
+        live_paths = set(live_paths)
+        for path in [p for p in self.entries if p not in live_paths]:
+            del self.entries[path]
+
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self.entries, key=lambda p: self.entries[p].get('used', 0))
+            for path in oldest[:overflow]:
+                del self.entries[path]
+
+    def save(self, live_paths=None):
+        """Write the cache back to disk atomically"""
+        if live_paths is not None:
+            self.prune(live_paths)
+        self.run += 1
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # dumps() encodes in one C call; dump() streams through the pure-Python encoder
+            f.write(json.dumps({
+                'analyzer_version': ANALYZER_VERSION,
+                'run': self.run,
+                'files': self.entries,
+            }, separators=(',', ':')))
+        os.replace(tmp_path, self.path)
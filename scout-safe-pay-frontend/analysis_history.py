@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Analysis History & Budgets
+Appends every analyzer run to a local SQLite database (one row per metric,
+keyed by commit and timestamp), queries trends, and checks the run against
+the limits in analysis-budgets.json
+"""
+
+import argparse
+import fnmatch
+import json
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_DB = '.analysis-history.sqlite'
+DEFAULT_BUDGETS = 'analysis-budgets.json'
+# Branches whose merge-base pins the baseline relative budgets compare against, first found wins
+BASE_REFS = ('origin/main', 'main', 'origin/master', 'master')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    analyzer TEXT NOT NULL,
+    commit_sha TEXT,
+    branch TEXT,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_by_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs(analyzer, recorded_at);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics(name, run_id);
+"""
+
+
+def _git(base_path, *args):
+    result = subprocess.run(['git', *args], cwd=base_path, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def git_state(base_path):
+    """(commit, branch, dirty) of the checkout, or Nones outside a git repo"""
+    def git(*args):
+        return _git(base_path, *args)
+
+    commit = git('rev-parse', 'HEAD')
+    if commit is None:
+        return None, None, False
+    status = git('status', '--porcelain', '--untracked-files=no', '--', '.')
+    return commit, git('rev-parse', '--abbrev-ref', 'HEAD'), bool(status)
+
+
+def baseline_commit(base_path):
+    """The commit relative budgets are checked against: the merge-base with the main
+    branch, or the parent commit when HEAD is on the main branch itself
+
+    A fixed baseline means a regression keeps failing until it is fixed, instead of
+    becoming the reference for the next run.
+    """
+    head = _git(base_path, 'rev-parse', 'HEAD')
+    if head is None:
+        return None
+    base = next((sha for sha in (_git(base_path, 'merge-base', 'HEAD', ref) for ref in BASE_REFS) if sha), head)
+    return _git(base_path, 'rev-parse', 'HEAD~1') if base == head else base
+
+
+def collect_metrics(analyzer):
+    """Flatten an analyzer's stats, issue counts, histograms and timings into name -> number"""
+    metrics = {}
+    for name, value in analyzer.stats.items():
+        if isinstance(value, (int, float)):
+            metrics[name] = value
+    for category, issues in analyzer.issues.items():
+        metrics[f'issues.{category}'] = len(issues)
+    metrics['issues.total'] = sum(len(issues) for issues in analyzer.issues.values())
+    for breakpoint, count in getattr(analyzer, 'histograms', {}).get('breakpoints', {}).items():
+        metrics[f'breakpoint.{breakpoint}'] = count
+
+    timings = analyzer.timings.as_dict()
+    for check, record in timings.items():
+        for field, value in record.items():
+            metrics[f'time.{check}.{field}'] = value
+    metrics['time.total.wall_ms'] = round(sum(r['wall_ms'] for r in timings.values()), 2)
+    return metrics
+
+
+class AnalysisHistory:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(self, analyzer, metrics, base_path='.'):
+        """Store one run and its metrics; returns the run id"""
+        commit, branch, dirty = git_state(base_path)
+        with self.db:
+            cursor = self.db.execute(
+                'INSERT INTO runs (analyzer, commit_sha, branch, dirty, recorded_at) VALUES (?, ?, ?, ?, ?)',
+                (analyzer, commit, branch, int(dirty), datetime.now(timezone.utc).isoformat(timespec='seconds')))
+            run_id = cursor.lastrowid
+            self.db.executemany('INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)',
+                                [(run_id, name, value) for name, value in sorted(metrics.items())])
+        return run_id
+
+    def metrics(self, run_id):
+        return dict(self.db.execute('SELECT name, value FROM metrics WHERE run_id = ?', (run_id,)))
+
+    def previous(self, analyzer, run_id):
+        """Id of the run of the same analyzer before `run_id`, or None"""
+        row = self.db.execute('SELECT id FROM runs WHERE analyzer = ? AND id < ? ORDER BY id DESC LIMIT 1',
+                              (analyzer, run_id)).fetchone()
+        return row[0] if row else None
+
+    def latest(self, analyzer, commit=None, clean=False):
+        """Id of the newest run of an analyzer, optionally on a given commit (prefix) without local changes"""
+        query = 'SELECT id FROM runs WHERE analyzer = ?'
+        params = [analyzer]
+        if commit:
+            query += ' AND commit_sha LIKE ?'
+            params.append(f'{commit}%')
+        if clean:
+            query += ' AND dirty = 0'
+        row = self.db.execute(query + ' ORDER BY id DESC LIMIT 1', params).fetchone()
+        return row[0] if row else None
+
+    def runs(self, analyzer=None, limit=20):
+        query = 'SELECT id, analyzer, commit_sha, branch, dirty, recorded_at FROM runs'
+        params = []
+        if analyzer:
+            query += ' WHERE analyzer = ?'
+            params.append(analyzer)
+        return self.db.execute(query + ' ORDER BY id DESC LIMIT ?', params + [limit]).fetchall()[::-1]
+
+    def trend(self, metric, analyzer=None, limit=20):
+        """(run id, analyzer, commit, recorded at, value) for the newest runs, oldest first"""
+        query = ('SELECT r.id, r.analyzer, r.commit_sha, r.recorded_at, m.value '
+                 'FROM metrics m JOIN runs r ON r.id = m.run_id WHERE m.name = ?')
+        params = [metric]
+        if analyzer:
+            query += ' AND r.analyzer = ?'
+            params.append(analyzer)
+        return self.db.execute(query + ' ORDER BY r.id DESC LIMIT ?', params + [limit]).fetchall()[::-1]
+
+    def metric_names(self, analyzer=None):
+        query = 'SELECT DISTINCT m.name FROM metrics m JOIN runs r ON r.id = m.run_id'
+        params = []
+        if analyzer:
+            query += ' WHERE r.analyzer = ?'
+            params.append(analyzer)
+        return [name for (name,) in self.db.execute(query + ' ORDER BY m.name', params)]
+
+
+def load_budgets(path, analyzer):
+    """Budget rules for one analyzer: {metric or glob: {max, max_increase, max_increase_pct}}"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get(analyzer, {})
+
+
+def check_budgets(budgets, metrics, baseline=None):
+    """Human-readable violations of the budgets by `metrics`, relative to `baseline` metrics"""
+    violations = []
+    for pattern, limits in budgets.items():
+        for name in sorted(fnmatch.filter(metrics, pattern)):
+            value = metrics[name]
+            if 'max' in limits and value > limits['max']:
+                violations.append(f"{name} = {value:g} exceeds the budget of {limits['max']:g}")
+            if not baseline or name not in baseline:
+                continue
+            before = baseline[name]
+            if 'max_increase' in limits and value - before > limits['max_increase']:
+                violations.append(f"{name} rose from {before:g} to {value:g} "
+                                  f"(allowed +{limits['max_increase']:g})")
+            # Relative limits only mean something above a noise floor (e.g. a few ms)
+            if ('max_increase_pct' in limits and before > limits.get('min_value', 0)
+                    and 100 * (value - before) / before > limits['max_increase_pct']):
+                violations.append(f"{name} rose {100 * (value - before) / before:.0f}% "
+                                  f"from {before:g} to {value:g} (allowed +{limits['max_increase_pct']:g}%)")
+    return violations
+
+
+def record_run(analyzer_name, analyzer, base_path, budgets_path=None, db_path=None, enforced=()):
+    """Append the run to the history and check it against the budgets; returns the violations
+
+    `enforced` budget patterns already had their absolute 'max' checked by the analyzer,
+    so only their growth against the baseline is checked here.
+    """
+    base_path = Path(base_path)
+    history = AnalysisHistory(db_path or base_path / DEFAULT_DB)
+    try:
+        metrics = collect_metrics(analyzer)
+        run_id = history.record(analyzer_name, metrics, base_path)
+        commit = baseline_commit(base_path)
+        baseline_id = history.latest(analyzer_name, commit, clean=True) if commit else None
+        baseline = history.metrics(baseline_id) if baseline_id else None
+    finally:
+        history.close()
+
+    budgets = load_budgets(budgets_path or base_path / DEFAULT_BUDGETS, analyzer_name)
+    for pattern in enforced:
+        if pattern in budgets:
+            budgets[pattern] = {k: v for k, v in budgets[pattern].items() if k != 'max'}
+    violations = check_budgets(budgets, metrics, baseline)
+    print(f"\n🗄️  Recorded run #{run_id} ({len(metrics)} metrics) in {DEFAULT_DB}")
+    if baseline_id:
+        print(f"   📌 Budgets checked against run #{baseline_id} on {commit[:10]}")
+    else:
+        print(f"   ℹ️  No clean run recorded on {commit[:10] if commit else 'the base commit'} - only absolute limits checked")
+    if violations:
+        print("\n🚨 PERFORMANCE BUDGET EXCEEDED:")
+        for violation in violations:
+            print(f"   • {violation}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the analysis history')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--analyzer', choices=['comprehensive', 'responsive'], help='only this analyzer')
+    parser.add_argument('--trend', metavar='METRIC', help='show a metric over the recent runs')
+    parser.add_argument('--metrics', action='store_true', help='list recorded metric names')
+    parser.add_argument('--check', metavar='COMMIT', nargs='?', const='',
+                        help='re-check the latest run against the budgets, relative to a commit '
+                             '(default: the merge-base with the main branch)')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    db_path = base_path / DEFAULT_DB
+    if not db_path.exists():
+        print(f"❌ No history yet - run an analyzer first ({db_path})")
+        return 1
+    history = AnalysisHistory(db_path)
+
+    try:
+        if args.trend:
+            rows = history.trend(args.trend, args.analyzer, args.limit)
+            if not rows:
+                print(f"❌ No values recorded for {args.trend}")
+                return 1
+            print(f"📈 {args.trend}:")
+            previous = None
+            for run_id, analyzer, commit, recorded_at, value in rows:
+                change = '' if previous is None or value == previous else f"  ({value - previous:+g})"
+                print(f"   #{run_id:<5} {recorded_at}  {(commit or '-')[:10]:<10}  {analyzer:<13} {value:>12g}{change}")
+                previous = value
+        elif args.metrics:
+            for name in history.metric_names(args.analyzer):
+                print(name)
+        elif args.check is not None:
+            failed = False
+            for analyzer in [args.analyzer] if args.analyzer else ['comprehensive', 'responsive']:
+                run_id = history.latest(analyzer)
+                if run_id is None:
+                    continue
+                commit = args.check or baseline_commit(base_path)
+                baseline_id = history.latest(analyzer, commit, clean=not args.check) if commit else None
+                violations = check_budgets(load_budgets(base_path / DEFAULT_BUDGETS, analyzer),
+                                           history.metrics(run_id),
+                                           history.metrics(baseline_id) if baseline_id else None)
+                print(f"{'🚨' if violations else '✅'} {analyzer} run #{run_id}: {len(violations)} budget violations")
+                for violation in violations:
+                    print(f"   • {violation}")
+                failed = failed or bool(violations)
+            return 1 if failed else 0
+        else:
+            for run_id, analyzer, commit, branch, dirty, recorded_at in history.runs(args.analyzer, args.limit):
+                print(f"   #{run_id:<5} {recorded_at}  {analyzer:<13} {(commit or '-')[:10]} "
+                      f"{branch or ''}{' (dirty)' if dirty else ''}")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
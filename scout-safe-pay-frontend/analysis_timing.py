@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Analyzer Instrumentation
+Records wall time, CPU time, files and bytes read, regex evaluations and
+memory for every analyzer check, with an optional cProfile hook per check
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import re
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class _RegexCounter:
+    """Drop-in for the `re` functions the rules use, counting every evaluation"""
+
+    def __init__(self):
+        self.evaluations = 0
+
+    def search(self, pattern, string, flags=0):
+        self.evaluations += 1
+        return re.search(pattern, string, flags)
+
+    def match(self, pattern, string, flags=0):
+        self.evaluations += 1
+        return re.match(pattern, string, flags)
+
+    def findall(self, pattern, string, flags=0):
+        self.evaluations += 1
+        return re.findall(pattern, string, flags)
+
+    def finditer(self, pattern, string, flags=0):
+        self.evaluations += 1
+        return re.finditer(pattern, string, flags)
+
+    def sub(self, pattern, repl, string, count=0, flags=0):
+        self.evaluations += 1
+        return re.sub(pattern, repl, string, count=count, flags=flags)
+
+    def compile(self, pattern, flags=0):
+        return _CountedPattern(self, re.compile(pattern, flags))
+
+
+class _CountedPattern:
+    __slots__ = ('_counter', 'pattern')
+
+    def __init__(self, counter, pattern):
+        self._counter = counter
+        self.pattern = pattern
+
+    def search(self, *args):
+        self._counter.evaluations += 1
+        return self.pattern.search(*args)
+
+    def match(self, *args):
+        self._counter.evaluations += 1
+        return self.pattern.match(*args)
+
+    def findall(self, *args):
+        self._counter.evaluations += 1
+        return self.pattern.findall(*args)
+
+    def finditer(self, *args):
+        self._counter.evaluations += 1
+        return self.pattern.finditer(*args)
+
+    def sub(self, *args, **kwargs):
+        self._counter.evaluations += 1
+        return self.pattern.sub(*args, **kwargs)
+
+
+# Rules call regex.search(...) instead of re.search(...) so evaluations are counted
+regex = _RegexCounter()
+
+
+def _peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class CheckTimings:
+    def __init__(self, profile=(), trace_memory=False, profile_dir=None):
+        # Check names to run under cProfile, or 'all'
+        self.profile = set(profile)
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.records = {}
+        self._current = None
+
+    def add_io(self, files, nbytes, regex_evaluations=0):
+        """Count reads (and regex evaluations) a check does outside the shared corpus or process"""
+        if self._current is not None:
+            self._current['files_read'] += files
+            self._current['bytes_read'] += nbytes
+            self._current['regex_evaluations'] += regex_evaluations
+
+    @contextmanager
+    def measure(self, name, corpus=None):
+        record = {'files_read': 0, 'bytes_read': 0, 'regex_evaluations': 0}
+        outer, self._current = self._current, record
+        files_before = corpus.files_read if corpus is not None else 0
+        bytes_before = corpus.bytes_read if corpus is not None else 0
+        regex_before = regex.evaluations
+        rss_before = _peak_rss_kb()
+
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        profiler = None
+        if 'all' in self.profile or name in self.profile:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_ms'] = round((time.perf_counter() - wall) * 1000, 2)
+            record['cpu_ms'] = round((time.process_time() - cpu) * 1000, 2)
+            if profiler is not None:
+                profiler.disable()
+                record['profile'] = self._save_profile(name, profiler)
+            if corpus is not None:
+                record['files_read'] += corpus.files_read - files_before
+                record['bytes_read'] += corpus.bytes_read - bytes_before
+            record['regex_evaluations'] += regex.evaluations - regex_before
+            record['peak_rss_kb'] = _peak_rss_kb()
+            record['rss_growth_kb'] = record['peak_rss_kb'] - rss_before
+            if tracing:
+                record['peak_traced_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                tracemalloc.stop()
+            self._current = outer
+            self.records[name] = record
+
+    def _save_profile(self, name, profiler):
+        """Dump a .prof file (when a directory is configured) and return the top entries"""
+        if self.profile_dir is not None:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(self.profile_dir / f'{name}.prof')
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(8)
+        return out.getvalue()
+
+    def as_dict(self):
+        """Timings for the JSON report, without the bulky profile text"""
+        return {name: {k: v for k, v in record.items() if k != 'profile'}
+                for name, record in self.records.items()}
+
+    def print_summary(self):
+        if not self.records:
+            return
+        print("\n⏱️  CHECK TIMINGS:")
+        print(f"  {'check':<28}{'wall ms':>10}{'cpu ms':>10}{'files':>8}{'KiB read':>10}{'regex':>9}{'rss KiB':>10}")
+        for name, record in self.records.items():
+            print(f"  {name:<28}{record['wall_ms']:>10.1f}{record['cpu_ms']:>10.1f}"
+                  f"{record['files_read']:>8}{record['bytes_read'] / 1024:>10.1f}"
+                  f"{record['regex_evaluations']:>9}{record['peak_rss_kb']:>10}")
+        for name, record in self.records.items():
+            if 'profile' in record:
+                print(f"\n  🔬 cProfile for {name}:")
+                print(record['profile'])
+
+
+def instrumented(method):
+    """Record timings for an analyzer method in self.timings"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.timings.measure(method.__name__, self.corpus):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Analysis Watch Mode
+Keeps ApplicationAnalyzer and ResponsiveAnalyzer warm in one process,
+re-runs only the checks affected by edits under src/ and messages/, and
+answers report queries from memory over a Unix socket
+
+    python3 analysis_watch.py [base_path]                  # start the daemon
+    python3 analysis_watch.py [base_path] --query report   # full report
+    python3 analysis_watch.py [base_path] --query issues src/components/x.tsx
+"""
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import importlib.util
+import io
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+from analysis_cache import AnalysisCache
+from finding_stream import FindingList, FindingStream
+from source_corpus import SourceCorpus
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SOCKET_NAME = 'watch.sock'
+
+# Quiet period that groups the burst of events an editor save produces
+DEBOUNCE_SECONDS = 0.1
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+def load_script(filename, module_name):
+    """Import one of the hyphenated analysis scripts as a module"""
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _is_source(path):
+    return path.startswith('src/') and path.endswith(('.ts', '.tsx'))
+
+
+def _is_page(path):
+    return path.startswith('src/app/[locale]/') and path.endswith('/page.tsx')
+
+
+# (analyzer, check method, does a changed relative path affect it?)
+CHECKS = (
+    ('comprehensive', 'check_i18n_config', lambda p: p.startswith('src/i18n/') or p == 'middleware.ts'),
+    ('comprehensive', 'analyze_translations', lambda p: p.startswith('messages/') and p.endswith('.json')),
+    ('comprehensive', 'analyze_translation_parity', lambda p: p.startswith('messages/') and p.endswith('.json')),
+    ('comprehensive', 'analyze_imports', _is_source),
+    ('comprehensive', 'analyze_client_bundles', lambda p: _is_source(p) or p.startswith('next.config.')),
+    ('comprehensive', 'analyze_pages', _is_page),
+    ('comprehensive', 'check_api_config', lambda p: p in ('.env.local', 'src/lib/api/client.ts')),
+    ('responsive', 'analyze_responsive_classes', _is_source),
+    ('responsive', 'check_mobile_optimization',
+     lambda p: p in ('src/app/[locale]/layout.tsx', 'tailwind.config.js')),
+    ('responsive', 'check_performance', lambda p: _is_source(p) and p.endswith('.tsx')),
+    ('responsive', 'check_accessibility', lambda p: _is_source(p) and p.endswith('.tsx')),
+    ('responsive', 'audit_images', lambda p: _is_source(p) or p.startswith('public/')),
+)
+
+
+class AnalysisState:
+    """Per-check results held in memory and merged into a report on demand"""
+
+    def __init__(self, base_path):
+        self.base_path = Path(base_path).resolve()
+        self.corpus = SourceCorpus(self.base_path)
+        comprehensive = load_script('comprehensive-analysis.py', 'comprehensive_analysis')
+        responsive = load_script('analyze-responsive.py', 'analyze_responsive')
+        cache_dir = self.base_path / '.analysis-cache'
+        self.analyzers = {
+            'comprehensive': (comprehensive.ApplicationAnalyzer, AnalysisCache(cache_dir / 'comprehensive.json')),
+            'responsive': (responsive.ResponsiveAnalyzer, AnalysisCache(cache_dir / 'responsive.json')),
+        }
+        self.results = {}
+        self.lock = threading.Lock()
+        self.generation = 0
+
+    def run_check(self, analyzer_name, check):
+        """Run one check on a fresh analyzer sharing the warm corpus and cache"""
+        cls, cache = self.analyzers[analyzer_name]
+        # Every individual finding is kept; the issue summaries are truncated
+        findings = FindingList()
+        analyzer = cls(self.base_path, corpus=self.corpus, cache=cache,
+                       stream=FindingStream(analyzer_name, [findings]))
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(analyzer, check)()
+        return {
+            'stats': dict(analyzer.stats),
+            'issues': {k: v for k, v in analyzer.issues.items() if v},
+            'coverage': getattr(analyzer, 'coverage', None) or None,
+            'findings': findings.findings,
+        }
+
+    def refresh(self, changed=None):
+        """Re-run every check, or only those affected by the changed paths"""
+        if changed is not None:
+            self.corpus.invalidate(changed)
+        updated = {}
+        for analyzer_name, check, affects in CHECKS:
+            if changed is None or any(affects(path) for path in changed):
+                try:
+                    updated[(analyzer_name, check)] = self.run_check(analyzer_name, check)
+                except Exception as e:
+                    # Typically a half-written file; keep the last good result
+                    print(f"   ⚠️  {check} failed: {e}", flush=True)
+        with self.lock:
+            self.results.update(updated)
+            self.generation += 1
+        return [check for _, check in updated]
+
+    def report(self):
+        """Merge per-check results in check order, like a full run would produce"""
+        with self.lock:
+            report = {name: {'stats': {}, 'issues': {}} for name in self.analyzers}
+            for analyzer_name, check, _ in CHECKS:
+                result = self.results.get((analyzer_name, check))
+                if result is None:
+                    continue
+                section = report[analyzer_name]
+                section['stats'].update(result['stats'])
+                for category, issues in result['issues'].items():
+                    section['issues'].setdefault(category, []).extend(issues)
+                if result['coverage']:
+                    section['coverage'] = result['coverage']
+            report['generation'] = self.generation
+            return report
+
+    def issues_for(self, relative_path):
+        """Every finding located in the given file, in check order"""
+        found = []
+        with self.lock:
+            for analyzer_name, check, _ in CHECKS:
+                result = self.results.get((analyzer_name, check))
+                if result is None:
+                    continue
+                found.extend(finding for finding in result['findings'] if finding['file'] == relative_path)
+        return found
+
+    def save(self):
+        live = [f.relative_path for f in self.corpus.files()]
+        for _, cache in self.analyzers.values():
+            cache.save(live)
+
+
+class Inotify:
+    """Recursive directory watcher on top of inotify(7) via ctypes"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.watches = {}
+
+    def watch(self, directory, recursive=True):
+        directory = Path(directory)
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return
+        self.watches[wd] = directory
+        if recursive:
+            for child in directory.iterdir():
+                if child.is_dir() and child.name != 'node_modules':
+                    self.watch(child)
+
+    def read(self, timeout=None):
+        """Block until events arrive, then return the set of changed paths"""
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                data = b''
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                path = directory / name
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self.watch(path)
+                    continue
+                changed.add(path)
+            # Keep collecting until the editor has finished writing
+            ready, _, _ = select.select([self.fd], [], [], DEBOUNCE_SECONDS)
+        return changed
+
+
+class Poller:
+    """Fallback for platforms without inotify: compare mtimes once a second"""
+
+    def __init__(self):
+        self.roots = []
+        self.snapshot = {}
+
+    def watch(self, directory, recursive=True):
+        self.roots.append((Path(directory), recursive))
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        state = {}
+        for root, recursive in self.roots:
+            paths = root.rglob('*') if recursive else root.iterdir()
+            for path in paths:
+                if path.is_file() and 'node_modules' not in path.parts:
+                    state[path] = path.stat().st_mtime_ns
+        return state
+
+    def read(self, timeout=None):
+        time.sleep(timeout or 1.0)
+        current = self._scan()
+        changed = {p for p in current.keys() | self.snapshot.keys()
+                   if current.get(p) != self.snapshot.get(p)}
+        self.snapshot = current
+        return changed
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        state = self.server.state
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                command = request.get('cmd')
+                if command == 'report':
+                    response = state.report()
+                elif command == 'issues':
+                    response = {'file': request['file'], 'issues': state.issues_for(request['file'])}
+                elif command == 'status':
+                    response = {'generation': state.generation, 'files': len(state.corpus.files())}
+                else:
+                    response = {'error': f'unknown command {command!r}'}
+            except (ValueError, KeyError) as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class QueryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, state):
+        self.state = state
+        super().__init__(str(path), _QueryHandler)
+
+
+def query(socket_path, request):
+    """Send one request to a running daemon and return its decoded response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+def serve(base_path):
+    state = AnalysisState(base_path)
+    started = time.perf_counter()
+    state.refresh()
+    print(f"🔭 Initial analysis of {len(state.corpus.files())} files in {time.perf_counter() - started:.2f}s")
+
+    try:
+        watcher = Inotify()
+    except (OSError, AttributeError, TypeError):
+        print("   ℹ️  inotify unavailable - polling for changes")
+        watcher = Poller()
+    for directory in ('src', 'messages', 'public'):
+        if (state.base_path / directory).exists():
+            watcher.watch(state.base_path / directory)
+    watcher.watch(state.base_path, recursive=False)
+
+    socket_path = state.base_path / '.analysis-cache' / SOCKET_NAME
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()
+    server = QueryServer(socket_path, state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📡 Answering queries on {socket_path.relative_to(state.base_path)}")
+
+    try:
+        while True:
+            changed = watcher.read()
+            started = time.perf_counter()
+            if changed is None:
+                # Event queue overflowed - start over
+                state.corpus.reset()
+                relative = None
+            else:
+                relative = {str(p.relative_to(state.base_path)) for p in changed
+                            if state.base_path in p.parents}
+                if not relative:
+                    continue
+            rerun = state.refresh(relative)
+            if not rerun:
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"   ↻ {', '.join(sorted(relative)) if relative else 'everything'}: "
+                  f"re-ran {', '.join(rerun)} in {elapsed:.0f} ms", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        socket_path.unlink(missing_ok=True)
+        state.save()
+        print("\n👋 Watch mode stopped, analysis cache saved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep the analyzers warm and re-run them on file changes')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--query', nargs='+', metavar='CMD',
+                        help='query a running daemon: report | status | issues <file>')
+    args = parser.parse_args()
+
+    if not args.query:
+        serve(args.base_path)
+        return 0
+
+    socket_path = Path(args.base_path) / '.analysis-cache' / SOCKET_NAME
+    request = {'cmd': args.query[0]}
+    if args.query[0] == 'issues':
+        request['file'] = args.query[1]
+    response = query(socket_path, request)
+    print(json.dumps(response, indent=2))
+    # Non-zero exit when a file has issues, for use in pre-commit hooks
+    return 1 if response.get('issues') else 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -3,81 +3,178 @@
 Responsive Design & Mobile Optimization Analysis
 """
 
-import re
+import argparse
+import os
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+from analysis_cache import AnalysisCache
+from analysis_history import DEFAULT_BUDGETS, DEFAULT_DB, check_budgets, load_budgets, record_run
+from analysis_timing import CheckTimings, instrumented, regex
+from finding_stream import FindingStream
+import image_audit
+from image_audit import audit, public_references, scan_image_refs
+from next_build import load_build, metric_route
+from rule_engine import RuleEngine, rule
+from source_corpus import SourceCorpus
+from tailwind_lexer import BREAKPOINTS
+
+@rule('src/**/*.{tsx,ts}', needs=('classes',))
+def scan_responsive(classes):
+    """Per-file responsive rules over the lexed class tokens"""
+    findings = {
+        'breakpoints': classes['breakpoints'],
+        'variants': classes['variants'],
+        'utilities': classes['utilities'],
+        'issues': []
+    }
+    
+    # Fixed sizes on an element with no responsive override for that axis
+    for fixed in classes['fixed_sizes']:
+        if fixed['axis'] == 'w':
+            issue = 'Fixed width without responsive breakpoint'
+        else:
+            issue = 'Fixed height - might overflow on mobile'
+        findings['issues'].append({'line': fixed['line'], 'issue': issue, 'class': fixed['class']})
+    
+    return findings
+
+@rule('src/**/*.tsx')
+def scan_performance(content):
+    """Per-file image usage rules"""
+    return {
+        'next_image': 'next/image' in content,
+        'img_tag': regex.search(r'<img\s', content) is not None
+    }
+
+@rule('src/**/*.tsx', needs=('jsx',), contains='<img', default={'missing_alt': False})
+def scan_accessibility(jsx):
+    """Per-file accessibility rules"""
+    # Check for images without alt; a spread may pass one through
+    return {
+        'missing_alt': any(element['name'] == 'img' and 'alt' not in element['attributes'] and not element['spread']
+                           for element in jsx)
+    }
+
+@rule('src/**', uses=(image_audit,))
+def scan_images(content):
+    """Per-file references to images served from public/"""
+    return scan_image_refs(content)
+
+# Every per-file rule, run together in one traversal of src/
+RULES = (scan_responsive, scan_performance, scan_accessibility, scan_images)
 
 class ResponsiveAnalyzer:
-    def __init__(self, base_path):
+    def __init__(self, base_path, corpus=None, use_cache=True, cache=None, timings=None, budgets=None,
+                 stream=None):
         self.base_path = Path(base_path)
+        self.budgets_path = Path(budgets) if budgets else self.base_path / DEFAULT_BUDGETS
+        self.corpus = corpus or SourceCorpus(self.base_path)
+        self.timings = timings or CheckTimings()
+        self.cache = cache
+        if self.cache is None and use_cache:
+            self.cache = AnalysisCache(self.base_path / '.analysis-cache' / 'responsive.json')
         self.issues = defaultdict(list)
         self.stats = defaultdict(int)
-        
+        self.histograms = {}
+        # Every individual finding, written out as it is found; issues keep the summaries
+        self.stream = stream or FindingStream('responsive')
+        self.engine = RuleEngine(RULES, self.cache)
+        self._findings = None
+        # Absolute bundle limits are checked by check_bundles, not again by the run history
+        self.bundle_budgets = []
+        self.bundle_violations = []
+    
+    @instrumented
+    def scan(self, jobs=1):
+        """Run every per-file rule in one pass over the corpus, on N processes if jobs > 1"""
+        print("🗂️  Scanning source files...")
+        self._findings = self.engine.run(self.corpus, jobs)
+        worker_io = self.engine.worker_io
+        self.timings.add_io(worker_io['files_read'], worker_io['bytes_read'], worker_io['regex_evaluations'])
+        stats = self.engine.stats
+        print(f"   ✓ {len(RULES)} rules over {stats['files']} files "
+              f"({stats['computed']} results computed, {stats['reused']} reused)\n")
+    
+    def findings(self, rule):
+        """{relative path: findings} of one per-file rule, scanning on first use"""
+        if self._findings is None:
+            self.scan()
+        return self._findings[rule.__name__]
+    
+    @instrumented
     def analyze_responsive_classes(self):
         """Check for responsive design patterns"""
         print("📱 Analyzing responsive design...")
         
-        src_path = self.base_path / 'src'
-        files = list(src_path.rglob('*.tsx')) + list(src_path.rglob('*.ts'))
+        files = self.findings(scan_responsive)
         
-        responsive_patterns = {
-            'sm:': 0,  # 640px
-            'md:': 0,  # 768px
-            'lg:': 0,  # 1024px
-            'xl:': 0,  # 1280px
-            '2xl:': 0, # 1536px
-        }
+        # sm: 640px, md: 768px, lg: 1024px, xl: 1280px, 2xl: 1536px
+        responsive_patterns = Counter({breakpoint: 0 for breakpoint in BREAKPOINTS})
+        variants = Counter()
+        utilities = Counter()
         
+        # Only the first few are kept for the report; the stream gets all of them
         mobile_issues = []
+        fixed_widths = fixed_heights = 0
+        files_with_responsive = 0
         
-        for file in files:
-            content = file.read_text(encoding='utf-8')
+        for path, findings in files.items():
             
             # Count responsive classes
-            for pattern in responsive_patterns:
-                responsive_patterns[pattern] += content.count(pattern)
+            responsive_patterns.update(findings['breakpoints'])
+            variants.update(findings['variants'])
+            utilities.update(findings['utilities'])
+            if findings['breakpoints']:
+                files_with_responsive += 1
             
-            # Check for potential mobile issues
-            if 'className=' in content:
-                # Fixed widths without responsive
-                if re.search(r'w-\d{3,}(?!\s+(sm:|md:|lg:|xl:))', content):
-                    mobile_issues.append({
-                        'file': str(file.relative_to(self.base_path)),
-                        'issue': 'Fixed width without responsive breakpoint'
-                    })
-                
-                # Fixed heights that might overflow
-                if re.search(r'h-\d{3,}', content):
-                    mobile_issues.append({
-                        'file': str(file.relative_to(self.base_path)),
-                        'issue': 'Fixed height - might overflow on mobile'
-                    })
+            for issue in findings['issues']:
+                if issue['issue'].startswith('Fixed width'):
+                    fixed_widths += 1
+                    kind = 'fixed_width'
+                else:
+                    fixed_heights += 1
+                    kind = 'fixed_height'
+                self.stream.emit('mobile', kind, f"{issue['issue']} ({issue['class']})",
+                                 file=path, line=issue['line'], **{'class': issue['class']})
+                if len(mobile_issues) < 10:
+                    mobile_issues.append({'file': path, **issue})
         
         self.stats['responsive_classes'] = sum(responsive_patterns.values())
-        self.stats['files_with_responsive'] = len([f for f in files if any(
-            p in f.read_text(encoding='utf-8') for p in responsive_patterns
-        )])
+        self.stats['files_with_responsive'] = files_with_responsive
+        self.stats['fixed_width_classes'] = fixed_widths
+        self.stats['fixed_height_classes'] = fixed_heights
         
         if len(mobile_issues) > 0:
-            self.issues['mobile'].extend(mobile_issues[:10])
+            self.issues['mobile'].extend(mobile_issues)
+        
+        self.histograms = {
+            'breakpoints': dict(responsive_patterns),
+            'variants': dict(variants.most_common()),
+            'utilities': dict(utilities.most_common()),
+        }
         
         print(f"   ✓ Found {self.stats['responsive_classes']} responsive classes")
         print(f"   📊 Responsive breakdown:")
-        for pattern, count in responsive_patterns.items():
-            print(f"      {pattern} {count} usages")
+        for breakpoint, count in responsive_patterns.items():
+            print(f"      {breakpoint}: {count} usages")
+        print(f"   📊 Top variants: " + ', '.join(f'{v} ({n})' for v, n in variants.most_common(5)))
+        print(f"   📊 Top utilities: " + ', '.join(f'{u} ({n})' for u, n in utilities.most_common(8)))
     
+    @instrumented
     def check_mobile_optimization(self):
         """Check mobile-specific optimizations"""
         print("\n📱 Checking mobile optimizations...")
         
         # Check for viewport meta tag
-        layout_file = self.base_path / 'src' / 'app' / '[locale]' / 'layout.tsx'
-        if layout_file.exists():
-            content = layout_file.read_text()
+        layout_file = self.corpus.get(Path('src') / 'app' / '[locale]' / 'layout.tsx')
+        if layout_file is not None:
+            content = layout_file.text
             if 'viewport' in content:
                 print("   ✓ Viewport meta tag configured")
             else:
                 self.issues['mobile'].append('Missing viewport meta tag')
+                self.stream.emit('mobile', 'missing_viewport', 'Missing viewport meta tag', file=layout_file.relative_path)
         
         # Check for touch-friendly sizes (min 44x44px)
         print("   ℹ️  Button sizes should be minimum 44x44px for touch")
@@ -89,27 +186,25 @@ class ResponsiveAnalyzer:
             if 'overflow-x-hidden' in content or 'max-w' in content:
                 print("   ✓ Overflow prevention configured")
     
+    @instrumented
     def check_performance(self):
         """Check performance optimizations"""
         print("\n⚡ Checking performance optimizations...")
         
         # Check for Image component usage
-        src_path = self.base_path / 'src'
-        files = list(src_path.rglob('*.tsx'))
-        
         using_next_image = 0
         using_img_tag = 0
         
-        for file in files:
-            content = file.read_text(encoding='utf-8')
-            if 'next/image' in content:
+        for path, findings in self.findings(scan_performance).items():
+            if findings['next_image']:
                 using_next_image += 1
-            if re.search(r'<img\s', content):
+            if findings['img_tag']:
                 using_img_tag += 1
                 self.issues['performance'].append({
-                    'file': str(file.relative_to(self.base_path)),
+                    'file': path,
                     'issue': 'Using <img> instead of Next.js Image component'
                 })
+                self.stream.emit('performance', 'img_tag', 'Using <img> instead of Next.js Image component', file=path)
         
         self.stats['next_image_usage'] = using_next_image
         self.stats['img_tag_usage'] = using_img_tag
@@ -118,35 +213,66 @@ class ResponsiveAnalyzer:
         print(f"   <img> tag usage: {using_img_tag} files")
         
         # Check for font optimization
-        layout_file = self.base_path / 'src' / 'app' / '[locale]' / 'layout.tsx'
-        if layout_file.exists():
-            content = layout_file.read_text()
+        layout_file = self.corpus.get(Path('src') / 'app' / '[locale]' / 'layout.tsx')
+        if layout_file is not None:
+            content = layout_file.text
             if 'next/font' in content:
                 print("   ✓ Font optimization enabled")
             else:
                 print("   ⚠️  Consider using next/font for better performance")
+        
+        # First-load JS per route, from .next/ or the saved `next build` output
+        build = load_build(self.base_path)
+        if build is None:
+            print("   ⚠️  No build output found - run `next build` to check bundle sizes")
+        else:
+            self.check_bundles(build)
     
+    def check_bundles(self, build):
+        """Attribute first-load JS per route and hold it to the bundle budgets"""
+        for error in build['errors']:
+            self.issues['bundles'].append({'file': build['source'], 'issue': f'Last build failed: {error}'})
+            self.stream.emit('bundles', 'build_failed', f'Last build failed: {error}', file=build['source'], level='error')
+        
+        metrics = {}
+        for route, entry in build['routes'].items():
+            if entry['first_load'] is not None:
+                metrics[f"bundle.{metric_route(route)}.first_load_kb"] = round(entry['first_load'] / 1000, 1)
+        if build['shared_total'] is not None:
+            metrics['first_load_shared_kb'] = round(build['shared_total'] / 1000, 1)
+        self.stats.update(metrics)
+        
+        sized = [m for m in metrics if m.startswith('bundle.')]
+        if sized:
+            largest = max(sized, key=metrics.get)
+            self.stats['first_load_max_kb'] = metrics[largest]
+            print(f"   First-load JS: {len(sized)} routes, shared {metrics.get('first_load_shared_kb', 0)} kB, "
+                  f"largest {largest[len('bundle.'):-len('.first_load_kb')]} at {metrics[largest]} kB")
+        elif build['errors']:
+            print(f"   ❌ Last build failed - no bundle sizes ({build['source']})")
+        
+        # Absolute per-route limits; growth against earlier runs is checked by the run history
+        budgets = {pattern: limits for pattern, limits in load_budgets(self.budgets_path, 'responsive').items()
+                   if pattern.startswith(('bundle.', 'first_load_'))}
+        self.bundle_budgets = list(budgets)
+        self.bundle_violations = check_budgets(budgets, metrics)
+        for violation in self.bundle_violations:
+            self.issues['bundles'].append(violation)
+            self.stream.emit('bundles', 'budget_exceeded', violation,
+                             file=os.path.relpath(self.budgets_path, self.base_path), level='error')
+    
+    @instrumented
     def check_accessibility(self):
         """Check accessibility features"""
         print("\n♿ Checking accessibility...")
         
-        src_path = self.base_path / 'src'
-        files = list(src_path.rglob('*.tsx'))
-        
         missing_alt = []
         missing_aria = []
         
-        for file in files:
-            content = file.read_text(encoding='utf-8')
-            
-            # Check for images without alt
-            if '<img' in content and 'alt=' not in content and 'next/image' not in content:
-                missing_alt.append(str(file.relative_to(self.base_path)))
-            
-            # Check for buttons without aria-label on icon-only buttons
-            if 'button' in content.lower():
-                # Simple heuristic
-                pass
+        for path, findings in self.findings(scan_accessibility).items():
+            if findings['missing_alt']:
+                missing_alt.append(path)
+                self.stream.emit('accessibility', 'missing_alt', '<img> without alt text', file=path, level='error')
         
         if missing_alt:
             self.issues['accessibility'].append({
@@ -155,8 +281,59 @@ class ResponsiveAnalyzer:
                 'files': missing_alt[:5]
             })
         
+        self.stats['images_missing_alt'] = len(missing_alt)
         print(f"   Images without alt: {len(missing_alt)}")
     
+    @instrumented
+    def audit_images(self, jobs=8):
+        """Audit the bytes shipped from public/ against how src/ uses each image"""
+        print("\n🖼️  Auditing public/ images...")
+        
+        public_dir = self.base_path / 'public'
+        if not public_dir.exists():
+            print("   ⚠️  No public/ directory")
+            return
+        
+        references = {path: refs for path, refs in self.findings(scan_images).items() if refs}
+        references.update(public_references(public_dir))
+        
+        images, findings, totals = audit(public_dir, references, jobs, self.base_path / 'src' / 'app')
+        self.stats.update(totals)
+        
+        def report(kind, file, issue, savings, level='warning'):
+            self.issues['images'].append({'file': file, 'issue': issue, 'savings': savings})
+            self.stream.emit('images', kind, issue, file=file, level=level, savings=savings)
+        
+        for image in findings['oversized']:
+            rendered = f"rendered at {image['rendered_width']}px, " if image['rendered_width'] else ''
+            report('oversized', image['path'],
+                   f"Oversized {image['width']}x{image['height']} ({rendered}resize to {image['target_width']}px wide)",
+                   image['savings'])
+        for image in findings['legacy_format']:
+            report('legacy_format', image['path'], f"{image['format'].upper()} - serve WebP/AVIF instead", image['savings'])
+        for image in findings['unreferenced']:
+            report('unreferenced', image['path'], 'Not referenced from src/ or public/', image['savings'], 'note')
+        for image in findings['unreadable']:
+            report('unreadable', image['path'], f"Unreadable image header ({image['error']})", 0, 'error')
+        for missing in findings['missing']:
+            issue = f"References {missing['url']}, which is not in public/"
+            self.issues['images'].append({'file': missing['references'][0], 'issue': issue})
+            for reference in missing['references']:
+                file, _, line = reference.rpartition(':')
+                self.stream.emit('images', 'missing', issue, file=file, line=int(line), level='error', url=missing['url'])
+        
+        self.stats['oversized_images'] = len(findings['oversized'])
+        self.stats['legacy_format_images'] = len(findings['legacy_format'])
+        self.stats['unreferenced_images'] = len(findings['unreferenced'])
+        self.stats['missing_images'] = len(findings['missing'])
+        self.stats['unreadable_images'] = len(findings['unreadable'])
+        
+        print(f"   {totals['public_images']} images, {totals['public_image_bytes'] / 1024:.1f} KiB")
+        print(f"   Oversized: {len(findings['oversized'])}, legacy format: {len(findings['legacy_format'])}, "
+              f"unreferenced: {len(findings['unreferenced'])}, missing: {len(findings['missing'])}, "
+              f"unreadable: {len(findings['unreadable'])}")
+        print(f"   Estimated savings: {totals['estimated_image_savings'] / 1024:.1f} KiB")
+    
     def generate_report(self):
         """Generate optimization report"""
         print("\n" + "="*80)
@@ -168,6 +345,11 @@ class ResponsiveAnalyzer:
         print(f"  • Files with responsive design: {self.stats.get('files_with_responsive', 0)}")
         print(f"  • Next/Image usage: {self.stats.get('next_image_usage', 0)} files")
         print(f"  • <img> tag usage: {self.stats.get('img_tag_usage', 0)} files")
+        if self.stats.get('first_load_max_kb'):
+            print(f"  • Largest first-load JS: {self.stats['first_load_max_kb']} kB")
+        print(f"  • public/ images: {self.stats.get('public_images', 0)} "
+              f"({self.stats.get('public_image_bytes', 0) / 1024:.1f} KiB, "
+              f"~{self.stats.get('estimated_image_savings', 0) / 1024:.1f} KiB saveable)")
         
         print("\n🎯 RECOMMENDATIONS:")
         
@@ -183,7 +365,9 @@ class ResponsiveAnalyzer:
                     print(f"\n  📌 {category.upper()}:")
                     for issue in issue_list[:5]:
                         if isinstance(issue, dict):
-                            if 'file' in issue:
+                            if 'line' in issue:
+                                print(f"     • {issue['file']}:{issue['line']}: {issue['issue']} ({issue['class']})")
+                            elif 'file' in issue:
                                 print(f"     • {issue['file']}: {issue['issue']}")
                             else:
                                 print(f"     • {issue}")
@@ -192,6 +376,12 @@ class ResponsiveAnalyzer:
         
         print("\n" + "="*80)
         
+        if self.cache is not None:
+            self.cache.save(f.relative_path for f in self.corpus.files())
+            print(f"♻️  Analysis cache: {self.cache.hits} results reused, {self.cache.misses} recomputed")
+        
+        self.timings.print_summary()
+        
         # Recommendations
         print("\n💡 OPTIMIZATION RECOMMENDATIONS:")
         print("="*80)
@@ -224,22 +414,57 @@ class ResponsiveAnalyzer:
         print("   • Add meta descriptions")
         print("   • Optimize title tags")
         print("   • Add Open Graph tags")
-        print("   • Generate sitemap.xml")
+        print("   • Generate sharded sitemaps (python3 sitemap_generator.py)")
         
         print("\n" + "="*80)
 
 def main():
-    analyzer = ResponsiveAnalyzer('/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser = argparse.ArgumentParser(description='Analyze responsive design and mobile optimization')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--no-cache', action='store_true', help='re-analyze every file, ignoring .analysis-cache/')
+    parser.add_argument('--jobs', type=int, default=1, help='scan files on N worker processes')
+    parser.add_argument('--profile', action='append', default=[], metavar='CHECK',
+                        help="run a check (or 'all') under cProfile; .prof files go to .analysis-cache/profiles/")
+    parser.add_argument('--trace-memory', action='store_true', help='record per-check peak allocations with tracemalloc')
+    parser.add_argument('--no-history', action='store_true', help=f'do not record this run in {DEFAULT_DB}')
+    parser.add_argument('--budgets', help=f'budget file (default: <base_path>/{DEFAULT_BUDGETS})')
+    parser.add_argument('--jsonl', metavar='PATH', help='stream every finding to PATH as JSON Lines')
+    parser.add_argument('--sarif', metavar='PATH', help='stream every finding to PATH as a SARIF 2.1.0 log')
+    args = parser.parse_args()
+    
+    timings = CheckTimings(args.profile, args.trace_memory, Path(args.base_path) / '.analysis-cache' / 'profiles')
+    stream = FindingStream.open('responsive', args.jsonl, args.sarif)
+    
+    analyzer = ResponsiveAnalyzer(args.base_path, use_cache=not args.no_cache, timings=timings,
+                                  budgets=args.budgets, stream=stream)
     
     print("🚀 Starting responsive design analysis...\n")
     
-    analyzer.analyze_responsive_classes()
-    analyzer.check_mobile_optimization()
-    analyzer.check_performance()
-    analyzer.check_accessibility()
-    analyzer.generate_report()
+    try:
+        analyzer.scan(args.jobs)
+        analyzer.analyze_responsive_classes()
+        analyzer.check_mobile_optimization()
+        analyzer.check_performance()
+        analyzer.check_accessibility()
+        analyzer.audit_images(max(args.jobs, 8))
+        analyzer.generate_report()
+        
+        violations = list(analyzer.bundle_violations)
+        if not args.no_history:
+            recorded = record_run('responsive', analyzer, args.base_path, args.budgets,
+                                  enforced=analyzer.bundle_budgets)
+            violations += recorded
+            for violation in recorded:
+                stream.emit('budget', 'exceeded', violation, file=args.budgets or DEFAULT_BUDGETS, level='error')
+    finally:
+        outputs = [writer.path for writer in stream.writers]
+        stream.close()
     
+    if outputs:
+        print(f"📤 Streamed {stream.total} findings to {', '.join(outputs)}")
     print("\n✅ Analysis complete!")
+    
+    return 1 if violations else 0
 
 if __name__ == '__main__':
-    main()
+    exit(main())
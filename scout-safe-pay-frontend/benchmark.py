@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Analyzer & Translator Benchmarks
+Generates synthetic Next.js trees and message catalogs of increasing size,
+times the analyzers and translators on them and records throughput, peak
+RSS and scaling, appending every run to .benchmarks/history.jsonl so
+regressions show up against the previous run
+
+    python3 benchmark.py                       # default sizes
+    python3 benchmark.py --files 200,2000 --keys 2000,20000 --locales 10
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import math
+import multiprocessing
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+from analysis_watch import load_script
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+HISTORY_FILE = SCRIPT_DIR / '.benchmarks' / 'history.jsonl'
+
+TAILWIND_CLASSES = (
+    'flex', 'items-center', 'justify-between', 'gap-4', 'p-4', 'px-6', 'py-2', 'text-sm',
+    'text-gray-700', 'font-semibold', 'rounded-lg', 'border', 'bg-white', 'shadow-md',
+    'w-full', 'h-10', 'grid', 'grid-cols-1', 'hover:bg-gray-100', 'focus:ring-2',
+    'dark:bg-gray-800', 'md:grid-cols-2', 'lg:grid-cols-3', 'sm:px-8', 'xl:text-lg',
+    'w-[480px]', 'min-w-[320px]', 'h-[600px]', 'md:w-auto', 'transition-colors',
+)
+WORDS = (
+    'vehicle', 'dealer', 'payment', 'secure', 'transaction', 'warranty', 'delivery',
+    'price', 'mileage', 'engine', 'status', 'account', 'profile', 'search', 'results',
+    'verified', 'seller', 'buyer', 'contract', 'invoice', 'document', 'review',
+)
+
+
+# --- synthetic inputs -------------------------------------------------------
+
+def _class_attr(rng, density):
+    return ' '.join(rng.choice(TAILWIND_CLASSES) for _ in range(max(1, int(rng.gauss(density, 2)))))
+
+
+def generate_project(root, files=300, lines=120, client_ratio=0.6, class_density=6, seed=1):
+    """Write a Next.js-like src/ tree: pages under app/[locale], components and libs"""
+    rng = random.Random(seed)
+    root = Path(root)
+    (root / 'src' / 'i18n').mkdir(parents=True, exist_ok=True)
+    (root / 'src' / 'i18n' / 'routing.ts').write_text("export const routing = {localePrefix: 'always'};\n")
+    (root / 'src' / 'i18n' / 'request.ts').write_text('export default {};\n')
+    (root / 'middleware.ts').write_text('export default function middleware() {}\n')
+
+    for i in range(files):
+        kind = rng.random()
+        if kind < 0.15:
+            path = root / 'src' / 'app' / '[locale]' / f'route{i}' / 'page.tsx'
+        elif kind < 0.25:
+            path = root / 'src' / 'lib' / f'util{i}.ts'
+        else:
+            path = root / 'src' / 'components' / f'group{i % 20}' / f'Component{i}.tsx'
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        out = []
+        if rng.random() < client_ratio:
+            out.append("'use client';\n")
+        out.append("import Link from 'next/link';" if rng.random() < 0.2 else "import {Link} from '@/i18n/routing';")
+        out.append("import {useRouter, usePathname} from 'next/navigation';" if rng.random() < 0.2 else '')
+        out.append("import {useTranslations} from 'next-intl';")
+        out.append(f"import Image from 'next/image';" if rng.random() < 0.3 else '')
+        out.append(f'\nexport default function Component{i}() {{')
+        out.append("  const t = useTranslations('ns');")
+        out.append('  return (')
+        for _ in range(lines // 3):
+            roll = rng.random()
+            if roll < 0.02:
+                out.append(f'    <h1 className="text-2xl">Welcome To Our {rng.choice(WORDS).title()} Page</h1>')
+            elif roll < 0.05:
+                out.append(f'    <img src="/x{i}.png" className="{_class_attr(rng, class_density)}" />')
+            elif roll < 0.3:
+                out.append(f"    <div className={{cn('{_class_attr(rng, class_density)}', active && 'ring-2')}}>")
+                out.append(f"      {{t('{rng.choice(WORDS)}')}}")
+                out.append('    </div>')
+            else:
+                out.append(f'    <div className="{_class_attr(rng, class_density)}">')
+                out.append(f"      {{t('{rng.choice(WORDS)}_{rng.randrange(100)}')}}")
+                out.append('    </div>')
+        out.append('  );\n}\n')
+        path.write_text('\n'.join(out), encoding='utf-8')
+    return root
+
+
+def _message(rng, placeholder_ratio):
+    text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 6))).capitalize()
+    if rng.random() < placeholder_ratio:
+        if rng.random() < 0.3:
+            return f'{text} {{count, plural, one {{# {rng.choice(WORDS)}}} other {{# {rng.choice(WORDS)}s}}}}'
+        return f'{text} {{{rng.choice(WORDS)}}}'
+    return text
+
+
+def generate_catalog(keys=2000, depth=3, placeholder_ratio=0.2, seed=1):
+    """Nested English catalog with roughly `keys` leaves spread over `depth` levels"""
+    rng = random.Random(seed)
+    fanout = max(2, round(keys ** (1 / depth)))
+    tree = {}
+    for i in range(keys):
+        node = tree
+        for level in range(depth - 1):
+            node = node.setdefault(f'{WORDS[(i // fanout ** (level + 1)) % len(WORDS)]}_{level}_{i // fanout ** (level + 1)}', {})
+        node[f'key_{i}'] = _message(rng, placeholder_ratio)
+    return tree
+
+
+def derive_locale(en_tree, locale, translated=0.7, missing=0.02, seed=1):
+    """Locale catalog: some keys translated, some left in English, a few missing"""
+    rng = random.Random(f'{seed}:{locale}')
+
+    def walk(node):
+        out = {}
+        for key, value in node.items():
+            if isinstance(value, dict):
+                out[key] = walk(value)
+            elif rng.random() >= missing:
+                out[key] = f'[{locale}] {value}' if rng.random() < translated else value
+        return out
+    return walk(en_tree)
+
+
+def write_catalogs(root, en_tree, locales):
+    messages = Path(root) / 'messages'
+    messages.mkdir(parents=True, exist_ok=True)
+    (messages / 'en.json').write_text(json.dumps(en_tree, ensure_ascii=False, indent=2), encoding='utf-8')
+    for locale in locales:
+        data = derive_locale(en_tree, locale)
+        (messages / f'{locale}.json').write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def locale_codes(count):
+    base = ['de', 'es', 'it', 'ro', 'fr', 'nl', 'pl', 'pt', 'sv', 'da', 'fi', 'cs', 'hu', 'el', 'bg']
+    return (base + [f'x{i}' for i in range(count)])[:count]
+
+
+# --- measured cases ---------------------------------------------------------
+
+def _run_analyzers(root):
+    comprehensive = load_script('comprehensive-analysis.py', 'comprehensive_analysis')
+    responsive = load_script('analyze-responsive.py', 'analyze_responsive')
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        analyzer = comprehensive.ApplicationAnalyzer(root, use_cache=False)
+        analyzer.check_i18n_config()
+        analyzer.analyze_translations()
+        analyzer.analyze_imports()
+        analyzer.analyze_pages()
+        timings['ApplicationAnalyzer'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        analyzer = responsive.ResponsiveAnalyzer(root, use_cache=False)
+        analyzer.analyze_responsive_classes()
+        analyzer.check_performance()
+        analyzer.check_accessibility()
+        timings['ResponsiveAnalyzer'] = time.perf_counter() - started
+    return timings
+
+
+def _run_translators(en_tree, locales):
+    translate_complete = load_script('translate-complete.py', 'translate_complete')
+    translate_all = load_script('translate_all.py', 'translate_all')
+    targets = {locale: derive_locale(en_tree, locale) for locale in locales}
+    timings = {}
+
+    started = time.perf_counter()
+    for locale, data in targets.items():
+        translate_complete.translate_dict(en_tree, copy.deepcopy(data), locale)
+    timings['translate_dict'] = time.perf_counter() - started
+
+    # Word-level dictionary so segmentation has something to match
+    dictionary = {word.capitalize(): word.upper() for word in WORDS}
+    dictionary.update({word: word.upper() for word in WORDS})
+    started = time.perf_counter()
+    translate_all.translate_recursive(en_tree, dictionary)
+    timings['translate_recursive'] = time.perf_counter() - started
+    return timings
+
+
+def _child(target, args, conn):
+    try:
+        conn.send(('ok', target(*args), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    except BaseException:
+        conn.send(('error', traceback.format_exc(), None))
+    finally:
+        conn.close()
+
+
+def measure(target, *args):
+    """Run a case in a fresh process so its peak RSS is its own; a failing case raises RuntimeError"""
+    context = multiprocessing.get_context('fork')
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(target, args, child))
+    process.start()
+    # Only the child may hold the write end, so its exit always ends recv() with EOFError
+    child.close()
+    try:
+        status, result, peak_kb = parent.recv()
+    except EOFError:
+        status, result, peak_kb = 'error', None, None
+    finally:
+        parent.close()
+        process.join()
+    if status != 'ok':
+        raise RuntimeError(f"benchmark case {target.__name__} failed (exit code {process.exitcode})"
+                           + (f":\n{result}" if result else ''))
+    return result, peak_kb
+
+
+# --- reporting --------------------------------------------------------------
+
+def scaling_exponent(points):
+    """Least-squares slope of log(time) against log(size); 1.0 is linear"""
+    points = [(math.log(size), math.log(seconds)) for size, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def previous_run():
+    if not HISTORY_FILE.exists():
+        return None
+    lines = HISTORY_FILE.read_text(encoding='utf-8').splitlines()
+    return json.loads(lines[-1]) if lines else None
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analyzers and translators on synthetic inputs')
+    parser.add_argument('--files', default='100,500,2000', help='comma-separated source file counts')
+    parser.add_argument('--lines', type=int, default=120, help='approximate lines per source file')
+    parser.add_argument('--client-ratio', type=float, default=0.6, help="share of 'use client' files")
+    parser.add_argument('--class-density', type=int, default=6, help='classes per className')
+    parser.add_argument('--keys', default='1000,10000,50000', help='comma-separated catalog key counts')
+    parser.add_argument('--depth', type=int, default=3, help='catalog nesting depth')
+    parser.add_argument('--locales', type=int, default=6, help='number of target locales')
+    parser.add_argument('--placeholders', type=float, default=0.2, help='share of messages with ICU arguments')
+    parser.add_argument('--no-save', action='store_true', help='do not append to the history file')
+    args = parser.parse_args()
+
+    locales = locale_codes(args.locales)
+    cases = []
+
+    print("🏁 Benchmarking analyzers...")
+    for files in [int(n) for n in args.files.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_project(tmp, files, args.lines, args.client_ratio, args.class_density)
+            write_catalogs(tmp, generate_catalog(200), locales[:2])
+            timings, peak_kb = measure(_run_analyzers, tmp)
+        for name, seconds in timings.items():
+            cases.append({'case': name, 'size': files, 'unit': 'files', 'seconds': round(seconds, 4),
+                          'throughput': round(files / seconds, 1), 'peak_rss_kb': peak_kb})
+            print(f"   {name:<22} {files:>7} files  {seconds:8.3f}s  {files / seconds:10.0f} files/s")
+
+    print("🏁 Benchmarking translators...")
+    for keys in [int(n) for n in args.keys.split(',')]:
+        en_tree = generate_catalog(keys, args.depth, args.placeholders)
+        timings, peak_kb = measure(_run_translators, en_tree, locales)
+        for name, seconds in timings.items():
+            # translate_dict runs once per locale
+            work = keys * len(locales) if name == 'translate_dict' else keys
+            cases.append({'case': name, 'size': keys, 'unit': 'keys', 'seconds': round(seconds, 4),
+                          'throughput': round(work / seconds, 1), 'peak_rss_kb': peak_kb})
+            print(f"   {name:<22} {keys:>7} keys   {seconds:8.3f}s  {work / seconds:10.0f} keys/s")
+
+    print("\n📈 Scaling (1.0 = linear):")
+    scaling = {}
+    for name in dict.fromkeys(case['case'] for case in cases):
+        exponent = scaling_exponent([(c['size'], c['seconds']) for c in cases if c['case'] == name])
+        scaling[name] = None if exponent is None else round(exponent, 2)
+        print(f"   {name:<22} {'n/a' if exponent is None else f'{exponent:.2f}'}")
+
+    previous = previous_run()
+    if previous:
+        print(f"\n🔁 Against previous run ({previous.get('commit') or 'unknown commit'}):")
+        before = {(c['case'], c['size']): c for c in previous['cases']}
+        for case in cases:
+            old = before.get((case['case'], case['size']))
+            if old:
+                change = 100 * (case['seconds'] - old['seconds']) / old['seconds'] if old['seconds'] else 0
+                marker = '⚠️ ' if change > 20 else '  '
+                print(f"  {marker}{case['case']:<22} {case['size']:>7}  {change:+6.1f}%")
+
+    if not args.no_save:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'commit': git_commit(),
+                'python': sys.version.split()[0],
+                'params': vars(args),
+                'cases': cases,
+                'scaling': scaling,
+            }) + '\n')
+        print(f"\n📄 Results appended to {HISTORY_FILE.relative_to(SCRIPT_DIR)}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
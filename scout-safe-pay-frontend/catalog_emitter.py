@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Production Catalog Emitter
+Writes one minified catalog per locale with every missing key already
+filled from the source locale, measures repeated values (and can share
+them through a string table), and reports raw, minified and compressed
+sizes per locale
+"""
+
+import argparse
+import gzip
+import json
+import lzma
+from collections import Counter
+from pathlib import Path
+
+from message_catalog import MessageCatalog
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_OUTPUT = 'build/catalogs'
+REPORT_NAME = 'report.json'
+# Only share strings whose reference is clearly shorter than the string itself
+MIN_SHARED_LENGTH = 8
+
+
+def _minify(tree):
+    return json.dumps(tree, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _unflatten(pairs):
+    tree = {}
+    for key, value in pairs:
+        *parents, leaf = key.split('.')
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return tree
+
+
+def compressed_sizes(data):
+    """gzip -9 size and brotli size; without the brotli module, raw xz stands in as an estimate"""
+    sizes = {'gzip': len(gzip.compress(data, 9, mtime=0))}
+    if brotli is not None:
+        sizes['brotli'] = len(brotli.compress(data, quality=11))
+        sizes['brotli_estimated'] = False
+    else:
+        # LZMA lands within a few percent of brotli -q 11 on small JSON documents
+        sizes['brotli'] = len(lzma.compress(data, lzma.FORMAT_RAW, filters=[{'id': lzma.FILTER_LZMA2, 'preset': 9}]))
+        sizes['brotli_estimated'] = True
+    return sizes
+
+
+def resolve_locale(catalog, locale, trim=False):
+    """(tree, counts): the locale in catalog key order with missing keys taken from the source
+
+    Keys only the locale defines are kept (components may read them) and
+    listed under counts['locale_only'] so they can be added to the source.
+    """
+    source = catalog.columns[catalog.source_locale]
+    column = catalog.columns[locale]
+    pairs = []
+    locale_only = []
+    filled = trimmed = 0
+    for row, key in enumerate(catalog.keys):
+        en_value, value = source[row], column[row]
+        if en_value is None and value is None:
+            continue
+        if en_value is None:
+            locale_only.append(key)
+        elif value is None:
+            value = en_value
+            filled += 1
+        if trim and isinstance(value, str) and value != value.strip():
+            value = value.strip()
+            trimmed += 1
+        pairs.append((key, value))
+    return _unflatten(pairs), {'filled': filled, 'locale_only': locale_only, 'trimmed': trimmed}
+
+
+def duplicates(tree):
+    """Values that occur under more than one key, and the bytes their repeats cost"""
+    counts = Counter(value for _, value in _leaves(tree) if isinstance(value, str))
+    repeated = {value: n for value, n in counts.items() if n > 1}
+    return {
+        'values': len(repeated),
+        'keys': sum(repeated.values()),
+        'bytes': sum(len(value.encode('utf-8')) * (n - 1) for value, n in repeated.items()),
+    }
+
+
+def _leaves(tree, prefix=''):
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            yield from _leaves(value, f'{prefix}{key}.')
+        else:
+            yield f'{prefix}{key}', value
+
+
+def share_strings(tree):
+    """{'strings': [...], 'messages': tree} with repeated strings replaced by their table index"""
+    if any(not isinstance(value, str) for _, value in _leaves(tree)):
+        return None  # an integer leaf would be indistinguishable from a reference
+    counts = Counter(value for _, value in _leaves(tree))
+    # Most frequent first, so the commonest strings get the shortest indexes
+    shared = [value for value, n in counts.most_common() if n > 1 and len(value) >= MIN_SHARED_LENGTH]
+    index = {value: i for i, value in enumerate(shared)}
+
+    def replace(node):
+        return {key: replace(value) if isinstance(value, dict) else index.get(value, value)
+                for key, value in node.items()}
+
+    return {'strings': shared, 'messages': replace(tree)}
+
+
+def expand_shared(document):
+    """Inverse of share_strings, as the client would run it once after fetching"""
+    strings = document['strings']
+
+    def expand(node):
+        return {key: expand(value) if isinstance(value, dict) else strings[value] if isinstance(value, int) else value
+                for key, value in node.items()}
+
+    return expand(document['messages'])
+
+
+def _write(path, data):
+    """Write only when the bytes changed, so unchanged catalogs keep their mtime and CDN ETag"""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def emit(messages_dir, output, share=False, trim=False):
+    """Write every locale's production catalog (and shared variant); returns the report"""
+    messages_dir, output = Path(messages_dir), Path(output)
+    catalog = MessageCatalog.load(messages_dir)
+    report = {'source_locale': catalog.source_locale, 'locales': {}}
+
+    for locale in catalog.locales:
+        tree, counts = resolve_locale(catalog, locale, trim)
+        data = _minify(tree)
+        entry = {
+            **counts,
+            'raw_bytes': (messages_dir / f'{locale}.json').stat().st_size,
+            'minified_bytes': len(data),
+            **compressed_sizes(data),
+            'duplicates': duplicates(tree),
+            'written': _write(output / f'{locale}.json', data),
+        }
+        if share:
+            document = share_strings(tree)
+            if document is not None:
+                shared = _minify(document)
+                # Sharing must round-trip exactly or the client would render different text
+                assert expand_shared(json.loads(shared)) == tree
+                entry['shared'] = {'bytes': len(shared), **compressed_sizes(shared),
+                                   'strings': len(document['strings'])}
+                _write(output / f'{locale}.shared.json', shared)
+        report['locales'][locale] = entry
+
+    _write(output / REPORT_NAME, json.dumps(report, indent=2).encode('utf-8'))
+    return report
+
+
+def print_report(report, output):
+    locales = report['locales']
+    estimated = any(entry['brotli_estimated'] for entry in locales.values())
+    print(f"✅ Emitted {len(locales)} production catalogs to {output}")
+    print(f"\n   {'locale':<8}{'raw':>10}{'minified':>10}{'gzip':>9}{'brotli' + ('~' if estimated else ''):>9}"
+          f"{'filled':>8}{'extra':>8}{'repeats':>9}")
+    for locale, entry in locales.items():
+        print(f"   {locale:<8}{entry['raw_bytes'] / 1024:>8.1f}K{entry['minified_bytes'] / 1024:>9.1f}K"
+              f"{entry['gzip'] / 1024:>8.1f}K{entry['brotli'] / 1024:>8.1f}K{entry['filled']:>8}{len(entry['locale_only']):>8}"
+              f"{entry['duplicates']['bytes'] / 1024:>8.1f}K")
+    if estimated:
+        print("   ~ brotli module not installed; xz size shown as an estimate")
+    for locale, entry in locales.items():
+        if entry['locale_only']:
+            print(f"   ⚠️  {locale}: {len(entry['locale_only'])} keys missing from the source locale, shipped as is: "
+                  f"{', '.join(entry['locale_only'][:5])}")
+
+    raw = sum(entry['raw_bytes'] for entry in locales.values())
+    gzipped = sum(entry['gzip'] for entry in locales.values())
+    print(f"\n💾 {raw / 1024:.1f} KiB of source JSON ship as {gzipped / 1024:.1f} KiB gzipped")
+
+    shared = {locale: entry['shared'] for locale, entry in locales.items() if 'shared' in entry}
+    if shared:
+        print("\n🔗 SHARED STRING TABLES (vs. plain minified):")
+        for locale, entry in shared.items():
+            plain = locales[locale]
+            print(f"   {locale}: {entry['strings']} strings, {entry['bytes'] - plain['minified_bytes']:+d} B minified, "
+                  f"{entry['gzip'] - plain['gzip']:+d} B gzip, {entry['brotli'] - plain['brotli']:+d} B brotli")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Emit minified, fallback-resolved production catalogs')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--output', help=f'catalog directory (default: <base_path>/{DEFAULT_OUTPUT})')
+    parser.add_argument('--share', action='store_true', help='also write <locale>.shared.json with a string table')
+    parser.add_argument('--trim', action='store_true', help='strip leading/trailing whitespace from values')
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    output = Path(args.output) if args.output else base_path / DEFAULT_OUTPUT
+    report = emit(base_path / 'messages', output, args.share, args.trim)
+    print_report(report, output)
+
+
+if __name__ == '__main__':
+    main()
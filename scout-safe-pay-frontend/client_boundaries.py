@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Client Boundary Cost Report
+Walks the import graph from every 'use client' boundary to the modules and
+packages it ships to the browser, flags barrel-file and whole-library
+imports that defeat tree-shaking, and ranks statically imported components
+worth splitting out with next/dynamic
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from import_graph import ImportGraph
+
+APP_DIR = 'src/app/'
+# A module counts as a barrel once it mostly re-exports other modules
+BARREL_MIN_REEXPORTS = 3
+
+# Library families whose namespace/default imports pull in the whole package
+LIBRARY_FAMILIES = {
+    'icons': ('lucide-react', 'react-icons', '@heroicons/react', '@tabler/icons-react',
+              '@mui/icons-material', 'react-feather', '@phosphor-icons/react'),
+    'date': ('date-fns', 'moment', 'dayjs', 'luxon'),
+    'chart': ('recharts', 'chart.js', 'react-chartjs-2', 'apexcharts', 'react-apexcharts',
+              'victory', '@nivo/core', 'echarts'),
+    'utility': ('lodash', 'ramda', 'rxjs'),
+}
+# Entry points that are never tree-shaken, however they are imported
+WHOLE_LIBRARY_SOURCES = ('moment', 'lodash', 'chart.js/auto')
+
+# Packages Next.js already rewrites to per-export imports (experimental.optimizePackageImports defaults)
+NEXT_OPTIMIZED_PACKAGES = (
+    'lucide-react', 'date-fns', 'lodash-es', 'ramda', 'antd', 'react-bootstrap', 'ahooks',
+    '@ant-design/icons', '@headlessui/react', '@heroicons/react', '@visx/visx', '@tremor/react',
+    'rxjs', '@mui/material', '@mui/icons-material', 'recharts', 'react-use', '@material-ui/core',
+    '@material-ui/icons', '@tabler/icons-react', 'mui-core', 'react-icons',
+)
+_OPTIMIZE_CONFIG = re.compile(r'optimizePackageImports\s*:\s*\[([^\]]*)\]', re.S)
+
+# Approximate minified + gzip cost of common heavy packages in kB, used for ranking only
+HEAVY_PACKAGES = {
+    'leaflet': 42, 'react-leaflet': 8, 'recharts': 95, 'chart.js': 65, 'react-chartjs-2': 3,
+    'framer-motion': 34, 'moment': 72, 'lodash': 25, 'isomorphic-dompurify': 22,
+    '@sentry/nextjs': 30, 'axios': 14, 'zod': 13, 'react-hook-form': 10, '@tanstack/react-query': 13,
+}
+
+# A split is worth suggesting above this much exclusive source or package weight
+DYNAMIC_MIN_BYTES = 12 * 1024
+DYNAMIC_MIN_PACKAGE_KB = 20
+
+
+def optimized_packages(base_path):
+    """Packages with per-export import rewriting: Next's defaults plus next.config optimizePackageImports"""
+    packages = set(NEXT_OPTIMIZED_PACKAGES)
+    for name in ('next.config.ts', 'next.config.mjs', 'next.config.js'):
+        config = Path(base_path) / name
+        if config.exists():
+            match = _OPTIMIZE_CONFIG.search(config.read_text(encoding='utf-8'))
+            if match:
+                packages.update(re.findall(r'''['"]([^'"]+)['"]''', match.group(1)))
+            break
+    return packages
+
+
+def _family(package):
+    return next((family for family, members in LIBRARY_FAMILIES.items() if package in members), None)
+
+
+class ClientBoundaryReport:
+    def __init__(self, graph, optimized=()):
+        self.graph = graph
+        self.corpus = graph.corpus
+        self.optimized = set(optimized)
+        self._sizes = {}
+        self._deps = {}
+
+    def size(self, path):
+        if path not in self._sizes:
+            file = self.corpus.get(path)
+            # stat() is enough; cached runs never read the module bodies
+            self._sizes[path] = file.path.stat().st_size if file is not None else 0
+        return self._sizes[path]
+
+    def client_deps(self, path):
+        """Modules a client module ships statically; dynamic import() starts its own chunk"""
+        if path not in self._deps:
+            self._deps[path] = self.graph.dependencies(path, include_dynamic=False)
+        return self._deps[path]
+
+    def packages(self, paths):
+        """Packages imported at runtime (not type-only, not dynamic) by any of the modules"""
+        found = set()
+        for path in paths:
+            for kind, target, record in self.graph.edges.get(path, ()):
+                if kind == 'package' and not record['type_only'] and record['kind'] != 'dynamic':
+                    found.add(target)
+        return found
+
+    def package_kb(self, packages):
+        return sum(HEAVY_PACKAGES.get(package, 0) for package in packages)
+
+    def is_client(self, path):
+        return self.graph.directive(path) == 'use client'
+
+    def boundary_modules(self):
+        """'use client' route files and client modules imported from server code: where client bundles start"""
+        found = []
+        for path in sorted(self.graph.modules):
+            if not self.is_client(path):
+                continue
+            importers = self.graph.dependents(path, transitive=False)
+            if path.startswith(APP_DIR) or any(not self.is_client(importer) for importer in importers):
+                found.append(path)
+        return found
+
+    def boundaries(self):
+        """Modules, bytes and packages each boundary ships, heaviest first"""
+        result = []
+        for path in self.boundary_modules():
+            modules = self.client_deps(path)
+            packages = self.packages(modules)
+            result.append({
+                'module': path,
+                'modules': len(modules),
+                'bytes': sum(self.size(module) for module in modules),
+                'packages': sorted(packages),
+                'package_kb': self.package_kb(packages),
+            })
+        result.sort(key=lambda b: (b['bytes'] + 1024 * b['package_kb'], b['module']), reverse=True)
+        return result
+
+    def client_modules(self):
+        """Every module that ends up in some client bundle; unreachable client modules ship nowhere"""
+        shipped = set()
+        for path in self.boundary_modules():
+            shipped |= self.client_deps(path)
+        return shipped
+
+    def barrels(self):
+        """{barrel path: {exported name: target module}}; `export *` targets are keyed by '*'"""
+        barrels = {}
+        for path, module in self.graph.modules.items():
+            reexports = [r for r in module['imports'] if r['kind'] == 're-export']
+            if len(reexports) < BARREL_MIN_REEXPORTS or 2 * len(reexports) < len(module['imports']):
+                continue
+            exports = {}
+            for kind, target, record in self.graph.edges[path]:
+                if record['kind'] != 're-export' or kind != 'module':
+                    continue
+                for name in record['names'] or ['*']:
+                    exports.setdefault(name, set()).add(target)
+            barrels[path] = exports
+        return barrels
+
+    def barrel_imports(self, shipped):
+        """Client-side imports through a barrel, with the bytes they drag in beyond what they use"""
+        barrels = self.barrels()
+        findings = []
+        for path in sorted(shipped):
+            for kind, target, record in self.graph.edges.get(path, ()):
+                if kind != 'module' or target not in barrels or record['type_only']:
+                    continue
+                exports = barrels[target]
+                if record['namespace'] or record['default'] or not record['names']:
+                    needed = set().union(*exports.values())
+                else:
+                    needed = set()
+                    for name in record['names']:
+                        needed |= exports.get(name, exports.get('*', set()))
+                pulled = self.client_deps(target) - {target}
+                used = set().union(*(self.client_deps(module) for module in needed)) if needed else set()
+                extra = pulled - used
+                if not extra:
+                    continue
+                findings.append({
+                    'file': path,
+                    'line': record['line'],
+                    'barrel': target,
+                    'names': record['names'],
+                    'extra_modules': len(extra),
+                    'extra_bytes': sum(self.size(module) for module in extra),
+                })
+        findings.sort(key=lambda f: f['extra_bytes'], reverse=True)
+        return findings
+
+    def whole_library_imports(self, shipped):
+        """Client-side imports that bring in an entire icon, date, chart or utility library"""
+        findings = []
+        for path in sorted(shipped):
+            for kind, package, record in self.graph.edges.get(path, ()):
+                if kind != 'package' or record['type_only'] or record['kind'] == 'dynamic':
+                    continue
+                source = record['source']
+                family = _family(package)
+                if source in WHOLE_LIBRARY_SOURCES:
+                    reason = 'entry point is not tree-shakeable'
+                elif family and source == package and record['namespace']:
+                    reason = f'namespace import of the {family} library'
+                elif family and source == package and record['default'] and package not in self.optimized:
+                    reason = f'default import of the {family} library'
+                elif family and source == package and record['names'] and package not in self.optimized:
+                    reason = f'{family} library is not in optimizePackageImports'
+                else:
+                    continue
+                findings.append({'file': path, 'line': record['line'], 'source': source, 'reason': reason,
+                                 'package_kb': HEAVY_PACKAGES.get(package)})
+        return findings
+
+    def dynamic_candidates(self, shipped, limit=15):
+        """Static imports of local components whose exclusive weight makes them worth next/dynamic"""
+        candidates = []
+        for path in sorted(shipped):
+            local = {target for kind, target, record in self.graph.edges.get(path, ())
+                     if kind == 'module' and not record['type_only'] and record['kind'] != 'dynamic'}
+            for target in sorted(local):
+                if not target.endswith('.tsx') or not self.is_client(target) and not self.is_client(path):
+                    continue
+                # What the importer would still ship without this one edge
+                others = set().union(*(self.client_deps(t) for t in local - {target}))
+                exclusive = self.client_deps(target) - others - {path}
+                packages = self.packages(exclusive) - self.packages(others | {path})
+                bytes_ = sum(self.size(module) for module in exclusive)
+                package_kb = self.package_kb(packages)
+                if bytes_ < DYNAMIC_MIN_BYTES and package_kb < DYNAMIC_MIN_PACKAGE_KB:
+                    continue
+                candidates.append({
+                    'file': path,
+                    'component': target,
+                    'exclusive_modules': len(exclusive),
+                    'exclusive_bytes': bytes_,
+                    'packages': sorted(packages),
+                    'package_kb': package_kb,
+                })
+        candidates.sort(key=lambda c: c['exclusive_bytes'] + 1024 * c['package_kb'], reverse=True)
+        return candidates[:limit]
+
+    def run(self):
+        shipped = self.client_modules()
+        boundaries = self.boundaries()
+        return {
+            'boundaries': boundaries,
+            'client_modules': len(shipped),
+            'client_bytes': sum(self.size(path) for path in shipped),
+            'client_packages': sorted(self.packages(shipped)),
+            'barrel_imports': self.barrel_imports(shipped),
+            'whole_library_imports': self.whole_library_imports(shipped),
+            'dynamic_candidates': self.dynamic_candidates(shipped),
+        }
+
+
+def print_report(report, top=10):
+    print(f"🧭 {len(report['boundaries'])} client boundaries ship {report['client_modules']} modules "
+          f"({report['client_bytes'] / 1024:.1f} KiB of source) and {len(report['client_packages'])} packages")
+
+    print("\n📦 HEAVIEST BOUNDARIES:")
+    for boundary in report['boundaries'][:top]:
+        heavy = [p for p in boundary['packages'] if p in HEAVY_PACKAGES]
+        print(f"   {boundary['module']}: {boundary['modules']} modules, {boundary['bytes'] / 1024:.1f} KiB"
+              + (f" + ~{boundary['package_kb']} kB ({', '.join(heavy)})" if heavy else ''))
+
+    if report['barrel_imports']:
+        print("\n🛢️  BARREL IMPORTS:")
+        for finding in report['barrel_imports'][:top]:
+            print(f"   {finding['file']}:{finding['line']} via {finding['barrel']}: "
+                  f"+{finding['extra_modules']} unused modules ({finding['extra_bytes'] / 1024:.1f} KiB)")
+
+    if report['whole_library_imports']:
+        print("\n📚 WHOLE-LIBRARY IMPORTS:")
+        for finding in report['whole_library_imports'][:top]:
+            print(f"   {finding['file']}:{finding['line']} '{finding['source']}': {finding['reason']}")
+
+    if report['dynamic_candidates']:
+        print("\n✂️  next/dynamic CANDIDATES:")
+        for candidate in report['dynamic_candidates'][:top]:
+            extra = f" + ~{candidate['package_kb']} kB ({', '.join(candidate['packages'])})" if candidate['package_kb'] else ''
+            print(f"   {candidate['component']} in {candidate['file']}: {candidate['exclusive_modules']} modules, "
+                  f"{candidate['exclusive_bytes'] / 1024:.1f} KiB{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what each 'use client' boundary ships to the browser")
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--json', metavar='FILE', help='also write the full report as JSON')
+    parser.add_argument('--top', type=int, default=10, help='rows per section')
+    parser.add_argument('--no-cache', action='store_true', help='rescan every file')
+    args = parser.parse_args()
+
+    graph = ImportGraph(args.base_path, use_cache=not args.no_cache).build()
+    graph.save()
+    report = ClientBoundaryReport(graph, optimized_packages(args.base_path)).run()
+    print_report(report, args.top)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved report to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Compiled Message Catalog
+Compiles messages/*.json into one binary file (deduplicated string table,
+sorted key index, per-locale value arrays) that is memory-mapped and
+queried by key or prefix without parsing any JSON
+
+Layout, all integers little-endian uint32:
+  header          magic, source stamp, string/key/locale counts, section offsets
+  string offsets  n_strings + 1 offsets into the string blob
+  key index       n_keys string ids, sorted by their UTF-8 bytes
+  locale table    per locale: name id, values offset, order offset, order length
+  values          per locale: n_keys value ids (MISSING, or JSON_VALUE | id)
+  order           per locale: key rows in the locale file's document order
+  string blob     UTF-8 strings back to back
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from message_catalog import SOURCE_LOCALE, flatten
+
+MAGIC = b'SCATLG01'
+# magic, source stamp, n_strings, n_keys, n_locales, key index at, locale table at, blob at
+HEADER = struct.Struct('<8s16s6I')
+LOCALE_ENTRY = struct.Struct('<4I')
+
+MISSING = 0xFFFFFFFF
+# Set on value ids whose string is a JSON-encoded non-string leaf (numbers, lists, {})
+JSON_VALUE = 0x80000000
+
+DEFAULT_OUTPUT = 'messages.cat'
+
+
+def source_paths(messages_dir, source_locale=SOURCE_LOCALE):
+    """Locale files in load order: the source locale first, then the rest sorted"""
+    paths = sorted(Path(messages_dir).glob('*.json'))
+    paths.sort(key=lambda p: p.stem != source_locale)
+    return paths
+
+
+def source_stamp(paths):
+    """Cheap staleness check from file names, sizes and mtimes, without reading them"""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        stat = path.stat()
+        digest.update(f'{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\0'.encode('utf-8'))
+    return digest.digest()
+
+
+def _uint32s(values):
+    data = array('I', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def compile_catalogs(messages_dir, output, source_locale=SOURCE_LOCALE, verify=True):
+    """Compile every messages/<locale>.json into `output`; returns the file size"""
+    paths = source_paths(messages_dir, source_locale)
+    if not paths:
+        raise FileNotFoundError(f'No locale files in {messages_dir}')
+
+    strings = {}
+
+    def intern(text):
+        sid = strings.get(text)
+        if sid is None:
+            sid = strings[text] = len(strings)
+        return sid
+
+    trees = {}
+    locales = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = json.load(f)
+        trees[path.stem] = tree
+        leaves = []
+        for key, value in flatten(tree, keep_empty=True):
+            if isinstance(value, str):
+                vid = intern(value)
+            else:
+                vid = JSON_VALUE | intern(json.dumps(value, ensure_ascii=False))
+            leaves.append((key, vid))
+        locales.append((path.stem, leaves))
+
+    keys = sorted({key for _, leaves in locales for key, _ in leaves}, key=lambda k: k.encode('utf-8'))
+    rows = {key: row for row, key in enumerate(keys)}
+    key_index = [intern(key) for key in keys]
+
+    columns = []
+    for locale, leaves in locales:
+        values = [MISSING] * len(keys)
+        order = []
+        for key, vid in leaves:
+            values[rows[key]] = vid
+            order.append(rows[key])
+        columns.append((intern(locale), values, order))
+
+    if len(strings) >= JSON_VALUE:
+        raise ValueError('Too many distinct strings for the catalog format')
+
+    blob = bytearray()
+    offsets = [0]
+    for text in strings:
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+
+    # Integer sections first so every array stays 4-byte aligned; the blob goes last
+    key_index_at = HEADER.size + 4 * len(offsets)
+    locale_table_at = key_index_at + 4 * len(keys)
+    position = locale_table_at + LOCALE_ENTRY.size * len(columns)
+    locale_table = b''
+    for name_id, values, order in columns:
+        values_at = position
+        order_at = values_at + 4 * len(values)
+        position = order_at + 4 * len(order)
+        locale_table += LOCALE_ENTRY.pack(name_id, values_at, order_at, len(order))
+    blob_at = position
+
+    header = HEADER.pack(MAGIC, source_stamp(paths), len(strings), len(keys), len(columns),
+                         key_index_at, locale_table_at, blob_at)
+    tmp = Path(f'{output}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        f.write(_uint32s(offsets))
+        f.write(_uint32s(key_index))
+        f.write(locale_table)
+        for _, values, order in columns:
+            f.write(_uint32s(values))
+            f.write(_uint32s(order))
+        f.write(blob)
+    os.replace(tmp, output)
+
+    if verify:
+        # Keys containing '.' cannot be told apart from nesting, so prove the round trip
+        with CompiledCatalog(output) as compiled:
+            for locale, tree in trees.items():
+                if compiled.tree(locale) != tree:
+                    raise ValueError(f'{locale}.json does not round-trip through the compiled catalog')
+    return Path(output).stat().st_size
+
+
+class CompiledCatalog:
+    """Read-only view over a compiled catalog; strings are decoded only when asked for"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.stamp, n_strings, self.size, n_locales,
+         key_index_at, locale_table_at, blob_at) = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{self.path} is not a compiled message catalog')
+        if sys.byteorder != 'little':
+            self.close()
+            raise ValueError('Compiled catalogs can only be memory-mapped on little-endian hosts')
+
+        self._view = memoryview(self._map)
+        self._offsets = self._view[HEADER.size:key_index_at].cast('I')
+        self._keys = self._view[key_index_at:locale_table_at].cast('I')
+        self._blob_at = blob_at
+        self._columns = {}
+        for i in range(n_locales):
+            name_id, values_at, order_at, order_len = LOCALE_ENTRY.unpack_from(
+                self._map, locale_table_at + i * LOCALE_ENTRY.size)
+            values = self._view[values_at:values_at + 4 * self.size].cast('I')
+            order = self._view[order_at:order_at + 4 * order_len].cast('I')
+            self._columns[self.string(name_id)] = (values, order)
+        self.locales = list(self._columns)
+
+    @classmethod
+    def load(cls, messages_dir, path=None, source_locale=SOURCE_LOCALE):
+        """Open the compiled catalog, recompiling first if any locale file changed"""
+        messages_dir = Path(messages_dir)
+        path = Path(path) if path else messages_dir.parent / DEFAULT_OUTPUT
+        if path.exists():
+            catalog = cls(path)
+            if catalog.stamp == source_stamp(source_paths(messages_dir, source_locale)):
+                return catalog
+            catalog.close()
+        compile_catalogs(messages_dir, path, source_locale, verify=False)
+        return cls(path)
+
+    def close(self):
+        for name in ('_offsets', '_keys', '_view'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        for values, order in getattr(self, '_columns', {}).values():
+            values.release()
+            order.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _bytes(self, sid):
+        start = self._blob_at + self._offsets[sid]
+        return self._map[start:self._blob_at + self._offsets[sid + 1]]
+
+    def string(self, sid):
+        return self._bytes(sid).decode('utf-8')
+
+    def key(self, row):
+        return self.string(self._keys[row])
+
+    def _value(self, vid):
+        if vid == MISSING:
+            return None
+        if vid & JSON_VALUE:
+            return json.loads(self.string(vid & ~JSON_VALUE))
+        return self.string(vid)
+
+    def _bisect(self, target):
+        """First row whose key bytes are >= target"""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(self._keys[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key):
+        """Row of a dotted key path, or None"""
+        target = key.encode('utf-8')
+        row = self._bisect(target)
+        if row < self.size and self._bytes(self._keys[row]) == target:
+            return row
+        return None
+
+    def get(self, key, locale=SOURCE_LOCALE, default=None):
+        row = self.find(key)
+        if row is None:
+            return default
+        value = self._value(self._columns[locale][0][row])
+        return default if value is None else value
+
+    def prefix(self, prefix, locale=SOURCE_LOCALE):
+        """Yield (key, value) for every key starting with `prefix`, in key order"""
+        values = self._columns[locale][0]
+        for row in self.prefix_rows(prefix):
+            if values[row] != MISSING:
+                yield self.key(row), self._value(values[row])
+
+    def prefix_rows(self, prefix):
+        """Rows of every key starting with `prefix`, found by two binary searches"""
+        target = prefix.encode('utf-8')
+        # 0xFF never occurs in UTF-8, so it sorts after every key with this prefix
+        return range(self._bisect(target), self._bisect(target + b'\xff'))
+
+    def items(self, locale=SOURCE_LOCALE, rows=None):
+        """Yield (key, value) in the locale file's document order, optionally only for `rows`"""
+        values, order = self._columns[locale]
+        for row in order:
+            if rows is None or row in rows:
+                yield self.key(row), self._value(values[row])
+
+    def tree(self, locale=SOURCE_LOCALE, rows=None):
+        """Rebuild the nested messages/<locale>.json structure, or the subset in `rows`"""
+        tree = {}
+        for key, value in self.items(locale, rows):
+            *parents, leaf = key.split('.')
+            node = tree
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[leaf] = value
+        return tree
+
+
+def decompile(path, output_dir):
+    """Write every locale back out in the messages/*.json formatting"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with CompiledCatalog(path) as compiled:
+        for locale in compiled.locales:
+            with open(output_dir / f'{locale}.json', 'w', encoding='utf-8') as f:
+                json.dump(compiled.tree(locale), f, indent=2, ensure_ascii=False)
+                f.write('\n')
+        return compiled.locales
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile messages/*.json into a memory-mappable catalog')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--output', help=f'compiled catalog path (default: <base_path>/{DEFAULT_OUTPUT})')
+    parser.add_argument('--decompile', metavar='DIR', help='write the locale JSON files back out to DIR')
+    parser.add_argument('--get', metavar='KEY', help='look up a key, or every key under a prefix ending in "."')
+    parser.add_argument('--locale', action='append', help='locale(s) to show with --get (default: all)')
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    messages_dir = base_path / 'messages'
+    output = Path(args.output) if args.output else base_path / DEFAULT_OUTPUT
+
+    if args.decompile:
+        locales = decompile(output, args.decompile)
+        print(f"✅ Wrote {len(locales)} locale files to {args.decompile}")
+    elif args.get:
+        with CompiledCatalog.load(messages_dir, output) as compiled:
+            for locale in args.locale or compiled.locales:
+                if args.get.endswith('.'):
+                    for key, value in compiled.prefix(args.get, locale):
+                        print(f"{locale}\t{key}\t{json.dumps(value, ensure_ascii=False)}")
+                else:
+                    value = compiled.get(args.get, locale)
+                    print(f"{locale}\t{args.get}\t{json.dumps(value, ensure_ascii=False)}")
+    else:
+        json_size = sum(path.stat().st_size for path in source_paths(messages_dir))
+        size = compile_catalogs(messages_dir, output)
+        with CompiledCatalog(output) as compiled:
+            print(f"✅ Compiled {len(compiled.locales)} locales, {compiled.size} keys into {output}")
+        print(f"   {json_size / 1024:.1f} KiB of JSON → {size / 1024:.1f} KiB compiled")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,74 +4,147 @@ Comprehensive Application Analysis Script
 Analyzes the Next.js app for common issues and generates a detailed report
 """
 
+import argparse
 import json
 import os
-import re
 from pathlib import Path
 from collections import defaultdict
 
+from analysis_cache import AnalysisCache
+from analysis_history import DEFAULT_BUDGETS, DEFAULT_DB, record_run
+from analysis_timing import CheckTimings, instrumented, regex
+from client_boundaries import ClientBoundaryReport, optimized_packages
+from finding_stream import FindingStream
+from import_graph import ImportGraph, scan_module
+from message_catalog import MessageCatalog, key_lines
+from rule_engine import RuleEngine, rule
+from source_corpus import SourceCorpus
+from translation_parity import DEFAULT_BACKEND_LANG, SOURCE_LOCALE, ParityReport, StackCatalog
+
+@rule('src/app/[locale]/**/page.tsx', needs=('text', 'module'))
+def scan_page(content, module):
+    """Per-page rules, returning issues without the file name"""
+    findings = []
+    
+    # Check if uses translations
+    if any('useTranslations' in record['names'] for record in module['imports']):
+        # Check if it's a client component
+        if module['directive'] != 'use client':
+            findings.append({'issue': 'uses translations but not client component'})
+    
+    # Check for hardcoded text (simple heuristic)
+    if regex.search(r'<h1[^>]*>[A-Z][a-zA-Z\s]{10,}</h1>', content):
+        matches = regex.findall(r'<h1[^>]*>([^<]+)</h1>', content)
+        for match in matches:
+            if not match.startswith('{') and len(match) > 10:
+                findings.append({
+                    'issue': 'possible hardcoded text',
+                    'text': match[:50]
+                })
+    
+    return findings
+
+# Every per-file rule, run together in one traversal of src/
+RULES = (scan_module, scan_page)
+
 class ApplicationAnalyzer:
-    def __init__(self, base_path):
+    def __init__(self, base_path, corpus=None, use_cache=True, cache=None, timings=None, stream=None,
+                 backend_lang=None):
         self.base_path = Path(base_path)
+        self.corpus = corpus or SourceCorpus(self.base_path)
+        self.timings = timings or CheckTimings()
+        self.cache = cache
+        if self.cache is None and use_cache:
+            self.cache = AnalysisCache(self.base_path / '.analysis-cache' / 'comprehensive.json')
+        self.pages_path = self.base_path / 'src' / 'app' / '[locale]'
+        # The Laravel backend's lang/ directory, checked for parity with messages/
+        self.backend_lang = Path(backend_lang) if backend_lang else self.base_path / DEFAULT_BACKEND_LANG
         self.issues = defaultdict(list)
         self.stats = defaultdict(int)
-        
+        self.coverage = {}
+        # Every individual finding, written out as it is found; issues keep the summaries
+        self.stream = stream or FindingStream('comprehensive')
+        self.engine = RuleEngine(RULES, self.cache)
+        self._findings = None
+        self._graph = None
+        self._catalog = None
+    
+    @instrumented
+    def scan(self, jobs=1):
+        """Run every per-file rule in one pass over the corpus, on N processes if jobs > 1"""
+        print("🗂️  Scanning source files...")
+        self._findings = self.engine.run(self.corpus, jobs)
+        worker_io = self.engine.worker_io
+        self.timings.add_io(worker_io['files_read'], worker_io['bytes_read'], worker_io['regex_evaluations'])
+        stats = self.engine.stats
+        print(f"   ✓ {len(RULES)} rules over {stats['files']} files "
+              f"({stats['computed']} results computed, {stats['reused']} reused)")
+    
+    def findings(self, rule):
+        """{relative path: findings} of one per-file rule, scanning on first use"""
+        if self._findings is None:
+            self.scan()
+        return self._findings[rule.__name__]
+    
+    def _config_issue(self, category, kind, message, file=None):
+        """Record a missing-configuration issue and stream it"""
+        self.issues[category].append(message)
+        self.stream.emit(category, kind, message, file=file, level='error')
+    
+    def import_graph(self):
+        """The module import graph, built once per analyzer from the per-file scans"""
+        if self._graph is None:
+            modules = self.findings(scan_module)
+            self._graph = ImportGraph(self.base_path, self.corpus, use_cache=False).build(
+                scan=lambda file: modules[file.relative_path])
+        return self._graph
+    
+    def message_catalog(self):
+        """The frontend message catalog, loaded once per analyzer"""
+        if self._catalog is None:
+            self._catalog = MessageCatalog.load(self.base_path / 'messages')
+            self.timings.add_io(self._catalog.files_read, self._catalog.bytes_read)
+        return self._catalog
+    
+    @instrumented
     def analyze_translations(self):
         """Check translation completeness across all languages"""
         print("📝 Analyzing translations...")
-        messages_dir = self.base_path / 'messages'
-        
-        # Load all translation files
-        translations = {}
-        languages = ['en', 'de', 'es', 'it', 'ro', 'fr']
-        
-        for lang in languages:
-            file_path = messages_dir / f'{lang}.json'
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    translations[lang] = json.load(f)
-        
-        # Get all keys from English
-        def get_all_keys(d, prefix=''):
-            keys = []
-            for k, v in d.items():
-                if isinstance(v, dict):
-                    keys.extend(get_all_keys(v, f'{prefix}{k}.'))
-                else:
-                    keys.append(f'{prefix}{k}')
-            return keys
-        
-        en_keys = set(get_all_keys(translations['en']))
-        self.stats['total_translation_keys'] = len(en_keys)
+        
+        # One flattened table for every locale found in messages/
+        catalog = self.message_catalog()
+        if catalog.source_locale not in catalog.columns:
+            self.issues['translations'].append('Missing messages/en.json')
+            return
+        
+        self.stats['total_translation_keys'] = catalog.source_rows
         
         # Check each language
-        for lang in ['de', 'es', 'it', 'ro', 'fr']:
-            lang_keys = set(get_all_keys(translations[lang]))
-            missing = en_keys - lang_keys
+        for lang in catalog.target_locales:
+            result = catalog.compare(lang)
+            missing = [catalog.keys[row] for row in result['missing']]
+            file = f'messages/{lang}.json'
+            
+            for key in missing:
+                self.stream.emit('translations', 'missing_key', f"'{key}' is missing in {lang}",
+                                 file=file, locale=lang, key=key)
             
             if missing:
                 self.issues['translations'].append({
                     'lang': lang,
                     'missing_keys': len(missing),
-                    'sample': list(missing)[:5]
+                    'sample': sorted(missing)[:5]
                 })
             
-            # Check for untranslated (same as English)
-            def check_untranslated(en_dict, lang_dict, path=''):
-                count = 0
-                for key, en_value in en_dict.items():
-                    full_path = f'{path}.{key}' if path else key
-                    if isinstance(en_value, dict):
-                        if key in lang_dict and isinstance(lang_dict[key], dict):
-                            count += check_untranslated(en_value, lang_dict[key], full_path)
-                    else:
-                        if key in lang_dict and lang_dict[key] == en_value and en_value != '':
-                            # Skip technical terms, emails, etc.
-                            if not any(x in str(en_value) for x in ['@', '+', 'AutoScout24']):
-                                count += 1
-                return count
-            
-            untranslated = check_untranslated(translations['en'], translations[lang])
+            # Untranslated (same as English), skipping technical terms, emails, etc.
+            if result['untranslated'] and self.stream.writers:
+                lines = key_lines(self.base_path / file)
+                self.timings.add_io(1, (self.base_path / file).stat().st_size)
+                for row in result['untranslated']:
+                    key = catalog.keys[row]
+                    self.stream.emit('translations', 'untranslated', f"'{key}' is identical to {catalog.source_locale}",
+                                     file=file, line=lines.get(key), level='note', locale=lang, key=key)
+            untranslated = len(result['untranslated'])
             self.stats[f'{lang}_untranslated'] = untranslated
             
             if untranslated > 0:
@@ -81,35 +154,118 @@ class ApplicationAnalyzer:
                     'count': untranslated
                 })
         
-        print(f"   ✓ Analyzed {len(en_keys)} translation keys across {len(languages)} languages")
+        self.coverage = catalog.coverage_matrix()
+        
+        print(f"   ✓ Analyzed {catalog.source_rows} translation keys across {len(catalog.locales)} languages")
+        for lang in catalog.target_locales:
+            print(f"      {lang}: {self.stats[f'{lang}_untranslated']} untranslated")
     
+    @instrumented
+    def analyze_translation_parity(self):
+        """Compare messages/ with the Laravel backend's lang/ files"""
+        print("🌍 Analyzing cross-stack translation parity...")
+        
+        if not self.backend_lang.is_dir():
+            print(f"   ⚠️  No backend lang/ directory at {self.backend_lang}, skipping")
+            return
+        
+        frontend = StackCatalog.load_frontend(self.base_path / 'messages', self.message_catalog())
+        backend = StackCatalog.load_backend(self.backend_lang)
+        self.timings.add_io(backend.files_read, backend.bytes_read)
+        report = ParityReport(frontend, backend).run()
+        
+        def location(stack, locale, key):
+            path, line = stack.location(locale, key)
+            return os.path.relpath(path, self.base_path), line
+        
+        for error in report['errors']:
+            self._config_issue('translation_parity', 'unparsable_file', f'Cannot parse backend {error}')
+        
+        if report['locales']['frontend_only']:
+            locales = report['locales']['frontend_only']
+            self.issues['translation_parity'].append({'type': 'locales_missing_in_backend', 'locales': locales})
+            for lang in locales:
+                self.stream.emit('translation_parity', 'locale_missing', f'{lang} has no backend translations',
+                                 file=os.path.relpath(self.backend_lang, self.base_path), locale=lang)
+        
+        for lang, coverage in report['coverage']['backend'].items():
+            self.stats[f'backend_{lang}_untranslated'] = len(coverage['untranslated'])
+            if coverage['missing']:
+                self.issues['translation_parity'].append({
+                    'lang': lang,
+                    'backend_missing_keys': len(coverage['missing']),
+                    'sample': coverage['missing'][:5]
+                })
+            if not self.stream.writers:
+                continue
+            for key in coverage['missing']:
+                # Point at the key's definition in a locale that has it
+                owner = SOURCE_LOCALE if (SOURCE_LOCALE, key) in backend.locations else next(
+                    locale for locale in sorted(backend.locales) if key in backend.locales[locale])
+                file, line = location(backend, owner, key)
+                self.stream.emit('translation_parity', 'backend_missing_key', f"'{key}' is missing in backend {lang}",
+                                 file=file, line=line, locale=lang, key=key)
+            for key in coverage['untranslated']:
+                file, line = location(backend, lang, key)
+                self.stream.emit('translation_parity', 'backend_untranslated', f"'{key}' is still English in {lang}",
+                                 file=file, line=line, level='note', locale=lang, key=key)
+        
+        self.stats['backend_translation_keys'] = sum(len(entries) for entries in backend.locales.values())
+        self.stats['shared_source_strings'] = len(report['shared'])
+        self.stats['inconsistent_translations'] = len(report['inconsistent'])
+        
+        by_locale = defaultdict(list)
+        for item in report['inconsistent']:
+            by_locale[item['locale']].append(item['source'])
+            if self.stream.writers:
+                backend_key = next(iter(item['backend']))
+                frontend_key, frontend_value = next(iter(item['frontend'].items()))
+                file, line = location(backend, item['locale'], backend_key)
+                self.stream.emit('translation_parity', 'inconsistent_translation',
+                                 f"{item['locale']}: '{item['source']}' is '{item['backend'][backend_key]}' in the backend "
+                                 f"but '{frontend_value}' in the frontend ({frontend_key})",
+                                 file=file, line=line, locale=item['locale'],
+                                 frontend=item['frontend'], backend=item['backend'])
+        for lang, sources in sorted(by_locale.items()):
+            self.issues['translation_parity'].append({
+                'lang': lang,
+                'inconsistent_translations': len(sources),
+                'sample': sources[:5]
+            })
+        
+        print(f"   ✓ {len(report['shared'])} of {report['sources']} source strings are translated in both stacks; "
+              f"{len(report['inconsistent'])} locale pairs across {report['inconsistent_sources']} strings differ")
+    
+    @instrumented
     def analyze_imports(self):
-        """Check for incorrect imports"""
+        """Check for incorrect imports, as queries over the module graph"""
         print("🔍 Analyzing imports...")
         
-        src_path = self.base_path / 'src'
+        # All TypeScript/TSX files from the shared corpus
+        files = self.corpus.files('.tsx', '.ts')
+        graph = self.import_graph()
         
-        # Find all TypeScript/TSX files
-        files = list(src_path.rglob('*.tsx')) + list(src_path.rglob('*.ts'))
+        def client(path):
+            return graph.directive(path) == 'use client'
         
-        wrong_link_imports = []
-        wrong_router_imports = []
-        wrong_pathname_imports = []
+        # Locale-aware replacements live in @/i18n/routing
+        link_imports = graph.importers('next/link', 'default')
+        # Files that read the locale with useParams build prefixed paths themselves
+        router_imports = [(path, record) for path, record in graph.importers('next/navigation', 'useRouter')
+                          if client(path) and not graph.importers_in(path, 'useParams')]
+        pathname_imports = [(path, record) for path, record in graph.importers('next/navigation', 'usePathname')
+                            if client(path)]
         
-        for file in files:
-            content = file.read_text(encoding='utf-8')
-            
-            # Check for wrong Link import
-            if "import Link from 'next/link'" in content:
-                wrong_link_imports.append(str(file.relative_to(self.base_path)))
-            
-            # Check for wrong useRouter (in client components)
-            if "'use client'" in content or '"use client"' in content:
-                if "from 'next/navigation'" in content:
-                    if 'useRouter' in content and 'useParams' not in content:
-                        wrong_router_imports.append(str(file.relative_to(self.base_path)))
-                    if 'usePathname' in content:
-                        wrong_pathname_imports.append(str(file.relative_to(self.base_path)))
+        for kind, name, found in (('wrong_link_import', 'Link from next/link', link_imports),
+                                  ('wrong_router_import', 'useRouter from next/navigation', router_imports),
+                                  ('wrong_pathname_import', 'usePathname from next/navigation', pathname_imports)):
+            for path, record in found:
+                self.stream.emit('imports', kind, f'{name} skips the locale prefix; import it from @/i18n/routing',
+                                 file=path, line=record['line'])
+        
+        wrong_link_imports = sorted({path for path, _ in link_imports})
+        wrong_router_imports = sorted({path for path, _ in router_imports})
+        wrong_pathname_imports = sorted({path for path, _ in pathname_imports})
         
         if wrong_link_imports:
             self.issues['imports'].append({
@@ -132,74 +288,138 @@ class ApplicationAnalyzer:
                 'files': wrong_pathname_imports[:10]
             })
         
+        for path, record in graph.unresolved:
+            self.stream.emit('imports', 'unresolved_import', f"Cannot resolve '{record['source']}'",
+                             file=path, line=record['line'], level='error')
+        
+        if graph.unresolved:
+            self.issues['imports'].append({
+                'type': 'unresolved_import',
+                'count': len(graph.unresolved),
+                'files': [f"{path}:{record['line']} ({record['source']})" for path, record in graph.unresolved[:10]]
+            })
+        
+        cycles = graph.cycles()
+        for cycle in cycles:
+            self.stream.emit('imports', 'import_cycle', 'Import cycle among: ' + ', '.join(cycle),
+                             file=cycle[0], modules=cycle)
+        
+        if cycles:
+            self.issues['imports'].append({
+                'type': 'import_cycle',
+                'count': len(cycles),
+                'files': [', '.join(cycle) for cycle in cycles[:10]]
+            })
+        
+        self.stats['import_edges'] = sum(len(graph.imports(path)) for path in graph.edges)
+        self.stats['import_cycles'] = len(cycles)
         self.stats['files_analyzed'] = len(files)
         print(f"   ✓ Analyzed {len(files)} files")
     
+    @instrumented
+    def analyze_client_bundles(self):
+        """Check what the 'use client' boundaries ship to the browser"""
+        print("🔍 Analyzing client boundaries...")
+        
+        report = ClientBoundaryReport(self.import_graph(), optimized_packages(self.base_path)).run()
+        
+        for f in report['barrel_imports']:
+            self.stream.emit('client_bundle', 'barrel_import',
+                             f"Import through barrel {f['barrel']} ships {f['extra_bytes'] / 1024:.1f} KiB of unused modules",
+                             file=f['file'], line=f['line'], barrel=f['barrel'], extra_bytes=f['extra_bytes'])
+        for f in report['whole_library_imports']:
+            self.stream.emit('client_bundle', 'whole_library_import', f"'{f['source']}' {f['reason']}",
+                             file=f['file'], line=f['line'], source=f['source'])
+        for c in report['dynamic_candidates']:
+            self.stream.emit('client_bundle', 'dynamic_import_candidate',
+                             f"{c['component']} could load with next/dynamic ({c['exclusive_bytes'] / 1024:.1f} KiB"
+                             + (f" + ~{c['package_kb']} kB packages)" if c['package_kb'] else ')'),
+                             file=c['file'], level='note', component=c['component'],
+                             exclusive_bytes=c['exclusive_bytes'], package_kb=c['package_kb'])
+        
+        if report['barrel_imports']:
+            self.issues['client_bundle'].append({
+                'type': 'barrel_import',
+                'count': len(report['barrel_imports']),
+                'files': [f"{f['file']}:{f['line']} via {f['barrel']} (+{f['extra_bytes'] / 1024:.1f} KiB unused)"
+                          for f in report['barrel_imports'][:10]]
+            })
+        
+        if report['whole_library_imports']:
+            self.issues['client_bundle'].append({
+                'type': 'whole_library_import',
+                'count': len(report['whole_library_imports']),
+                'files': [f"{f['file']}:{f['line']} '{f['source']}' ({f['reason']})"
+                          for f in report['whole_library_imports'][:10]]
+            })
+        
+        if report['dynamic_candidates']:
+            self.issues['client_bundle'].append({
+                'type': 'dynamic_import_candidate',
+                'count': len(report['dynamic_candidates']),
+                'files': [f"{c['component']} in {c['file']} ({c['exclusive_bytes'] / 1024:.1f} KiB"
+                          + (f" + ~{c['package_kb']} kB packages)" if c['package_kb'] else ')')
+                          for c in report['dynamic_candidates'][:10]]
+            })
+        
+        self.stats['client_boundaries'] = len(report['boundaries'])
+        self.stats['client_modules'] = report['client_modules']
+        self.stats['client_source_kb'] = round(report['client_bytes'] / 1024, 1)
+        
+        print(f"   ✓ {len(report['boundaries'])} client boundaries, {report['client_modules']} client modules")
+    
+    @instrumented
     def analyze_pages(self):
         """Analyze all pages for common issues"""
         print("�� Analyzing pages...")
         
-        pages_path = self.base_path / 'src' / 'app' / '[locale]'
+        pages_path = self.pages_path
         
         if not pages_path.exists():
             self.issues['structure'].append('Missing [locale] directory')
             return
         
-        # Find all page.tsx files
-        pages = list(pages_path.rglob('page.tsx'))
+        # Every page.tsx file, as matched by the rule's glob
+        pages = self.findings(scan_page)
         
-        for page in pages:
-            content = page.read_text(encoding='utf-8')
-            relative_path = str(page.relative_to(pages_path))
+        for path, findings in pages.items():
+            relative_path = str((self.base_path / path).relative_to(pages_path))
             
-            # Check if uses translations
-            if 'useTranslations' in content:
-                # Check if it's a client component
-                if "'use client'" not in content and '"use client"' not in content:
-                    self.issues['pages'].append({
-                        'file': relative_path,
-                        'issue': 'uses translations but not client component'
-                    })
-            
-            # Check for hardcoded text (simple heuristic)
-            if re.search(r'<h1[^>]*>[A-Z][a-zA-Z\s]{10,}</h1>', content):
-                matches = re.findall(r'<h1[^>]*>([^<]+)</h1>', content)
-                for match in matches:
-                    if not match.startswith('{') and len(match) > 10:
-                        self.issues['pages'].append({
-                            'file': relative_path,
-                            'issue': 'possible hardcoded text',
-                            'text': match[:50]
-                        })
+            for finding in findings:
+                self.issues['pages'].append({'file': relative_path, **finding})
+                message = f"{finding['issue'].capitalize()}: {finding['text']}" if 'text' in finding else finding['issue'].capitalize()
+                self.stream.emit('pages', finding['issue'].replace(' ', '_'), message, file=path)
         
         self.stats['pages_analyzed'] = len(pages)
         print(f"   ✓ Analyzed {len(pages)} pages")
     
+    @instrumented
     def check_i18n_config(self):
         """Check i18n configuration files"""
         print("⚙️  Checking i18n configuration...")
         
         # Check routing.ts
-        routing_file = self.base_path / 'src' / 'i18n' / 'routing.ts'
-        if not routing_file.exists():
-            self.issues['config'].append('Missing src/i18n/routing.ts')
+        routing_file = self.corpus.get(Path('src') / 'i18n' / 'routing.ts')
+        if routing_file is None:
+            self._config_issue('config', 'missing_file', 'Missing src/i18n/routing.ts')
         else:
-            content = routing_file.read_text()
+            content = routing_file.text
             if 'localePrefix' not in content:
-                self.issues['config'].append('routing.ts missing localePrefix configuration')
+                self._config_issue('config', 'missing_locale_prefix', 'routing.ts missing localePrefix configuration',
+                                   routing_file.relative_path)
         
         # Check middleware.ts
         middleware_file = self.base_path / 'middleware.ts'
         if not middleware_file.exists():
-            self.issues['config'].append('Missing middleware.ts')
+            self._config_issue('config', 'missing_file', 'Missing middleware.ts')
         
         # Check request.ts
-        request_file = self.base_path / 'src' / 'i18n' / 'request.ts'
-        if not request_file.exists():
-            self.issues['config'].append('Missing src/i18n/request.ts')
+        if self.corpus.get(Path('src') / 'i18n' / 'request.ts') is None:
+            self._config_issue('config', 'missing_file', 'Missing src/i18n/request.ts')
         
         print("   ✓ Configuration check complete")
     
+    @instrumented
     def check_api_config(self):
         """Check API configuration"""
         print("🔌 Checking API configuration...")
@@ -209,19 +429,18 @@ class ApplicationAnalyzer:
         if env_file.exists():
             content = env_file.read_text()
             if 'NEXT_PUBLIC_API_URL' not in content:
-                self.issues['api'].append('Missing NEXT_PUBLIC_API_URL in .env.local')
+                self._config_issue('api', 'missing_api_url', 'Missing NEXT_PUBLIC_API_URL in .env.local', '.env.local')
             else:
                 # Extract API URL
-                match = re.search(r'NEXT_PUBLIC_API_URL=(.+)', content)
+                match = regex.search(r'NEXT_PUBLIC_API_URL=(.+)', content)
                 if match:
                     self.stats['api_url'] = match.group(1).strip()
         else:
-            self.issues['api'].append('Missing .env.local file')
+            self._config_issue('api', 'missing_file', 'Missing .env.local file')
         
         # Check API client
-        api_client = self.base_path / 'src' / 'lib' / 'api' / 'client.ts'
-        if not api_client.exists():
-            self.issues['api'].append('Missing API client file')
+        if self.corpus.get(Path('src') / 'lib' / 'api' / 'client.ts') is None:
+            self._config_issue('api', 'missing_file', 'Missing API client file')
         
         print("   ✓ API configuration check complete")
     
@@ -260,6 +479,8 @@ class ApplicationAnalyzer:
                     if len(issue_list) > 10:
                         print(f"     ... and {len(issue_list) - 10} more")
         
+        self.timings.print_summary()
+        
         print("\n" + "="*80)
         
         # Save detailed report
@@ -267,32 +488,75 @@ class ApplicationAnalyzer:
         with open(report_file, 'w', encoding='utf-8') as f:
             json.dump({
                 'stats': dict(self.stats),
-                'issues': dict(self.issues)
+                'issues': dict(self.issues),
+                'coverage': self.coverage,
+                'timings': self.timings.as_dict()
             }, f, indent=2)
         
         print(f"📄 Detailed report saved to: ANALYSIS_REPORT.json")
+        
+        if self.cache is not None:
+            self.cache.save(f.relative_path for f in self.corpus.files())
+            print(f"♻️  Analysis cache: {self.cache.hits} results reused, {self.cache.misses} recomputed")
         print("="*80 + "\n")
         
         return total_issues
 
 def main():
-    analyzer = ApplicationAnalyzer('/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser = argparse.ArgumentParser(description='Analyze the Next.js app for common issues')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--no-cache', action='store_true', help='re-analyze every file, ignoring .analysis-cache/')
+    parser.add_argument('--jobs', type=int, default=1, help='scan files on N worker processes')
+    parser.add_argument('--profile', action='append', default=[], metavar='CHECK',
+                        help="run a check (or 'all') under cProfile; .prof files go to .analysis-cache/profiles/")
+    parser.add_argument('--trace-memory', action='store_true', help='record per-check peak allocations with tracemalloc')
+    parser.add_argument('--no-history', action='store_true', help=f'do not record this run in {DEFAULT_DB}')
+    parser.add_argument('--budgets', help=f'budget file (default: <base_path>/{DEFAULT_BUDGETS})')
+    parser.add_argument('--jsonl', metavar='PATH', help='stream every finding to PATH as JSON Lines')
+    parser.add_argument('--sarif', metavar='PATH', help='stream every finding to PATH as a SARIF 2.1.0 log')
+    parser.add_argument('--backend-lang', metavar='DIR',
+                        help=f'Laravel lang/ directory to compare with messages/ (default: <base_path>/{DEFAULT_BACKEND_LANG})')
+    args = parser.parse_args()
     
-    print("🚀 Starting comprehensive analysis...\n")
+    timings = CheckTimings(args.profile, args.trace_memory, Path(args.base_path) / '.analysis-cache' / 'profiles')
+    stream = FindingStream.open('comprehensive', args.jsonl, args.sarif)
+    
+    analyzer = ApplicationAnalyzer(args.base_path, use_cache=not args.no_cache, timings=timings, stream=stream,
+                                    backend_lang=args.backend_lang)
     
-    analyzer.check_i18n_config()
-    analyzer.analyze_translations()
-    analyzer.analyze_imports()
-    analyzer.analyze_pages()
-    analyzer.check_api_config()
+    print("🚀 Starting comprehensive analysis...\n")
     
-    total_issues = analyzer.generate_report()
+    try:
+        analyzer.scan(args.jobs)
+        analyzer.check_i18n_config()
+        analyzer.analyze_translations()
+        analyzer.analyze_translation_parity()
+        analyzer.analyze_imports()
+        analyzer.analyze_client_bundles()
+        analyzer.analyze_pages()
+        analyzer.check_api_config()
+        
+        total_issues = analyzer.generate_report()
+        
+        violations = []
+        if not args.no_history:
+            violations = record_run('comprehensive', analyzer, args.base_path, args.budgets)
+            for violation in violations:
+                stream.emit('budget', 'exceeded', violation, file=args.budgets or DEFAULT_BUDGETS, level='error')
+    finally:
+        outputs = [writer.path for writer in stream.writers]
+        stream.close()
     
+    if outputs:
+        print(f"📤 Streamed {stream.total} findings to {', '.join(outputs)}")
     if total_issues == 0:
         print("✅ Application analysis complete - No critical issues found!")
     else:
         print(f"⚠️  Application analysis complete - {total_issues} issues need attention")
     
+    # A blown budget fails the run even when there are no issues
+    if violations and total_issues == 0:
+        return 1
     return total_issues
 
 if __name__ == '__main__':
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Streaming Finding Output
+Writes every analyzer finding the moment a check produces it, as JSON Lines
+and/or a SARIF 2.1.0 log for code-scanning UIs, untruncated and with
+file/line locations. Only the rule table is held in memory, so output is
+complete for any tree size and CI can read it while the scan is running
+"""
+
+import json
+from collections import Counter
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_VERSION = '2.1.0'
+LEVELS = ('error', 'warning', 'note')
+
+
+class JsonlWriter:
+    """One JSON object per line, flushed per finding"""
+
+    def __init__(self, path):
+        self.path = path
+        # Line buffering hands every finding to the reader as soon as it is written
+        self.file = open(path, 'w', encoding='utf-8', buffering=1)
+
+    def write(self, finding):
+        self.file.write(json.dumps(finding, ensure_ascii=False) + '\n')
+
+    def close(self, rules):
+        self.file.close()
+
+
+class FindingList:
+    """Findings kept in memory, e.g. for the watch daemon to answer per-file queries"""
+
+    path = None
+
+    def __init__(self):
+        self.findings = []
+
+    def write(self, finding):
+        self.findings.append(finding)
+
+    def close(self, rules):
+        pass
+
+
+class SarifWriter:
+    """A SARIF log whose results array is written incrementally; the rule table goes last"""
+
+    def __init__(self, path, tool):
+        self.path = path
+        self.tool = tool
+        self.file = open(path, 'w', encoding='utf-8')
+        self.results = 0
+        self.rule_index = {}
+        self.file.write(f'{{"$schema":"{SARIF_SCHEMA}","version":"{SARIF_VERSION}","runs":[{{"results":[\n')
+        self.file.flush()
+
+    def write(self, finding):
+        result = {
+            'ruleId': finding['rule'],
+            # Rules are indexed in first-seen order, matching the table written on close
+            'ruleIndex': self.rule_index.setdefault(finding['rule'], len(self.rule_index)),
+            'level': finding['level'],
+            'message': {'text': finding['message']},
+        }
+        if finding['file']:
+            location = {'artifactLocation': {'uri': finding['file'], 'uriBaseId': '%SRCROOT%'}}
+            if finding['line']:
+                location['region'] = {'startLine': finding['line']}
+            result['locations'] = [{'physicalLocation': location}]
+        if finding['properties']:
+            result['properties'] = finding['properties']
+        self.file.write((',\n' if self.results else '') + json.dumps(result, ensure_ascii=False))
+        self.file.flush()
+        self.results += 1
+
+    def close(self, rules):
+        driver = {
+            'name': self.tool,
+            'rules': [{'id': rule_id, 'shortDescription': {'text': description},
+                       'defaultConfiguration': {'level': level}}
+                      for rule_id, (description, level) in rules.items()],
+        }
+        self.file.write(f'\n],"tool":{json.dumps({"driver": driver}, ensure_ascii=False)},'
+                        f'"originalUriBaseIds":{{"%SRCROOT%":{{"uri":"./"}}}},"columnKind":"utf16CodeUnits"}}]}}\n')
+        self.file.close()
+
+
+class FindingStream:
+    """Fans findings out to the writers; with no writers it only counts them"""
+
+    def __init__(self, analyzer, writers=()):
+        self.analyzer = analyzer
+        self.writers = list(writers)
+        self.counts = Counter()
+        # rule id -> (description, default level), in first-seen order
+        self.rules = {}
+
+    @classmethod
+    def open(cls, analyzer, jsonl=None, sarif=None):
+        writers = []
+        if jsonl:
+            writers.append(JsonlWriter(jsonl))
+        if sarif:
+            writers.append(SarifWriter(sarif, f'{analyzer}-analysis'))
+        return cls(analyzer, writers)
+
+    def emit(self, category, kind, message, file=None, line=None, level='warning', **properties):
+        """Write one finding; category and kind form the rule id, e.g. imports/wrong_link_import"""
+        if level not in LEVELS:
+            raise ValueError(f'unknown level {level!r}')
+        rule_id = f'{category}/{kind}'
+        self.counts[rule_id] += 1
+        if not self.writers:
+            return
+        if rule_id not in self.rules:
+            self.rules[rule_id] = (kind.replace('_', ' ').capitalize(), level)
+        finding = {
+            'analyzer': self.analyzer,
+            'rule': rule_id,
+            'level': level,
+            'message': message,
+            'file': file,
+            'line': line,
+            'properties': properties,
+        }
+        for writer in self.writers:
+            writer.write(finding)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def close(self):
+        for writer in self.writers:
+            writer.close(self.rules)
+        self.writers = []
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+ICU Message Compiler
+Parses every message of every locale once at build time and emits one ES
+module per locale in which plain messages stay strings and ICU messages
+become formatter functions, so the browser never parses a message. A
+validation pass checks each locale's placeholders against en.json first
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from catalog_emitter import resolve_locale
+from icu_message import ICUSyntaxError, parse, placeholders
+from message_catalog import MessageCatalog
+
+DEFAULT_OUTPUT = 'build/icu'
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+_DATE_STYLES = ('short', 'medium', 'long', 'full')
+
+# Shared by every generated module; L is the module's locale
+RUNTIME = '''\
+const P = new Intl.PluralRules(L), PO = new Intl.PluralRules(L, {type: "ordinal"});
+const F = new Map();
+const fmt = (Kind, o) => { const k = Kind.name + JSON.stringify(o); let f = F.get(k); if (!f) F.set(k, f = new Kind(L, o)); return f; };
+const n = (x, o) => fmt(Intl.NumberFormat, o).format(x);
+const d = (x, o) => fmt(Intl.DateTimeFormat, o).format(x);
+const v = (x) => typeof x === "number" ? n(x) : x;
+const c = (b) => typeof b === "function" ? b() : b;
+const pl = (x, off, r, b) => c(b["=" + x] ?? b[r.select(x - off)] ?? b.other);
+const s = (x, b) => c(b[x] ?? b.other);
+const j = (...p) => p.every((x) => typeof x === "string") ? p.join("") : p;
+// Without a rich-text handler the tag is rendered back as markup
+const tg = (a, k, ch, o, e) => typeof a[k] === "function" ? a[k](ch) : o + [].concat(ch ?? []).join("") + e;
+'''
+
+
+class CompileWarning(Exception):
+    pass
+
+
+def _js(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _member(name):
+    return f'a.{name}' if _IDENTIFIER.match(name) else f'a[{_js(name)}]'
+
+
+def _number_options(style):
+    """Intl.NumberFormat options for an ICU number style or skeleton"""
+    if not style:
+        return None
+    if style == 'integer':
+        return {'maximumFractionDigits': 0}
+    if style == 'percent' or style == '::percent':
+        return {'style': 'percent'}
+    if style.startswith('::'):
+        options = {}
+        for token in style[2:].split():
+            if token.startswith('currency/'):
+                options.update(style='currency', currency=token.split('/', 1)[1])
+            elif token == 'percent':
+                options['style'] = 'percent'
+            elif token in ('compact-short', 'K'):
+                options.update(notation='compact', compactDisplay='short')
+            elif token in ('compact-long', 'KK'):
+                options.update(notation='compact', compactDisplay='long')
+            elif token.startswith('.') and set(token[1:]) <= {'0', '#'}:
+                options['minimumFractionDigits'] = token.count('0')
+                options['maximumFractionDigits'] = len(token) - 1
+            else:
+                raise CompileWarning(f'unsupported number skeleton token {token!r}')
+        return options
+    raise CompileWarning(f'unsupported number style {style!r}')
+
+
+def _argument(name, fmt):
+    value = _member(name)
+    if fmt is None:
+        return f'v({value})'
+    kind, style = fmt[0], fmt[1] if len(fmt) > 1 else None
+    if kind == 'number':
+        options = _number_options(style)
+        return f'n({value}, {_js(options)})' if options else f'n({value})'
+    if kind in ('date', 'time'):
+        style = style or 'medium'
+        if style not in _DATE_STYLES:
+            raise CompileWarning(f'unsupported {kind} style {style!r}')
+        return f'd({value}, {_js({f"{kind}Style": style})})'
+    raise CompileWarning(f'unsupported argument type {kind!r}')
+
+
+def _compile_nodes(nodes, rich, pound=None):
+    """A JS expression for a node sequence; strings concatenate, rich messages build part arrays"""
+    parts = []
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            if parts and parts[-1][0] == 'text':
+                parts[-1] = ('text', parts[-1][1] + node[1])
+            else:
+                parts.append(('text', node[1]))
+        elif kind == 'pound':
+            parts.append(('expr', pound or 'v(a["#"])'))
+        elif kind == 'arg':
+            parts.append(('expr', _argument(node[1], node[2])))
+        elif kind == 'branch':
+            _, name, branch_kind, offset, options = node
+            value = _member(name)
+            branch_pound = f'n({value} - {offset})' if offset else f'n({value})'
+            bodies = []
+            for selector, body in options:
+                expression, constant = _compile_body(body, rich, branch_pound if branch_kind != 'select' else pound)
+                bodies.append(f'{_js(selector)}: {expression if constant else "() => " + expression}')
+            table = '{' + ', '.join(bodies) + '}'
+            if branch_kind == 'select':
+                parts.append(('expr', f's({value}, {table})'))
+            else:
+                rules = 'PO' if branch_kind == 'selectordinal' else 'P'
+                parts.append(('expr', f'pl({value}, {offset}, {rules}, {table})'))
+        else:
+            _, name, open_tag, children, close_tag = node
+            inner = 'undefined' if children is None else _compile_body(children, rich, pound)[0]
+            parts.append(('expr', f'tg(a, {_js(name)}, {inner}, {_js(open_tag)}, {_js(close_tag)})'))
+
+    rendered = [_js(value) if kind == 'text' else value for kind, value in parts]
+    if not rendered:
+        return '""'
+    if rich:
+        return f'j({", ".join(rendered)})'
+    if len(rendered) == 1 and parts[0][0] == 'expr':
+        return f'"" + {rendered[0]}'
+    return ' + '.join(rendered)
+
+
+def _compile_body(nodes, rich, pound):
+    """(expression, is constant) for a branch or tag body"""
+    if all(node[0] == 'text' for node in nodes):
+        return _js(''.join(node[1] for node in nodes)), True
+    return _compile_nodes(nodes, rich, pound), False
+
+
+def _has_tags(nodes):
+    for node in nodes:
+        if node[0] == 'tag':
+            return True
+        if node[0] == 'branch' and any(_has_tags(body) for _, body in node[4]):
+            return True
+    return False
+
+
+def compile_message(message):
+    """A JS expression: a string literal for plain text, an arrow function for ICU messages"""
+    if not isinstance(message, str):
+        return _js(message)
+    nodes = parse(message)
+    if all(node[0] == 'text' for node in nodes):
+        return _js(''.join(node[1] for node in nodes))
+    return f'(a = {{}}) => {_compile_nodes(nodes, _has_tags(nodes))}'
+
+
+def compile_tree(tree, warnings, prefix='', indent=''):
+    """Object literal for a (nested) message tree; problems are collected into warnings by key"""
+    lines = ['{']
+    inner = indent + '  '
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            source = compile_tree(value, warnings, f'{prefix}{key}.', inner)
+        else:
+            try:
+                source = compile_message(value)
+            except (ICUSyntaxError, CompileWarning) as e:
+                # Ship the raw string; the runtime would not have formatted it either
+                warnings[f'{prefix}{key}'] = str(e)
+                source = _js(value)
+        lines.append(f'{inner}{_js(key)}: {source},')
+    lines.append(f'{indent}}}')
+    return '\n'.join(lines)
+
+
+def compile_locale(catalog, locale):
+    """(module source, warnings) for one locale with fallbacks pre-resolved"""
+    tree, _ = resolve_locale(catalog, locale)
+    warnings = {}
+    body = compile_tree(tree, warnings)
+    source = (f'// Generated by icu_compiler.py from messages/{locale}.json - do not edit\n'
+              f'const L = {_js(locale)};\n{RUNTIME}\nexport default {body};\n')
+    return source, warnings
+
+
+def validate(catalog):
+    """{locale: [problems]}: syntax errors and placeholder/tag mismatches against the source locale"""
+    source = catalog.columns[catalog.source_locale]
+    problems = {}
+    expected = {}
+    for row, en_value in enumerate(source):
+        if isinstance(en_value, str):
+            try:
+                expected[row] = placeholders(parse(en_value))
+            except ICUSyntaxError as e:
+                problems.setdefault(catalog.source_locale, []).append(f'{catalog.keys[row]}: {e}')
+
+    for locale in catalog.target_locales:
+        for row, value in enumerate(catalog.columns[locale]):
+            if not isinstance(value, str) or row not in expected:
+                continue
+            key = catalog.keys[row]
+            try:
+                found = placeholders(parse(value))
+            except ICUSyntaxError as e:
+                problems.setdefault(locale, []).append(f'{key}: {e}')
+                continue
+            missing, extra = expected[row] - found, found - expected[row]
+            if missing or extra:
+                detail = ', '.join([f'missing {{{name}}}' for name in sorted(missing)] +
+                                   [f'unknown {{{name}}}' for name in sorted(extra)])
+                problems.setdefault(locale, []).append(f'{key}: {detail}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompile ICU messages into per-locale JS modules')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--output', help=f'module directory (default: <base_path>/{DEFAULT_OUTPUT})')
+    parser.add_argument('--check', action='store_true', help='only validate placeholders')
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    catalog = MessageCatalog.load(base_path / 'messages')
+    problems = validate(catalog)
+    total = sum(len(p) for p in problems.values())
+    if total:
+        print(f"❌ {total} placeholder problems:")
+        for locale, items in problems.items():
+            for item in items[:20]:
+                print(f"   {locale}: {item}")
+            if len(items) > 20:
+                print(f"   {locale}: ... and {len(items) - 20} more")
+    else:
+        print(f"✅ Placeholders match {catalog.source_locale}.json in all {len(catalog.target_locales)} locales")
+    if args.check:
+        return 1 if total else 0
+
+    output = Path(args.output) if args.output else base_path / DEFAULT_OUTPUT
+    output.mkdir(parents=True, exist_ok=True)
+    for locale in catalog.locales:
+        source, warnings = compile_locale(catalog, locale)
+        path = output / f'{locale}.js'
+        data = source.encode('utf-8')
+        if not path.exists() or path.read_bytes() != data:
+            path.write_bytes(data)
+        functions = source.count('(a = {}) =>')
+        print(f"   {locale}.js: {functions} formatter functions, {len(data) / 1024:.1f} KiB")
+        for key, warning in warnings.items():
+            print(f"   ⚠️  {locale}: {key}: {warning}")
+    print(f"📦 Compiled {len(catalog.locales)} locales to {output}")
+    return 1 if total else 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+ICU MessageFormat Segmentation
+Parses messages like 'Show {count, plural, one {# car} other {# cars}}' and
+inline tags like '<b>Note</b>' into a small AST so tools can work on the
+literal text only and reassemble the message with placeholders intact
+"""
+
+import re
+from functools import lru_cache
+
+# Node shapes (plain tuples, so parsed messages are cheap and hashable):
+#   ('text', value)
+#   ('arg', name, format)                     {name} / {price, number, ::currency/EUR}
+#   ('branch', name, kind, offset, options)   plural / select / selectordinal;
+#                                             options is a tuple of (selector, nodes)
+#   ('pound',)                                # inside a plural branch
+#   ('tag', name, open_tag, nodes, close_tag) rich text; nodes is None when self-closing
+
+BRANCH_KINDS = ('plural', 'select', 'selectordinal')
+
+_TAG = re.compile(r'<(/?)([A-Za-z][\w.-]*)((?:\s+[^<>]*?)?)\s*(/?)>')
+_IDENT = re.compile(r'\s*([^\s{},]+)\s*')
+_SELECTOR = re.compile(r'\s*(=?[^\s{}]+)\s*')
+_OFFSET = re.compile(r'\s*offset:\s*(\d+)\s*')
+
+
+class ICUSyntaxError(ValueError):
+    pass
+
+
+class _Parser:
+    def __init__(self, message):
+        self.message = message
+        self.pos = 0
+
+    def error(self, what):
+        raise ICUSyntaxError(f'{what} at offset {self.pos} in {self.message!r}')
+
+    def parse_nodes(self, in_plural=False, closing_tag=None, in_branch=False):
+        nodes = []
+        text = []
+
+        def flush():
+            if text:
+                nodes.append(('text', ''.join(text)))
+                text.clear()
+
+        message = self.message
+        while self.pos < len(message):
+            ch = message[self.pos]
+            if ch == "'":
+                self.parse_quote(text, in_plural)
+            elif ch == '{':
+                flush()
+                nodes.append(self.parse_argument())
+            elif ch == '}':
+                if in_branch:
+                    break
+                self.error('unbalanced }')
+            elif ch == '#' and in_plural:
+                flush()
+                nodes.append(('pound',))
+                self.pos += 1
+            elif ch == '<' and (tag := _TAG.match(message, self.pos)):
+                closing, name, _attrs, self_closing = tag.groups()
+                if closing:
+                    if name != closing_tag:
+                        self.error(f'unexpected </{name}>')
+                    break
+                flush()
+                self.pos = tag.end()
+                if self_closing:
+                    nodes.append(('tag', name, tag.group(), None, ''))
+                    continue
+                children = self.parse_nodes(in_plural, name, in_branch)
+                close = _TAG.match(message, self.pos)
+                if close is None or close.group(2) != name or not close.group(1):
+                    self.error(f'unclosed <{name}>')
+                self.pos = close.end()
+                nodes.append(('tag', name, tag.group(), children, close.group()))
+            else:
+                text.append(ch)
+                self.pos += 1
+        else:
+            if closing_tag is not None:
+                self.error(f'unclosed <{closing_tag}>')
+            if in_branch:
+                self.error('unclosed branch')
+
+        flush()
+        return tuple(nodes)
+
+    def parse_quote(self, text, in_plural):
+        """ICU apostrophe quoting: '' is a literal apostrophe, '{...}' is literal text"""
+        message = self.message
+        nxt = message[self.pos + 1:self.pos + 2]
+        if nxt == "'":
+            text.append("'")
+            self.pos += 2
+        elif nxt and (nxt in '{}' or (nxt == '#' and in_plural)):
+            end = message.find("'", self.pos + 1)
+            if end == -1:
+                end = len(message)
+            text.append(message[self.pos + 1:end])
+            self.pos = end + 1
+        else:
+            text.append("'")
+            self.pos += 1
+
+    def parse_argument(self):
+        message = self.message
+        self.pos += 1
+        match = _IDENT.match(message, self.pos)
+        if match is None:
+            self.error('expected argument name')
+        name = match.group(1)
+        self.pos = match.end()
+
+        if message.startswith('}', self.pos):
+            self.pos += 1
+            return ('arg', name, None)
+        if not message.startswith(',', self.pos):
+            self.error('expected , or }')
+        self.pos += 1
+
+        match = _IDENT.match(message, self.pos)
+        if match is None:
+            self.error('expected argument type')
+        kind = match.group(1)
+        self.pos = match.end()
+
+        if kind not in BRANCH_KINDS:
+            # Simple formatted argument - keep the style verbatim
+            end = message.find('}', self.pos)
+            if end == -1:
+                self.error('unclosed argument')
+            style = message[self.pos:end]
+            self.pos = end + 1
+            style = style[1:].strip() if style.startswith(',') else style.strip()
+            return ('arg', name, (kind, style) if style else (kind,))
+
+        if not message.startswith(',', self.pos):
+            self.error(f'expected options for {kind}')
+        self.pos += 1
+        offset = 0
+        match = _OFFSET.match(message, self.pos)
+        if match:
+            offset = int(match.group(1))
+            self.pos = match.end()
+
+        options = []
+        while True:
+            while self.pos < len(message) and message[self.pos].isspace():
+                self.pos += 1
+            if message.startswith('}', self.pos):
+                self.pos += 1
+                break
+            match = _SELECTOR.match(message, self.pos)
+            if match is None:
+                self.error('expected selector')
+            self.pos = match.end()
+            if not message.startswith('{', self.pos):
+                self.error('expected { after selector')
+            self.pos += 1
+            body = self.parse_nodes(in_plural=kind != 'select', in_branch=True)
+            if not message.startswith('}', self.pos):
+                self.error('unclosed branch')
+            self.pos += 1
+            options.append((match.group(1), body))
+        return ('branch', name, kind, offset, tuple(options))
+
+
+@lru_cache(maxsize=None)
+def parse(message):
+    """Parse a message into a tuple of nodes; memoized by source string"""
+    return _Parser(message).parse_nodes()
+
+
+def _escape(text, in_plural):
+    out = []
+    for i, ch in enumerate(text):
+        if ch in '{}' or (ch == '#' and in_plural):
+            out.append(f"'{ch}'")
+        elif ch == "'":
+            nxt = text[i + 1:i + 2]
+            special = nxt == "'" or (nxt and (nxt in '{}' or (nxt == '#' and in_plural)))
+            out.append("''" if special else "'")
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def serialize(nodes, in_plural=False):
+    """Turn nodes back into ICU message syntax"""
+    out = []
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            out.append(_escape(node[1], in_plural))
+        elif kind == 'pound':
+            out.append('#')
+        elif kind == 'arg':
+            _, name, fmt = node
+            out.append(f'{{{name}}}' if fmt is None else f'{{{name}, {", ".join(fmt)}}}')
+        elif kind == 'branch':
+            _, name, branch_kind, offset, options = node
+            parts = [f'{{{name}, {branch_kind},']
+            if offset:
+                parts.append(f' offset:{offset}')
+            nested = branch_kind != 'select'
+            for selector, body in options:
+                parts.append(f' {selector} {{{serialize(body, nested)}}}')
+            parts.append('}')
+            out.append(''.join(parts))
+        else:
+            _, name, open_tag, children, close_tag = node
+            out.append(open_tag if children is None else f'{open_tag}{serialize(children, in_plural)}{close_tag}')
+    return ''.join(out)
+
+
+def map_text(nodes, translate):
+    """Rebuild nodes with every literal text segment passed through translate()"""
+    mapped = []
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            mapped.append(('text', translate(node[1])))
+        elif kind == 'branch':
+            _, name, branch_kind, offset, options = node
+            mapped.append(('branch', name, branch_kind, offset,
+                           tuple((selector, map_text(body, translate)) for selector, body in options)))
+        elif kind == 'tag' and node[3] is not None:
+            mapped.append(node[:3] + (map_text(node[3], translate),) + node[4:])
+        else:
+            mapped.append(node)
+    return tuple(mapped)
+
+
+def placeholders(nodes):
+    """Names of all arguments and tags used by a message"""
+    names = set()
+    for node in nodes:
+        kind = node[0]
+        if kind == 'arg':
+            names.add(node[1])
+        elif kind == 'branch':
+            names.add(node[1])
+            for _, body in node[4]:
+                names |= placeholders(body)
+        elif kind == 'tag':
+            names.add(f'<{node[1]}>')
+            if node[3] is not None:
+                names |= placeholders(node[3])
+    return names
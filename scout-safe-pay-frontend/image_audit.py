@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Public Image Audit
+Reads only the headers of the images in public/ (PNG, JPEG, WebP, GIF,
+AVIF, ICO, SVG) to get format and dimensions without decoding pixels, and
+cross-references them with the paths and rendered sizes used in src/
+"""
+
+import argparse
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from analysis_timing import regex
+from source_corpus import SourceCorpus
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.avif', '.ico', '.svg')
+# Files whose format is dictated by browsers/OSes (touch icons, PWA manifest icons)
+PLATFORM_ICON = re.compile(r'(^|/)(favicon|apple-touch-icon[^/]*|icon-\d+[^/]*)\.\w+$')
+# Text files in public/ that can reference images (PWA manifest, service worker, CSS)
+PUBLIC_TEXT_EXTENSIONS = ('.json', '.webmanifest', '.js', '.css', '.xml', '.html')
+
+# Typical savings when re-encoding to WebP (lossy vs JPEG, lossless vs PNG)
+WEBP_SAVINGS = {'jpeg': 0.30, 'png': 0.26, 'gif': 0.60}
+# Serve at most 2x the rendered size (high-DPI screens)
+MAX_DENSITY = 2
+# Anything wider than this is oversized whatever it renders at
+MAX_WIDTH = 2560
+LARGE_FILE = 200 * 1024
+
+_IMAGE_REF = r'''(?<=['"`(])(/[\w\-./%@]+\.(?:png|jpe?g|webp|gif|avif|ico|svg))(?=[?#'"`)])'''
+_SVG_ATTR = re.compile(rb'''\b(width|height|viewBox)\s*=\s*["']([^"']*)["']''')
+_SVG_TAG = re.compile(rb'<svg\b[^>]*>', re.S)
+_SIZE_ATTR = r'''\b(width|height)\s*=\s*(?:\{\s*(\d+)\s*\}|["'](\d+)(?:px)?["'])'''
+
+
+def _jpeg_size(f):
+    """Walk JPEG segments to the first SOF marker, seeking past everything else"""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:  # fill byte
+            f.seek(-1, 1)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue  # markers without a length
+        length = struct.unpack('>H', f.read(2))[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(length - 2, 1)
+
+
+def _svg_size(head):
+    tag = _SVG_TAG.search(head)
+    if tag is None:
+        return None
+    attrs = {name.decode(): value.decode() for name, value in _SVG_ATTR.findall(tag.group(0))}
+    try:
+        return int(float(attrs['width'].rstrip('px'))), int(float(attrs['height'].rstrip('px')))
+    except (KeyError, ValueError):
+        pass
+    box = attrs.get('viewBox', '').replace(',', ' ').split()
+    if len(box) == 4:
+        try:
+            return int(float(box[2])), int(float(box[3]))
+        except ValueError:
+            pass  # units such as '1em' have no pixel size
+    return None
+
+
+def read_header(path):
+    """Format, dimensions and size of an image, from at most a few header reads
+
+    A truncated or unreadable file gets an 'error' instead of dimensions, so one
+    broken image cannot abort the audit of the others.
+    """
+    path = Path(path)
+    info = {'format': None, 'width': None, 'height': None, 'bytes': 0}
+    try:
+        info['bytes'] = path.stat().st_size
+        _read_dimensions(path, info)
+    except (struct.error, OSError, ValueError) as e:
+        info['width'] = info['height'] = None
+        info['error'] = str(e) or type(e).__name__
+    return info
+
+
+def _read_dimensions(path, info):
+    with open(path, 'rb') as f:
+        head = f.read(64)
+        size = None
+        if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            info['format'] = 'png'
+            size = struct.unpack('>II', head[16:24])
+        elif head.startswith(b'\xff\xd8'):
+            info['format'] = 'jpeg'
+            size = _jpeg_size(f)
+        elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            info['format'] = 'webp'
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                size = width & 0x3FFF, height & 0x3FFF
+            elif chunk == b'VP8L':
+                bits = int.from_bytes(head[21:25], 'little')
+                size = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            elif chunk == b'VP8X':
+                size = int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+        elif head[:6] in (b'GIF87a', b'GIF89a'):
+            info['format'] = 'gif'
+            size = struct.unpack('<HH', head[6:10])
+        elif head[4:12] in (b'ftypavif', b'ftypavis'):
+            info['format'] = 'avif'
+            head += f.read(4096)
+            box = head.find(b'ispe')
+            if box != -1:
+                size = struct.unpack('>II', head[box + 8:box + 16])
+        elif head[:4] == b'\x00\x00\x01\x00':
+            info['format'] = 'ico'
+            # First directory entry; 0 means 256
+            size = head[6] or 256, head[7] or 256
+        elif path.suffix == '.svg':
+            info['format'] = 'svg'
+            size = _svg_size(head + f.read(4096))
+    if size:
+        info['width'], info['height'] = size
+
+
+def scan_image_refs(content):
+    """Per-file rule: absolute image paths referenced, with width/height of the enclosing element"""
+    refs = []
+    for match in regex.finditer(_IMAGE_REF, content):
+        # The JSX element (or object literal) around the reference
+        start = max(content.rfind('<', 0, match.start()), content.rfind('{', 0, match.start()))
+        end = content.find('>', match.end())
+        element = content[start:end if end != -1 else match.end()]
+        sizes = {name: int(a or b) for name, a, b in regex.findall(_SIZE_ATTR, element)}
+        refs.append({
+            'path': match.group(1).split('?')[0],
+            'line': content.count('\n', 0, match.start()) + 1,
+            'width': sizes.get('width'),
+            'height': sizes.get('height'),
+        })
+    return refs
+
+
+def public_references(public_dir):
+    """References from text files shipped in public/ itself (manifest icons, service worker)"""
+    refs = {}
+    for path in Path(public_dir).rglob('*'):
+        if path.suffix in PUBLIC_TEXT_EXTENSIONS and path.is_file():
+            found = scan_image_refs(path.read_text(encoding='utf-8', errors='replace'))
+            if found:
+                refs[str(path.relative_to(Path(public_dir).parent))] = found
+    return refs
+
+
+def audit(public_dir, references, jobs=8, app_dir=None):
+    """Audit every image in public/ against {source file: [refs]}; returns findings and totals"""
+    public_dir = Path(public_dir)
+    paths = sorted(p for p in public_dir.rglob('*') if p.suffix.lower() in IMAGE_EXTENSIONS and p.is_file())
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        headers = dict(zip(paths, pool.map(read_header, paths)))
+
+    used = {}
+    for source, refs in references.items():
+        for ref in refs:
+            used.setdefault(ref['path'], []).append({'file': source, **ref})
+
+    images = []
+    findings = {'oversized': [], 'unreferenced': [], 'legacy_format': [], 'missing': [], 'unreadable': []}
+    for path, info in headers.items():
+        url = '/' + path.relative_to(public_dir).as_posix()
+        refs = used.get(url, [])
+        image = {'path': str(path.relative_to(public_dir.parent)), 'url': url, **info, 'references': len(refs)}
+        images.append(image)
+
+        if 'error' in info:
+            findings['unreadable'].append(image)
+            continue
+        if not refs:
+            findings['unreferenced'].append({**image, 'savings': info['bytes']})
+            continue
+
+        rendered = [ref['width'] for ref in refs if ref['width']]
+        savings = 0
+        if info['format'] not in ('svg', 'ico') and info['width']:
+            target = min(max(rendered) * MAX_DENSITY, info['width']) if rendered else min(info['width'], MAX_WIDTH)
+            if target < info['width']:
+                # Bytes scale roughly with pixel count
+                savings = int(info['bytes'] * (1 - (target / info['width']) ** 2))
+                findings['oversized'].append({**image, 'rendered_width': max(rendered) if rendered else None,
+                                              'target_width': target, 'savings': savings})
+            elif info['bytes'] > LARGE_FILE:
+                findings['oversized'].append({**image, 'rendered_width': max(rendered) if rendered else None,
+                                              'target_width': info['width'], 'savings': 0})
+
+        if info['format'] in WEBP_SAVINGS and not PLATFORM_ICON.search(url):
+            findings['legacy_format'].append({
+                **image,
+                'savings': int((info['bytes'] - savings) * WEBP_SAVINGS[info['format']]),
+            })
+
+    shipped = {image['url'] for image in images}
+    for url, refs in sorted(used.items()):
+        # app/favicon.ico and friends are served from the app directory, not public/
+        if url not in shipped and not (app_dir and (Path(app_dir) / url.lstrip('/')).exists()):
+            findings['missing'].append({'url': url, 'references': [f"{r['file']}:{r['line']}" for r in refs]})
+
+    totals = {
+        'public_images': len(images),
+        'public_image_bytes': sum(image['bytes'] for image in images),
+        'estimated_image_savings': sum(f['savings'] for kind in ('oversized', 'unreferenced', 'legacy_format')
+                                       for f in findings[kind]),
+    }
+    return images, findings, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit image weight in public/ from headers only')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--jobs', type=int, default=8, help='read headers on N threads')
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    corpus = SourceCorpus(base_path)
+    references = {f.relative_path: refs for f in corpus.files() if (refs := scan_image_refs(f.text))}
+    references.update(public_references(base_path / 'public'))
+    images, findings, totals = audit(base_path / 'public', references, args.jobs, base_path / 'src' / 'app')
+
+    print(f"🖼️  {totals['public_images']} images, {totals['public_image_bytes'] / 1024:.1f} KiB in public/")
+    for image in images:
+        dims = f"{image['width']}x{image['height']}" if image['width'] else '?'
+        print(f"   {image['url']:<40} {image['format'] or '?':<5} {dims:>11} {image['bytes'] / 1024:>8.1f} KiB"
+              f"  {image['references']} refs")
+    for kind, items in findings.items():
+        if items:
+            print(f"\n  📌 {kind.upper().replace('_', ' ')}:")
+            for item in items:
+                extra = f" (save ~{item['savings'] / 1024:.1f} KiB)" if item.get('savings') else ''
+                where = f" ← {', '.join(item['references'][:3])}" if kind == 'missing' else ''
+                print(f"     • {item['url']}{extra}{where}")
+    print(f"\n💾 Estimated savings: {totals['estimated_image_savings'] / 1024:.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
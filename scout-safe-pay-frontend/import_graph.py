@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Module Import Graph
+Tokenizes the import/export/require statements of every src/ module
+(multi-line, aliased, type-only and re-exports included), resolves them
+with the tsconfig.json path aliases and answers dependency queries:
+transitive dependencies, reverse dependencies and cycles
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from analysis_cache import AnalysisCache
+from source_corpus import SourceCorpus
+
+_TOKEN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | (?P<template>`(?:\\.|[^`\\])*`)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}(),;*.])
+''', re.S | re.X)
+_DIRECTIVE = re.compile(r'''^\s*(?:(?://[^\n]*|/\*.*?\*/)\s*)*['"](use client|use server)['"]''', re.S)
+_JSON_COMMENT = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.S)
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+RESOLVE_SUFFIXES = ('', '.tsx', '.ts', '.jsx', '.js', '/index.tsx', '/index.ts', '/index.jsx', '/index.js')
+
+
+def tokenize(content):
+    """(kind, value, offset) for names, strings and punctuation; comments and templates are dropped"""
+    tokens = []
+    for match in _TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'comment' or kind == 'template':
+            continue
+        value = match.group()
+        if kind == 'string':
+            value = value[1:-1]
+        tokens.append((kind, value, match.start()))
+    return tokens
+
+
+def _parse_specifiers(tokens, i):
+    """Parse `{ a, b as c, type D }` starting at '{'; returns (imported names, index after '}')"""
+    names = []
+    i += 1
+    while i < len(tokens) and tokens[i][1] != '}':
+        kind, value, _ = tokens[i]
+        if kind == 'name':
+            if value == 'type' and i + 1 < len(tokens) and tokens[i + 1][0] == 'name':
+                i += 1
+                value = tokens[i][1]
+            names.append(value)
+            # Skip `as alias`
+            if i + 2 < len(tokens) and tokens[i + 1][1] == 'as':
+                i += 2
+        elif kind == 'string':
+            names.append(value)  # import { 'a-b' as ab }
+        i += 1
+    return names, i + 1
+
+
+def parse_imports(content):
+    """Every static import, re-export, dynamic import() and require() in a module"""
+    tokens = tokenize(content)
+    records = []
+
+    def record(i, source, kind, names=(), default=None, namespace=False, type_only=False):
+        records.append({
+            'source': source,
+            'kind': kind,
+            'names': list(names),
+            'default': default,
+            'namespace': namespace,
+            'type_only': type_only,
+            'line': content.count('\n', 0, tokens[i][2]) + 1,
+        })
+
+    def value(i):
+        return tokens[i][1] if i < len(tokens) else None
+
+    for i, (kind, word, _) in enumerate(tokens):
+        if kind != 'name' or (i and tokens[i - 1][1] == '.'):
+            continue
+
+        if word == 'import':
+            j = i + 1
+            if value(j) == '(':
+                if j + 1 < len(tokens) and tokens[j + 1][0] == 'string':
+                    record(i, tokens[j + 1][1], 'dynamic')
+                continue
+            if j < len(tokens) and tokens[j][0] == 'string':
+                record(i, tokens[j][1], 'side_effect')
+                continue
+            type_only = value(j) == 'type' and value(j + 1) not in (',', 'from')
+            if type_only:
+                j += 1
+            default, names, namespace = None, [], False
+            while j < len(tokens) and value(j) not in ('from', ';'):
+                if value(j) == '{':
+                    found, j = _parse_specifiers(tokens, j)
+                    names.extend(found)
+                    continue
+                if value(j) == '*':
+                    namespace = True
+                    j += 3  # * as name
+                    continue
+                if tokens[j][0] == 'name' and default is None and not names:
+                    default = value(j)
+                elif tokens[j][0] != 'punct':
+                    break  # not an import declaration after all
+                j += 1
+            if value(j) == 'from' and j + 1 < len(tokens) and tokens[j + 1][0] == 'string':
+                record(i, tokens[j + 1][1], 'import', names, default, namespace, type_only)
+
+        elif word == 'export':
+            j = i + 1
+            type_only = value(j) == 'type'
+            if type_only:
+                j += 1
+            names, namespace = [], False
+            if value(j) == '*':
+                namespace = True
+                j += 1
+                if value(j) == 'as':
+                    j += 2
+            elif value(j) == '{':
+                names, j = _parse_specifiers(tokens, j)
+            else:
+                continue
+            if value(j) == 'from' and j + 1 < len(tokens) and tokens[j + 1][0] == 'string':
+                record(i, tokens[j + 1][1], 're-export', names, None, namespace, type_only)
+
+        elif word == 'require' and value(i + 1) == '(':
+            if i + 2 < len(tokens) and tokens[i + 2][0] == 'string':
+                record(i, tokens[i + 2][1], 'require')
+
+    return records
+
+
+def scan_module(content):
+    """Per-file rule: the module's directive and its import records"""
+    directive = _DIRECTIVE.match(content)
+    return {
+        'directive': directive.group(1) if directive else None,
+        'imports': parse_imports(content),
+    }
+
+# The tokenizer lives in this module, so its source is part of the rule fingerprint
+scan_module.uses = (sys.modules[__name__],)
+
+
+def load_path_aliases(base_path):
+    """[(prefix, [target prefixes])] from compilerOptions.paths in tsconfig.json"""
+    config_path = Path(base_path) / 'tsconfig.json'
+    if not config_path.exists():
+        return []
+    text = _JSON_COMMENT.sub(lambda m: m.group(1) or '', config_path.read_text(encoding='utf-8'))
+    options = json.loads(_TRAILING_COMMA.sub(r'\1', text)).get('compilerOptions', {})
+    base_url = options.get('baseUrl', '.')
+    aliases = []
+    for pattern, targets in options.get('paths', {}).items():
+        prefix = pattern.rstrip('*')
+        aliases.append((prefix, [os.path.normpath(os.path.join(base_url, t.rstrip('*'))) + ('/' if t.endswith('/*') else '')
+                                 for t in targets]))
+    # Longest prefix wins, like TypeScript
+    return sorted(aliases, key=lambda a: len(a[0]), reverse=True)
+
+
+class ImportGraph:
+    def __init__(self, base_path, corpus=None, cache=None, use_cache=True):
+        self.base_path = Path(base_path)
+        self.corpus = corpus or SourceCorpus(self.base_path)
+        self.cache = cache
+        if self.cache is None and use_cache:
+            self.cache = AnalysisCache(self.base_path / '.analysis-cache' / 'imports.json')
+        self.aliases = load_path_aliases(self.base_path)
+        self.modules = {}
+        self.edges = {}
+        self.reverse = defaultdict(set)
+        self.unresolved = []
+        self._resolved = {}
+
+    def _scan(self, file):
+        if self.cache is None:
+            return scan_module(file.text)
+        return self.cache.findings(file, scan_module)
+
+    def resolve(self, specifier, importer):
+        """('module', path) for src/ modules, ('asset', path), ('package', name) or ('missing', specifier)"""
+        directory = os.path.dirname(importer)
+        key = (specifier, directory)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        candidates = []
+        if specifier.startswith('.'):
+            candidates.append(os.path.normpath(os.path.join(directory, specifier)))
+        else:
+            for prefix, targets in self.aliases:
+                if specifier.startswith(prefix) and (prefix.endswith('/') or specifier == prefix):
+                    candidates.extend(os.path.normpath(t + specifier[len(prefix):]) for t in targets)
+                    break
+
+        if not candidates:
+            package = specifier.split('/')
+            result = ('package', '/'.join(package[:2]) if specifier.startswith('@') else package[0])
+        else:
+            result = ('missing', specifier)
+            for candidate in candidates:
+                for suffix in RESOLVE_SUFFIXES:
+                    if self.corpus.get(candidate + suffix) is not None:
+                        result = ('module', candidate + suffix)
+                        break
+                    if suffix == '' and (self.base_path / candidate).is_file():
+                        result = ('asset', candidate)
+                        break
+                if result[0] != 'missing':
+                    break
+        self._resolved[key] = result
+        return result
+
+    def build(self, scan=None):
+        """Scan (or reuse cached scans of) every module and link the edges"""
+        scan = scan or self._scan
+        self.modules, self.edges, self.unresolved = {}, {}, []
+        self.reverse = defaultdict(set)
+        for file in self.corpus.files():
+            self.modules[file.relative_path] = scan(file)
+        for path, module in self.modules.items():
+            edges = []
+            for record in module['imports']:
+                kind, target = self.resolve(record['source'], path)
+                if kind == 'missing':
+                    self.unresolved.append((path, record))
+                edges.append((kind, target, record))
+                if kind == 'module':
+                    self.reverse[target].add(path)
+            self.edges[path] = edges
+        return self
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save(self.modules)
+
+    def directive(self, path):
+        return self.modules[path]['directive']
+
+    def imports(self, path, include_types=False):
+        """Modules a file imports directly"""
+        return {target for kind, target, record in self.edges.get(path, ())
+                if kind == 'module' and (include_types or not record['type_only'])}
+
+    def dependencies(self, paths, include_types=False, include_dynamic=True):
+        """Every module reachable from `paths` (a path or an iterable of paths), themselves included"""
+        stack = [paths] if isinstance(paths, str) else list(paths)
+        seen = set()
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            for kind, target, record in self.edges.get(path, ()):
+                if kind != 'module' or target in seen:
+                    continue
+                if record['type_only'] and not include_types:
+                    continue
+                if record['kind'] == 'dynamic' and not include_dynamic:
+                    continue
+                stack.append(target)
+        return seen
+
+    def dependents(self, path, transitive=True):
+        """Modules that import `path`, directly or (by default) through other modules"""
+        if not transitive:
+            return set(self.reverse.get(path, ()))
+        stack, seen = [path], set()
+        while stack:
+            for importer in self.reverse.get(stack.pop(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    stack.append(importer)
+        return seen
+
+    def importers(self, source, name=None):
+        """(path, record) for imports of `source`; name='default' or a named import narrows it"""
+        found = []
+        for path, edges in self.edges.items():
+            for _, _, record in edges:
+                if record['source'] != source:
+                    continue
+                if name == 'default' and record['default'] is None:
+                    continue
+                if name not in (None, 'default') and name not in record['names']:
+                    continue
+                found.append((path, record))
+        return found
+
+    def importers_in(self, path, name):
+        """Import records of `path` that bring in `name` (from any module)"""
+        return [record for _, _, record in self.edges.get(path, ())
+                if name in record['names'] or record['default'] == name]
+
+    def cycles(self, include_types=False):
+        """Strongly connected groups of modules that import each other (iterative Tarjan)"""
+        index, lowlink, on_stack = {}, {}, set()
+        stack, result, counter = [], [], 0
+        for root in sorted(self.edges):
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.imports(root, include_types))))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.imports(child, include_types)))))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+                if lowlink[node] == index[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1 or node in self.imports(node, include_types):
+                        result.append(sorted(group))
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the src/ module import graph')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--deps', metavar='FILE', help='transitive dependencies of a module')
+    parser.add_argument('--rdeps', metavar='FILE', help='modules that (transitively) import a module')
+    parser.add_argument('--cycles', action='store_true', help='list import cycles')
+    parser.add_argument('--importers', metavar='SPECIFIER', help="files importing a package or module, e.g. 'next/link'")
+    parser.add_argument('--no-cache', action='store_true', help='rescan every file')
+    args = parser.parse_args()
+
+    graph = ImportGraph(args.base_path, use_cache=not args.no_cache).build()
+    graph.save()
+
+    if args.deps:
+        for path in sorted(graph.dependencies(args.deps) - {args.deps}):
+            print(path)
+    elif args.rdeps:
+        for path in sorted(graph.dependents(args.rdeps)):
+            print(path)
+    elif args.cycles:
+        for group in graph.cycles():
+            print(' → '.join(group + group[:1]))
+    elif args.importers:
+        for path, record in graph.importers(args.importers):
+            print(f"{path}:{record['line']}")
+    else:
+        edges = sum(len(graph.imports(path)) for path in graph.edges)
+        print(f"🕸️  {len(graph.modules)} modules, {edges} local import edges, "
+              f"{len(graph.unresolved)} unresolved, {len(graph.cycles())} cycles")
+        for path, record in graph.unresolved[:10]:
+            print(f"   ⚠️  {path}:{record['line']}: cannot resolve '{record['source']}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+JSX Element Lexer
+Finds the opening tag of every JSX element with its attribute names in a
+single pass, skipping comments, string literals and the expressions inside
+attribute values
+"""
+
+import re
+
+from analysis_timing import regex
+
+# Tags start right after '<'; a preceding name or bracket makes it a generic or a comparison
+_TOKEN = regex.compile(
+    r'(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`(?:[^`\\]|\\.)*`)'
+    r'|(?<![\w$)\].])<(?P<tag>[A-Za-z][\w$.:-]*)',
+    re.S,
+)
+
+_ATTRIBUTE = re.compile(
+    r'\s*(?:(?P<end>/?>)'
+    r'|(?P<spread>\{\s*\.\.\.)'
+    r'|(?P<name>[A-Za-z_$][\w$:.-]*)\s*(?P<value>=\s*(?:"[^"]*"|\'[^\']*\'|(?P<expr>\{)))?)',
+)
+
+_EXPRESSION = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`(?:[^`\\]|\\.)*`|[{}]', re.S)
+
+
+def _skip_expression(content, pos):
+    """Index just past the '}' closing the expression whose '{' is at pos, or None"""
+    depth = 0
+    for match in _EXPRESSION.finditer(content, pos):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return None
+
+
+def _attributes(content, pos):
+    """(attribute names, has spread, end) for a tag whose name ends at pos; None if it is no tag"""
+    names = []
+    spread = False
+    while True:
+        match = _ATTRIBUTE.match(content, pos)
+        if match is None:
+            return None
+        if match.group('end'):
+            return names, spread, match.end()
+        if match.group('spread'):
+            spread = True
+            pos = _skip_expression(content, match.start('spread'))
+        else:
+            names.append(match.group('name'))
+            pos = match.end()
+            if match.group('expr'):
+                pos = _skip_expression(content, match.start('expr'))
+        if pos is None:
+            return None
+
+
+def scan_elements(content):
+    """Every JSX opening tag as {'name', 'line', 'attributes', 'spread'}, in source order"""
+    elements = []
+    line = 1
+    last = 0
+    for match in _TOKEN.finditer(content):
+        if match.lastgroup != 'tag':
+            continue
+        parsed = _attributes(content, match.end())
+        if parsed is None:
+            continue
+        names, spread, _ = parsed
+        line += content.count('\n', last, match.start())
+        last = match.start()
+        elements.append({
+            'name': match.group('tag'),
+            'line': line,
+            'attributes': names,
+            'spread': spread,
+        })
+    return elements
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Per-Route Message Bundles
+Statically extracts useTranslations/getTranslations usage for every page
+under src/app/[locale] (following the import graph and the layouts around it)
+and writes per-route, per-locale message subsets plus a manifest
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from analysis_cache import AnalysisCache
+from compiled_catalog import CompiledCatalog
+from import_graph import ImportGraph
+from source_corpus import SourceCorpus
+
+BINDING_RE = re.compile(
+    r'''\b(?:const|let|var)\s+(\w+)\s*=\s*(?:await\s+)?(?:useTranslations|getTranslations)\s*\(([^)]*)\)'''
+)
+NAMESPACE_RE = re.compile(r'''^\s*['"]([^'"]*)['"]|namespace\s*:\s*['"]([^'"]*)['"]''')
+LITERAL_RE = re.compile(r'''\s*(?:'([^'\\\n]*)'|"([^"\\\n]*)"|`([^`\\]*)`)''')
+# References that are not translator uses: arrow params (t => ...), member access on a
+# shadowing variable (t.status), and hook dependency arrays ([locale, t])
+NOT_A_USE_RE = re.compile(r'''\s*(?:\)\s*)?=>|\.(?!(?:rich|raw|markup|has)\b)|\s*(?:,\s*[\w.?]+\s*)*\]''')
+
+# Files Next.js renders around a page
+BOUNDARY_FILES = ('layout.tsx', 'template.tsx', 'loading.tsx', 'error.tsx', 'not-found.tsx')
+
+DEFAULT_OUTPUT = 'build/messages'
+
+
+def _namespace(args):
+    match = NAMESPACE_RE.search(args)
+    if match is None:
+        return ''
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+
+def _qualify(namespace, key):
+    return f'{namespace}.{key}' if namespace else key
+
+
+def scan_messages(content):
+    """Per-file rule: the message keys and key prefixes the file uses"""
+    bindings = [(m.start(1), m.group(1), _namespace(m.group(2))) for m in BINDING_RE.finditer(content)]
+    findings = {'keys': [], 'prefixes': [], 'dynamic': []}
+    if not bindings:
+        return findings
+
+    defined_at = {position for position, _, _ in bindings}
+    names = sorted({name for _, name, _ in bindings}, key=len, reverse=True)
+    # Not preceded by identifier characters, '-' (border-t) or quotes (doesn\'t)
+    reference = re.compile(r'(?<![\w.$\-\'"\\])(' + '|'.join(names) + r')\b(\s*(?:\.(?:rich|raw|markup|has))?\s*\()?')
+    keys, prefixes = set(), set()
+
+    for match in reference.finditer(content):
+        if match.start() in defined_at:
+            continue
+        name = match.group(1)
+        if not match.group(2) and NOT_A_USE_RE.match(content, match.end(1)):
+            continue
+        # The closest binding above the call wins; hooks rebind per component
+        namespace = next((ns for pos, n, ns in reversed(bindings) if n == name and pos < match.start()),
+                         next(ns for _, n, ns in bindings if n == name))
+        literal = LITERAL_RE.match(content, match.end()) if match.group(2) else None
+
+        if literal is None:
+            # Dynamic key, or the translator escapes (passed as a prop): keep the namespace
+            prefixes.add(f'{namespace}.' if namespace else '')
+            findings['dynamic'].append({'line': content.count('\n', 0, match.start()) + 1, 'name': name})
+        elif literal.group(3) is not None and '${' in literal.group(3):
+            prefixes.add(_qualify(namespace, literal.group(3).split('${', 1)[0]))
+        else:
+            key = next(g for g in literal.groups() if g is not None)
+            keys.add(_qualify(namespace, key))
+
+    findings['keys'] = sorted(keys)
+    findings['prefixes'] = sorted(prefixes)
+    return findings
+
+
+class BundleSplitter:
+    def __init__(self, base_path, corpus=None, use_cache=True):
+        self.base_path = Path(base_path)
+        self.corpus = corpus or SourceCorpus(self.base_path)
+        self.app_path = self.base_path / 'src' / 'app' / '[locale]'
+        self.cache = AnalysisCache(self.base_path / '.analysis-cache' / 'bundles.json') if use_cache else None
+        self.graph = ImportGraph(self.base_path, self.corpus, use_cache=use_cache)
+
+    def _scan(self, file):
+        if self.cache is None:
+            return scan_messages(file.text)
+        return self.cache.findings(file, scan_messages)
+
+    def routes(self):
+        """(route path, page file, boundary files around it) for every localized page"""
+        routes = []
+        for page in self.corpus.files('.tsx', under=self.app_path):
+            if page.path.name != 'page.tsx':
+                continue
+            segments = page.path.parent.relative_to(self.app_path).parts
+            # Route groups like (auth) do not appear in the URL
+            route = '/' + '/'.join(s for s in segments if not (s.startswith('(') and s.endswith(')')))
+
+            boundaries = []
+            directory = page.path.parent
+            while True:
+                for name in BOUNDARY_FILES:
+                    boundary = self.corpus.get(directory.relative_to(self.base_path) / name)
+                    if boundary is not None:
+                        boundaries.append(boundary)
+                if directory == self.app_path:
+                    break
+                directory = directory.parent
+            routes.append((route, page, boundaries))
+        return sorted(routes, key=lambda r: r[0])
+
+    def usage(self, entry_files):
+        """Keys, prefixes and files reachable from the entry files through local imports"""
+        keys, prefixes = set(), set()
+        # Type-only imports never reach the client
+        files = self.graph.dependencies(f.relative_path for f in entry_files)
+        for path in files:
+            findings = self._scan(self.corpus.get(path))
+            keys.update(findings['keys'])
+            prefixes.update(findings['prefixes'])
+        return keys, prefixes, files
+
+    def split(self, output):
+        """Write every route's bundles and the manifest; returns the manifest"""
+        output = Path(output)
+        catalog = CompiledCatalog.load(self.base_path / 'messages')
+        self.graph.build()
+        manifest = {'locales': catalog.locales, 'routes': {}, 'unknown_keys': {}}
+
+        try:
+            for route, page, boundaries in self.routes():
+                keys, prefixes, files = self.usage([page] + boundaries)
+                rows = set()
+                unknown = []
+                for key in sorted(keys):
+                    row = catalog.find(key)
+                    # A key may also name a whole subtree (t.raw('list'))
+                    subtree = catalog.prefix_rows(f'{key}.')
+                    if catalog.get(key) is None and next(catalog.prefix(f'{key}.'), None) is None:
+                        unknown.append(key)
+                    if row is not None:
+                        rows.add(row)
+                    rows.update(subtree)
+                for prefix in prefixes:
+                    rows.update(catalog.prefix_rows(prefix))
+
+                route_dir = output / route.strip('/')
+                entry = {
+                    'page': page.relative_path,
+                    'files': len(files),
+                    'keys': len(rows),
+                    'bundles': {},
+                    'bytes': {},
+                }
+                for locale in catalog.locales:
+                    data = json.dumps(catalog.tree(locale, rows), ensure_ascii=False,
+                                      separators=(',', ':')).encode('utf-8')
+                    path = route_dir / f'{locale}.json'
+                    if not path.exists() or path.read_bytes() != data:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        path.write_bytes(data)
+                    entry['bundles'][locale] = str(path.relative_to(output))
+                    entry['bytes'][locale] = len(data)
+                manifest['routes'][route] = entry
+                if unknown:
+                    manifest['unknown_keys'][route] = unknown
+
+            manifest['full_bytes'] = {
+                locale: len(json.dumps(catalog.tree(locale), ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                for locale in catalog.locales
+            }
+        finally:
+            catalog.close()
+
+        output.mkdir(parents=True, exist_ok=True)
+        with open(output / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        if self.cache is not None:
+            self.cache.save(f.relative_path for f in self.corpus.files())
+        self.graph.save()
+        return manifest
+
+
+def print_summary(manifest, output):
+    routes = manifest['routes']
+    full = manifest['full_bytes'].get('en', 0)
+    print(f"✅ Wrote {len(routes)} routes × {len(manifest['locales'])} locales to {output}")
+    if not routes or not full:
+        return
+    sizes = sorted(entry['bytes'].get('en', 0) for entry in routes.values())
+    average = sum(sizes) / len(sizes)
+    print(f"   Full en catalog: {full / 1024:.1f} KiB")
+    print(f"   Per-route en bundle: avg {average / 1024:.1f} KiB, max {sizes[-1] / 1024:.1f} KiB "
+          f"({100 * (1 - average / full):.0f}% smaller on average)")
+
+    largest = sorted(routes.items(), key=lambda r: r[1]['bytes'].get('en', 0), reverse=True)[:5]
+    print("\n📦 LARGEST BUNDLES:")
+    for route, entry in largest:
+        print(f"   {route}: {entry['keys']} keys, {entry['bytes'].get('en', 0) / 1024:.1f} KiB "
+              f"from {entry['files']} files")
+
+    if manifest['unknown_keys']:
+        print("\n⚠️  KEYS USED IN CODE BUT MISSING FROM en.json:")
+        for route, keys in list(manifest['unknown_keys'].items())[:10]:
+            print(f"   {route}: {', '.join(keys[:5])}" + (f" (+{len(keys) - 5} more)" if len(keys) > 5 else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Split the message catalogs into per-route bundles')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--output', help=f'bundle directory (default: <base_path>/{DEFAULT_OUTPUT})')
+    parser.add_argument('--no-cache', action='store_true', help='rescan every file instead of reusing cached usage')
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else Path(args.base_path) / DEFAULT_OUTPUT
+    splitter = BundleSplitter(args.base_path, use_cache=not args.no_cache)
+    manifest = splitter.split(output)
+    print_summary(manifest, output)
+
+
+if __name__ == '__main__':
+    main()
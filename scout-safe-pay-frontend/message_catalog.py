@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Flat Message Catalog
+Loads every messages/<locale>.json into one table: a row per interned
+dotted key path, a column per locale, so coverage checks across all locales
+are a single pass over parallel arrays
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+SOURCE_LOCALE = 'en'
+
+# Values that are expected to be identical across locales
+TECHNICAL_MARKERS = ('@', '+', 'AutoScout24')
+
+_JSON_TOKEN = re.compile(r'"(?:[^"\\\n]|\\.)*"\s*:|"(?:[^"\\\n]|\\.)*"|[{}\[\]\n]')
+
+
+def flatten(tree, prefix='', keep_empty=False):
+    """Yield (dotted key path, leaf value) pairs in document order"""
+    stack = [(prefix, iter(tree.items()))]
+    while stack:
+        path, items = stack[-1]
+        for key, value in items:
+            full_key = f'{path}{key}'
+            # Empty objects are leaves too when the caller needs a lossless walk
+            if isinstance(value, dict) and (value or not keep_empty):
+                stack.append((f'{full_key}.', iter(value.items())))
+                break
+            yield sys.intern(full_key), value
+        else:
+            stack.pop()
+
+
+def key_lines(path):
+    """{dotted key path: line number} for every key in a JSON message file, to locate findings"""
+    lines = {}
+    # Key prefix of each enclosing object; arrays push a prefix no catalog key can have
+    stack = []
+    key = None
+    line = 1
+    for match in _JSON_TOKEN.finditer(Path(path).read_text(encoding='utf-8')):
+        token = match.group()
+        if token == '\n':
+            line += 1
+        elif token.endswith(':'):
+            key = json.loads(token[:-1].rstrip())
+            lines[sys.intern(''.join(stack) + key)] = line
+        elif token == '{':
+            stack.append(f'{key}.' if key is not None else '')
+            key = None
+        elif token == '[':
+            stack.append('[].')
+            key = None
+        elif token in '}]':
+            stack.pop()
+        else:
+            key = None
+    return lines
+
+
+def is_technical(value):
+    """Emails, phone numbers and brand names are legitimately left untranslated"""
+    text = str(value)
+    return any(marker in text for marker in TECHNICAL_MARKERS)
+
+
+class MessageCatalog:
+    def __init__(self, messages_dir, source_locale=SOURCE_LOCALE):
+        self.messages_dir = Path(messages_dir)
+        self.source_locale = source_locale
+        self.locales = []
+        self.keys = []
+        self.index = {}
+        self.columns = {}
+        self.files_read = 0
+        self.bytes_read = 0
+
+    @classmethod
+    def load(cls, messages_dir, source_locale=SOURCE_LOCALE):
+        """Discover every locale file and build the table in one walk per file"""
+        catalog = cls(messages_dir, source_locale)
+        paths = sorted(catalog.messages_dir.glob('*.json'))
+        # The source locale defines row order, so load it first
+        paths.sort(key=lambda p: p.stem != source_locale)
+        for path in paths:
+            data = path.read_bytes()
+            catalog.files_read += 1
+            catalog.bytes_read += len(data)
+            catalog.add_locale(path.stem, json.loads(data))
+        return catalog
+
+    def add_locale(self, locale, tree):
+        """Add a column, appending rows for keys no earlier locale had"""
+        column = [None] * len(self.keys)
+        for key, value in flatten(tree):
+            row = self.index.get(key)
+            if row is None:
+                row = len(self.keys)
+                self.index[key] = row
+                self.keys.append(key)
+                for other in self.columns.values():
+                    other.append(None)
+                column.append(None)
+            column[row] = value
+        self.locales.append(locale)
+        self.columns[locale] = column
+
+    @property
+    def target_locales(self):
+        return [locale for locale in self.locales if locale != self.source_locale]
+
+    @property
+    def source_rows(self):
+        """Number of rows defined by the source locale"""
+        source = self.columns.get(self.source_locale, [])
+        return sum(1 for value in source if value is not None)
+
+    def compare(self, locale):
+        """Missing, untranslated and extra rows of one locale against the source"""
+        source = self.columns[self.source_locale]
+        column = self.columns[locale]
+        missing = []
+        untranslated = []
+        extra = []
+        for row, (en_value, value) in enumerate(zip(source, column)):
+            if en_value is None:
+                if value is not None:
+                    extra.append(row)
+            elif value is None:
+                missing.append(row)
+            elif value == en_value and en_value != '' and not is_technical(en_value):
+                untranslated.append(row)
+        return {'missing': missing, 'untranslated': untranslated, 'extra': extra}
+
+    def coverage_matrix(self):
+        """Per namespace and locale: share of source keys present and translated"""
+        source = self.columns[self.source_locale]
+        namespaces = {}
+        for row, key in enumerate(self.keys):
+            if source[row] is not None:
+                namespaces.setdefault(key.split('.', 1)[0], []).append(row)
+
+        matrix = {}
+        for namespace, rows in namespaces.items():
+            matrix[namespace] = {}
+            for locale in self.target_locales:
+                column = self.columns[locale]
+                present = translated = 0
+                for row in rows:
+                    value = column[row]
+                    if value is None:
+                        continue
+                    present += 1
+                    if value != source[row] or source[row] == '' or is_technical(source[row]):
+                        translated += 1
+                matrix[namespace][locale] = {
+                    'keys': len(rows),
+                    'present': round(100 * present / len(rows), 1),
+                    'translated': round(100 * translated / len(rows), 1),
+                }
+        return matrix
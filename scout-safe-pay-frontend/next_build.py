@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Next.js Build Output
+Attributes first-load JS to every route and shared chunk, either from the
+route table `next build` prints (build-output.txt) or from the manifests
+in .next/, and diffs two builds route by route
+"""
+
+import argparse
+import gzip
+import json
+import re
+from pathlib import Path
+
+BUILD_LOG = 'build-output.txt'
+NEXT_DIR = '.next'
+
+_UNITS = {'B': 1, 'kB': 1000, 'KB': 1000, 'MB': 1000 ** 2}
+_SIZE = r'(\d+(?:\.\d+)?\s*(?:B|kB|KB|MB))'
+# ├ ○ /[locale]/about                  5.2 kB         120 kB   (sizes are absent since Next 16)
+# Prerendered paths nest below their route (├   └ /en/about) and are skipped
+_ROUTE_ROW = re.compile(r'^[┌├└│]\s+(?:[^\s┌├└│/]\s+)?(/\S*)(?:\s+' + _SIZE + r'\s+' + _SIZE + r')?\s*$')
+_SHARED_TOTAL = re.compile(r'^\+\s+First Load JS shared by all\s+' + _SIZE)
+_SHARED_ROW = re.compile(r'^\s+[├└]\s+(.+?)\s+' + _SIZE + r'\s*$')
+_ANSI = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def parse_size(text):
+    number, unit = re.match(r'(\d+(?:\.\d+)?)\s*(\w+)', text).groups()
+    return int(float(number) * _UNITS[unit])
+
+
+def metric_route(route):
+    """/[locale]/dealers/[id] -> /:locale/dealers/:id, so budget globs need no escaping"""
+    return re.sub(r'\[+\.*(\w+)\]+', r':\1', route)
+
+
+def parse_build_output(text):
+    """Routes, shared chunks and errors from the text `next build` prints"""
+    build = {'source': BUILD_LOG, 'routes': {}, 'shared': {}, 'shared_total': None, 'errors': []}
+    in_shared = False
+    lines = _ANSI.sub('', text).splitlines()
+    for i, line in enumerate(lines):
+        if line.strip() == '> Build error occurred':
+            # The message is the next non-empty line or two
+            detail = [l.strip() for l in lines[i + 1:i + 4] if l.strip()]
+            build['errors'].append(' '.join(detail[:2]))
+            continue
+
+        shared_total = _SHARED_TOTAL.match(line)
+        if shared_total:
+            build['shared_total'] = parse_size(shared_total.group(1))
+            in_shared = True
+            continue
+        if in_shared:
+            row = _SHARED_ROW.match(line)
+            if row:
+                build['shared'][row.group(1)] = parse_size(row.group(2))
+                continue
+            in_shared = False
+
+        row = _ROUTE_ROW.match(line)
+        if row:
+            route, size, first_load = row.groups()
+            build['routes'][route] = {
+                'size': parse_size(size) if size else None,
+                'first_load': parse_size(first_load) if first_load else None,
+                'chunks': [],
+            }
+    return build
+
+
+def _entry_route(entry):
+    """'/[locale]/about/page' or '[project]/src/app/[locale]/about/page' -> '/[locale]/about'"""
+    entry = re.sub(r'^.*?/src/app', '', entry).replace('[project]', '')
+    route = re.sub(r'/(page|layout)$', '', entry)
+    return route or '/'
+
+
+def read_next_dir(next_dir):
+    """Per-route JS chunks from the .next manifests, sized as gzip like `next build` reports"""
+    next_dir = Path(next_dir)
+    entries = {}
+
+    manifests = [next_dir / 'app-build-manifest.json']
+    # Turbopack writes one manifest per entry under server/app
+    manifests += sorted((next_dir / 'server' / 'app').rglob('app-build-manifest.json'))
+    for path in manifests:
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for entry, files in json.load(f).get('pages', {}).items():
+                    entries.setdefault(entry, set()).update(files)
+
+    if not entries:
+        # Newer builds only record entry chunks in the client reference manifests
+        for path in (next_dir / 'server' / 'app').rglob('*_client-reference-manifest.js'):
+            text = path.read_text(encoding='utf-8')
+            for match in re.finditer(r'=\s*(\{.*\})\s*;?\s*$', text, re.M):
+                for entry, files in json.loads(match.group(1)).get('entryJSFiles', {}).items():
+                    entries.setdefault(entry, set()).update(files)
+
+    root_files = set()
+    build_manifest = next_dir / 'build-manifest.json'
+    if build_manifest.exists():
+        with open(build_manifest, 'r', encoding='utf-8') as f:
+            root_files.update(json.load(f).get('rootMainFiles', []))
+
+    sizes = {}
+
+    def gzip_size(chunk):
+        if chunk not in sizes:
+            path = next_dir / chunk
+            sizes[chunk] = len(gzip.compress(path.read_bytes(), 9)) if path.exists() else 0
+        return sizes[chunk]
+
+    layouts = {_entry_route(e): files for e, files in entries.items() if e.endswith('/layout')}
+    routes = {}
+    for entry, files in entries.items():
+        if not entry.endswith('/page'):
+            continue
+        route = _entry_route(entry)
+        chunks = set(files) | root_files
+        # A page also loads every layout above it
+        parts = route.strip('/').split('/') if route != '/' else []
+        for depth in range(len(parts) + 1):
+            chunks |= layouts.get('/' + '/'.join(parts[:depth]), set())
+        routes[route] = sorted(c for c in chunks if c.endswith('.js'))
+
+    shared = set.intersection(*(set(c) for c in routes.values())) if routes else set()
+    build = {'source': str(next_dir), 'routes': {}, 'shared': {}, 'shared_total': None, 'errors': []}
+    for chunk in sorted(shared):
+        build['shared'][chunk] = gzip_size(chunk)
+    build['shared_total'] = sum(build['shared'].values())
+    for route, chunks in sorted(routes.items()):
+        own = [c for c in chunks if c not in shared]
+        build['routes'][route] = {
+            'size': sum(gzip_size(c) for c in own),
+            'first_load': build['shared_total'] + sum(gzip_size(c) for c in own),
+            'chunks': own,
+        }
+    return build
+
+
+def load_build(path):
+    """A build from a .next directory, a project directory, a build log or a saved JSON snapshot"""
+    path = Path(path)
+    if path.is_dir():
+        if (path / NEXT_DIR).is_dir():
+            return load_build(path / NEXT_DIR)
+        if path.name == NEXT_DIR or (path / 'build-manifest.json').exists():
+            build = read_next_dir(path)
+            if build['routes']:
+                return build
+        log = path.parent / BUILD_LOG if path.name == NEXT_DIR else path / BUILD_LOG
+        return load_build(log) if log.exists() else None
+    if not path.exists():
+        return None
+    text = path.read_text(encoding='utf-8', errors='replace')
+    if path.suffix == '.json':
+        return json.loads(text)
+    build = parse_build_output(text)
+    build['source'] = str(path)
+    return build
+
+
+def diff_builds(old, new):
+    """Per-route first-load changes, largest growth first"""
+    changes = []
+    for route in sorted(set(old['routes']) | set(new['routes'])):
+        before = old['routes'].get(route, {}).get('first_load')
+        after = new['routes'].get(route, {}).get('first_load')
+        if before == after:
+            continue
+        changes.append({
+            'route': route,
+            'before': before,
+            'after': after,
+            'delta': (after or 0) - (before or 0),
+        })
+    changes.sort(key=lambda c: c['delta'], reverse=True)
+    return {
+        'shared_delta': (new.get('shared_total') or 0) - (old.get('shared_total') or 0),
+        'routes': changes,
+    }
+
+
+def _kb(size):
+    return '-' if size is None else f'{size / 1000:.1f} kB'
+
+
+def print_build(build):
+    routes = build['routes']
+    print(f"📦 {len(routes)} routes from {build['source']}")
+    for error in build['errors']:
+        print(f"   ❌ Build failed: {error}")
+    if build['shared_total'] is not None:
+        print(f"   First Load JS shared by all: {_kb(build['shared_total'])}")
+        for chunk, size in sorted(build['shared'].items(), key=lambda c: -c[1]):
+            print(f"     {chunk:<56} {_kb(size):>10}")
+    for route, entry in sorted(routes.items(), key=lambda r: -(r[1]['first_load'] or 0)):
+        print(f"   {route:<56} {_kb(entry['size']):>10} {_kb(entry['first_load']):>10}")
+
+
+def print_diff(diff):
+    print(f"📊 Shared first-load JS: {diff['shared_delta'] / 1000:+.1f} kB")
+    if not diff['routes']:
+        print("   No route changed")
+    for change in diff['routes']:
+        if change['before'] is None:
+            status = 'new'
+        elif change['after'] is None:
+            status = 'removed'
+        else:
+            status = f"{change['delta'] / 1000:+.1f} kB"
+        print(f"   {change['route']:<56} {_kb(change['before']):>10} → {_kb(change['after']):>10}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-route first-load JS from a Next.js build')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--build', help='a .next directory, build log or snapshot (default: the project build)')
+    parser.add_argument('--save', metavar='FILE', help='save the parsed build as a JSON snapshot')
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'), help='compare two builds or snapshots')
+    args = parser.parse_args()
+
+    if args.diff:
+        old, new = (load_build(path) for path in args.diff)
+        if old is None or new is None:
+            print("❌ Could not read both builds")
+            return 1
+        print_diff(diff_builds(old, new))
+        return 0
+
+    build = load_build(args.build or args.base_path)
+    if build is None:
+        print("❌ No build found - run `next build` first")
+        return 1
+    print_build(build)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(build, f, indent=2)
+        print(f"\n💾 Saved snapshot to {args.save}")
+    return 1 if build['errors'] else 0
+
+
+if __name__ == '__main__':
+    exit(main())
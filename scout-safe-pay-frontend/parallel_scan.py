@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Parallel Per-File Scanning
+Shards per-file analyzer rules across a process pool; results come back in
+submission order so the parent can reduce them exactly like a serial run
+"""
+
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis_cache import content_hash
+from analysis_timing import regex
+
+
+def _apply_each(rules, content):
+    return [rule(content) for rule in rules]
+
+
+def _run_rules(apply, hashed, task):
+    """Worker: read one file and apply every rule to it
+
+    Returns (findings, bytes read, regex evaluations, content hash or None).
+    """
+    path, rules = task
+    regex_before = regex.evaluations
+    with open(path, 'rb') as f:
+        data = f.read()
+    findings = apply(rules, data.decode('utf-8'))
+    return findings, len(data), regex.evaluations - regex_before, content_hash(data) if hashed else None
+
+
+def scan_parallel(tasks, jobs, apply=_apply_each, counters=None, digests=None):
+    """Run (path, rules) tasks on `jobs` processes, returning findings in task order
+
+    `apply(rules, content)` runs the rules of one file in the worker; it must be
+    a module-level function so it can be sent to the pool. The workers' file
+    reads and regex evaluations are added to `counters` when one is given, and
+    each file's content hash is appended to `digests` when it is a list, so the
+    parent never has to read the file itself.
+    """
+    if not tasks:
+        return []
+    # A few chunks per worker keeps the pool busy without per-file IPC overhead
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(functools.partial(_run_rules, apply, digests is not None), tasks,
+                                chunksize=chunksize))
+    if counters is not None:
+        counters['files_read'] += len(results)
+        counters['bytes_read'] += sum(nbytes for _, nbytes, _, _ in results)
+        counters['regex_evaluations'] += sum(evaluations for _, _, evaluations, _ in results)
+    if digests is not None:
+        digests.extend(digest for _, _, _, digest in results)
+    return [findings for findings, _, _, _ in results]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Declarative Per-File Rule Engine
+Rules declare the files they apply to (a glob) and the parsed artifacts
+they need (raw text, Tailwind class tokens, module imports, JSX elements);
+the engine runs every registered rule in one traversal of the corpus and
+builds each artifact at most once per file, however many rules read it
+"""
+
+import re
+from collections import Counter
+
+import import_graph
+import jsx_lexer
+import tailwind_lexer
+from import_graph import scan_module
+from jsx_lexer import scan_elements
+from parallel_scan import scan_parallel
+from tailwind_lexer import scan_classes
+
+# name -> (builder over the file text, module whose source defines the artifact)
+ARTIFACTS = {
+    'classes': (scan_classes, tailwind_lexer),
+    'module': (scan_module, import_graph),
+    'jsx': (scan_elements, jsx_lexer),
+}
+
+_PENDING = object()
+
+# A rule that is itself an artifact builder reuses the shared artifact
+_BUILDERS = {builder: name for name, (builder, _) in ARTIFACTS.items()}
+
+
+def compile_glob(pattern):
+    """Regex for a glob over relative paths: ** spans directories, {a,b} alternates, [ ] is literal"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '{' and '}' in pattern[i:]:
+            end = pattern.index('}', i)
+            parts.append('(?:' + '|'.join(map(re.escape, pattern[i + 1:end].split(','))) + ')')
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(parts))
+
+
+def rule(glob='**', needs=('text',), uses=(), contains=None, default=None):
+    """Declare a per-file rule; it is called with one argument per needed artifact, in order
+
+    A rule with `contains` only runs on files whose text contains that literal;
+    every other file gets `default` without any artifact being built for it.
+    """
+    for need in needs:
+        if need != 'text' and need not in ARTIFACTS:
+            raise ValueError(f'unknown artifact {need!r}')
+
+    def register(function):
+        function.glob = glob
+        function.needs = tuple(needs)
+        function.contains = contains
+        function.default = default
+        # Artifact builders are part of the rule fingerprint, so a lexer change invalidates cached findings
+        function.uses = tuple(uses) + tuple(ARTIFACTS[need][1] for need in needs if need != 'text')
+        return function
+    return register
+
+
+class FileArtifacts:
+    """Artifacts of one file, each built on first use and shared by every rule"""
+
+    def __init__(self, content, built=None):
+        self.values = {'text': content}
+        self.built = built
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            self.values[name] = ARTIFACTS[name][0](self.values['text'])
+            if self.built is not None:
+                self.built[name] += 1
+        return self.values[name]
+
+
+def apply_rule(rule, artifacts):
+    """Run one rule over a file's shared artifacts; rules must not mutate what they are given
+
+    Findings are shared too (a default is the same object for every file), so
+    callers treat them as read-only.
+    """
+    if rule in _BUILDERS:
+        return artifacts[_BUILDERS[rule]]
+    contains = getattr(rule, 'contains', None)
+    if contains is not None and contains not in artifacts['text']:
+        return rule.default
+    return rule(*(artifacts[need] for need in getattr(rule, 'needs', ('text',))))
+
+
+def apply_rules(rules, content):
+    """Findings of every rule for one file's text, in rule order"""
+    artifacts = FileArtifacts(content)
+    return [apply_rule(rule, artifacts) for rule in rules]
+
+
+class RuleEngine:
+    """Schedules a set of rules over a corpus in one pass, reusing cached findings"""
+
+    def __init__(self, rules, cache=None):
+        self.rules = tuple(rules)
+        self.cache = cache
+        self._globs = {rule: compile_glob(getattr(rule, 'glob', '**')) for rule in self.rules}
+        self.stats = Counter()
+        self.artifacts_built = Counter()
+        # Reads and regex evaluations made in worker processes, invisible to the parent's counters
+        self.worker_io = Counter()
+
+    def rules_for(self, relative_path):
+        """The rules whose glob matches a path, in registration order"""
+        return [rule for rule in self.rules if self._globs[rule].fullmatch(relative_path)]
+
+    def _apply(self, rules, file):
+        artifacts = FileArtifacts(file.text, self.artifacts_built)
+        return [apply_rule(rule, artifacts) for rule in rules]
+
+    def run(self, corpus, jobs=1):
+        """{rule name: {relative path: findings}} in corpus order, computing only what is not cached"""
+        results = {rule.__name__: {} for rule in self.rules}
+        self.stats = Counter()
+        self.worker_io = Counter()
+        # Workers read and hash the files they analyze, so the parent only stats them
+        parallel = jobs > 1
+        pending = []
+        for file in corpus.files():
+            missing = []
+            for rule in self.rules_for(file.relative_path):
+                if self.cache is not None:
+                    cached = self.cache.cached(file, rule, _PENDING, read=not parallel)
+                else:
+                    cached = _PENDING
+                # Reserve the slot so results keep corpus order whatever gets computed later
+                results[rule.__name__][file.relative_path] = cached
+                if cached is _PENDING:
+                    missing.append(rule)
+            self.stats['files'] += 1
+            if missing:
+                pending.append((file, missing))
+
+        digests = []
+        if parallel and len(pending) > 1:
+            computed = scan_parallel([(str(file.path), rules) for file, rules in pending], jobs, apply_rules,
+                                     self.worker_io, digests if self.cache is not None else None)
+        else:
+            computed = (self._apply(rules, file) for file, rules in pending)
+
+        for i, ((file, rules), findings) in enumerate(zip(pending, computed)):
+            digest = digests[i] if digests else None
+            for rule, result in zip(rules, findings):
+                results[rule.__name__][file.relative_path] = result
+                if self.cache is not None:
+                    self.cache.store(file, rule, result, digest)
+                self.stats['computed'] += 1
+        self.stats['reused'] = sum(len(r) for r in results.values()) - self.stats['computed']
+        return results
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Sharded Sitemap Generator
+Streams the public pages and every vehicle listing into sitemap shards of at
+most 50,000 URLs / 50 MB with hreflang alternates for all locales, writes a
+sitemap index over them, and on later runs only rewrites the shards whose
+listings changed
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from source_corpus import SourceCorpus
+
+# sitemaps.org protocol limits per file
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+DEFAULT_LISTINGS = '../scout-safe-pay-backend/database/seeders/scraped_vehicles.json'
+DEFAULT_OUTPUT = 'public/sitemaps'
+INDEX_NAME = 'sitemap-index.xml'
+MANIFEST_NAME = '.manifest.json'
+# Bump when the rendered XML changes, so existing shards are rewritten
+FORMAT_VERSION = 1
+LISTING_ROUTE = '/vehicle/{id}'
+# Listing timestamps, in order of preference; listings without one get no <lastmod>
+LASTMOD_FIELDS = ('updatedAt', 'updated_at', 'lastModified', 'modifiedAt', 'createdAt', 'created_at')
+
+_LOCALES = re.compile(r'locales\s*:\s*\[([^\]]*)\]')
+_DEFAULT_LOCALE = re.compile(r'''defaultLocale\s*:\s*['"]([^'"]+)['"]''')
+_ROUTES = re.compile(r'const\s+routes\s*=\s*\[([^\]]*)\]')
+_STRING = re.compile(r'''['"]([^'"]*)['"]''')
+
+URLSET_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+               'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+URLSET_CLOSE = '</urlset>\n'
+
+
+def load_locales(base_path):
+    """(locales, default locale) from src/i18n/routing.ts"""
+    text = (Path(base_path) / 'src' / 'i18n' / 'routing.ts').read_text(encoding='utf-8')
+    locales = _STRING.findall(_LOCALES.search(text).group(1))
+    default = _DEFAULT_LOCALE.search(text)
+    return locales, default.group(1) if default else locales[0]
+
+
+def page_routes(corpus):
+    """Route paths of every page under src/app/[locale]; route groups do not appear in URLs"""
+    app_path = corpus.base_path / 'src' / 'app' / '[locale]'
+    routes = set()
+    for page in corpus.files('.tsx', under=app_path):
+        if page.path.name == 'page.tsx':
+            segments = page.path.parent.relative_to(app_path).parts
+            routes.add('/'.join([''] + [s for s in segments if not (s.startswith('(') and s.endswith(')'))]))
+    return routes
+
+
+def public_routes(corpus):
+    """The public routes src/app/sitemap.ts lists, minus those with no page behind them"""
+    text = (corpus.base_path / 'src' / 'app' / 'sitemap.ts').read_text(encoding='utf-8')
+    declared = _STRING.findall(_ROUTES.search(text).group(1))
+    pages = page_routes(corpus)
+    return [route for route in declared if route in pages], [route for route in declared if route not in pages]
+
+
+def iter_listings(path, chunk_size=1 << 20):
+    """Each element of a JSON array (or JSON Lines file), decoded one at a time from fixed-size reads"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        if str(path).endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        buffer, position, eof = '', 0, False
+        # Characters dropped from the front of the buffer, for error offsets
+        consumed = 0
+
+        def fill():
+            nonlocal buffer, position, eof, consumed
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            consumed += position
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def skip(characters):
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in characters:
+                    position += 1
+                if position < len(buffer) or eof:
+                    return
+                fill()
+
+        skip(' \t\r\n')
+        if buffer[position:position + 1] != '[':
+            raise ValueError(f"{path}: expected a JSON array of listings")
+        position += 1
+        while True:
+            skip(' \t\r\n,')
+            if position >= len(buffer):
+                raise ValueError(f"{path}: unterminated JSON array")
+            if buffer[position] == ']':
+                return
+            error = None
+            try:
+                listing, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                error, end = e, None
+            # An element touching the end of the buffer may continue in the next chunk
+            if end is None or (end == len(buffer) and not eof):
+                if eof:
+                    raise ValueError(f"{path}: invalid JSON at offset {consumed + error.pos}: {error.msg}") from error
+                fill()
+                continue
+            yield listing
+            position = end
+
+
+def listing_lastmod(listing):
+    for field in LASTMOD_FIELDS:
+        value = listing.get(field)
+        if value:
+            return str(value)[:10] if re.match(r'\d{4}-\d\d-\d\d', str(value)) else None
+    return None
+
+
+class SitemapWriter:
+    def __init__(self, base_url, locales, default_locale, output, compress=False,
+                 max_urls=MAX_URLS, max_bytes=MAX_BYTES):
+        self.base_url = base_url.rstrip('/')
+        self._base = self._escape(self.base_url)
+        self.locales = locales
+        self.default_locale = default_locale
+        self.output = Path(output)
+        self.compress = compress
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.manifest_path = self.output / MANIFEST_NAME
+        # Everything besides the items that ends up in a shard's bytes seeds every shard digest
+        self.settings = json.dumps([FORMAT_VERSION, self.base_url, list(locales), default_locale, compress])
+        self.manifest = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        self.shards = {}
+        self.written = []
+        self.skipped = []
+
+    @staticmethod
+    def _escape(text):
+        # Safe both as element text and inside a double-quoted attribute
+        return escape(text, {'"': '&quot;'})
+
+    def entries(self, route, lastmod=None, changefreq=None, priority=None):
+        """<url> elements for a route in every locale, each listing all its alternates"""
+        # Escaped once per route; the base URL and locales never change
+        route = self._escape(route)
+        alternates = ''.join(
+            f'    <xhtml:link rel="alternate" hreflang="{locale}" href="{self._base}/{locale}{route}" />\n'
+            for locale in self.locales
+        ) + (f'    <xhtml:link rel="alternate" hreflang="x-default" '
+             f'href="{self._base}/{self.default_locale}{route}" />\n')
+        extra = ''
+        if lastmod:
+            extra += f'    <lastmod>{escape(lastmod)}</lastmod>\n'
+        if changefreq:
+            extra += f'    <changefreq>{changefreq}</changefreq>\n'
+        if priority is not None:
+            extra += f'    <priority>{priority:.1f}</priority>\n'
+        return [f'  <url>\n    <loc>{self._base}/{locale}{route}</loc>\n{extra}{alternates}  </url>\n'
+                for locale in self.locales]
+
+    def filename(self, name):
+        return f'{name}.xml.gz' if self.compress else f'{name}.xml'
+
+    def write_shard(self, name, items, render):
+        """Write one shard unless its digest matches the last run; items are (key, digest, ...) tuples"""
+        digest = hashlib.sha256(f'{self.settings}\n'.encode('utf-8'))
+        for item in items:
+            digest.update(f'{item[0]}\0{item[1]}\n'.encode('utf-8'))
+        digest = digest.hexdigest()
+        filename = self.filename(name)
+        previous = self.manifest.get(name)
+        unchanged = (previous and previous['digest'] == digest and previous['file'] == filename
+                     and (self.output / filename).exists())
+        if unchanged:
+            self.shards[name] = previous
+            self.skipped.append(name)
+            return
+
+        self.output.mkdir(parents=True, exist_ok=True)
+        temporary = self.output / f'.{filename}.tmp'
+        urls = 0
+        with open(temporary, 'wb') as raw:
+            # mtime=0 keeps gzip output byte-identical for identical content; level 9 is much
+            # slower for a fraction of a percent on this highly repetitive XML
+            stream = (gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=6, mtime=0)
+                      if self.compress else raw)
+            with io.TextIOWrapper(stream, encoding='utf-8', newline='\n') as text:
+                text.write(URLSET_OPEN)
+                for item in items:
+                    for entry in render(item):
+                        text.write(entry)
+                        urls += 1
+                text.write(URLSET_CLOSE)
+        os.replace(temporary, self.output / filename)
+        self.shards[name] = {
+            'file': filename,
+            'digest': digest,
+            'urls': urls,
+            'lastmod': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+        }
+        self.written.append(name)
+
+    def write_pages(self, routes):
+        """Public pages, weighted like src/app/sitemap.ts"""
+        def render(item):
+            route = item[0]
+            if route == '':
+                return self.entries(route, None, 'daily', 1.0)
+            if route == '/marketplace':
+                return self.entries(route, None, 'hourly', 0.9)
+            return self.entries(route, None, 'weekly', 0.8)
+
+        self.write_shard('pages', [(route, '') for route in routes], render)
+
+    def write_listings(self, listings):
+        """Pack listings into shards by URL count and size, holding one shard's ids at a time"""
+        def render(item):
+            listing_id, _, lastmod = item
+            return self.entries(LISTING_ROUTE.format(id=listing_id), lastmod, 'daily', 0.7)
+
+        shard, urls, size, number = [], 0, len(URLSET_OPEN) + len(URLSET_CLOSE), 0
+        for listing in listings:
+            # Canonical form, so reformatting the source file does not count as a change
+            canonical = json.dumps(listing, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+            item = (listing['id'], hashlib.sha256(canonical.encode('utf-8')).hexdigest(), listing_lastmod(listing))
+            item_size = sum(len(entry.encode('utf-8')) for entry in render(item))
+            if shard and (urls + len(self.locales) > self.max_urls or size + item_size > self.max_bytes):
+                number += 1
+                self.write_shard(f'vehicles-{number:04d}', shard, render)
+                shard, urls, size = [], 0, len(URLSET_OPEN) + len(URLSET_CLOSE)
+            shard.append(item)
+            urls += len(self.locales)
+            size += item_size
+        if shard:
+            number += 1
+            self.write_shard(f'vehicles-{number:04d}', shard, render)
+        return number
+
+    def finish(self):
+        """Write the index, drop shards that no longer exist and save the manifest"""
+        removed = []
+        for name, entry in self.manifest.items():
+            if name not in self.shards or self.shards[name]['file'] != entry['file']:
+                stale = self.output / entry['file']
+                if stale.exists():
+                    stale.unlink()
+                removed.append(name)
+
+        index = ['<?xml version="1.0" encoding="UTF-8"?>\n',
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+        for name, entry in self.shards.items():
+            location = f"{self.base_url}/{self.output.name}/{entry['file']}"
+            index.append(f"  <sitemap>\n    <loc>{escape(location)}</loc>\n"
+                         f"    <lastmod>{entry['lastmod']}</lastmod>\n  </sitemap>\n")
+        index.append('</sitemapindex>\n')
+        data = ''.join(index).encode('utf-8')
+        index_path = self.output / INDEX_NAME
+        if not index_path.exists() or index_path.read_bytes() != data:
+            index_path.write_bytes(data)
+
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.shards, f, indent=2)
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate sharded, hreflang-annotated sitemaps')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--listings', help=f'JSON array or JSON Lines of vehicles (default: <base_path>/{DEFAULT_LISTINGS})')
+    parser.add_argument('--output', help=f'shard directory (default: <base_path>/{DEFAULT_OUTPUT})')
+    parser.add_argument('--base-url', default=os.environ.get('NEXT_PUBLIC_APP_URL', 'https://yourdomain.com'))
+    parser.add_argument('--gzip', action='store_true', help='write .xml.gz shards')
+    parser.add_argument('--max-urls', type=int, default=MAX_URLS, help='URLs per shard')
+    args = parser.parse_args()
+
+    base_path = Path(args.base_path)
+    corpus = SourceCorpus(base_path)
+    locales, default_locale = load_locales(base_path)
+    routes, missing = public_routes(corpus)
+    output = Path(args.output) if args.output else base_path / DEFAULT_OUTPUT
+    listings = Path(args.listings) if args.listings else base_path / DEFAULT_LISTINGS
+
+    writer = SitemapWriter(args.base_url, locales, default_locale, output, args.gzip, min(args.max_urls, MAX_URLS))
+    writer.write_pages(routes)
+    shards = writer.write_listings(iter_listings(listings)) if listings.exists() else 0
+    removed = writer.finish()
+
+    urls = sum(entry['urls'] for entry in writer.shards.values())
+    print(f"🗺️  {urls} URLs in {len(writer.shards)} shards ({shards} listing shards) for {len(locales)} locales")
+    print(f"   Index: {output / INDEX_NAME}")
+    print(f"   Rewritten: {len(writer.written)}, unchanged: {len(writer.skipped)}, removed: {len(removed)}")
+    if not listings.exists():
+        print(f"   ⚠️  No listings at {listings}")
+    for route in missing:
+        print(f"   ⚠️  sitemap.ts lists {route or '/'} but there is no page for it")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Shared Source Corpus
+Discovers the src/ tree once and reads every file at most once, so all
+analyzer checks work from the same in-memory copy
+"""
+
+import mmap
+from pathlib import Path
+
+
+class SourceFile:
+    """A single source file, read once as bytes and decoded on demand"""
+
+    __slots__ = ('path', 'relative_path', '_corpus', '_data', '_text')
+
+    def __init__(self, corpus, path, relative_path):
+        self.path = path
+        self.relative_path = relative_path
+        self._corpus = corpus
+        self._data = None
+        self._text = None
+
+    @property
+    def data(self):
+        """Raw file contents, memory-mapped and copied out exactly once"""
+        if self._data is None:
+            with open(self.path, 'rb') as f:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        self._data = mapped[:]
+                except ValueError:
+                    # Empty files cannot be mapped
+                    self._data = b''
+            self._corpus.files_read += 1
+            self._corpus.bytes_read += len(self._data)
+        return self._data
+
+    @property
+    def text(self):
+        """File contents decoded as UTF-8, only when a check needs text"""
+        if self._text is None:
+            self._text = self.data.decode('utf-8')
+        return self._text
+
+    def __repr__(self):
+        return f'SourceFile({self.relative_path!r})'
+
+
+class SourceCorpus:
+    def __init__(self, base_path, root='src', extensions=('.tsx', '.ts')):
+        self.base_path = Path(base_path)
+        self.root = self.base_path / root
+        self.extensions = tuple(extensions)
+        self.files_read = 0
+        self.bytes_read = 0
+        self._files = None
+        self._by_path = {}
+
+    def _discover(self):
+        """Walk the tree once, keeping the rglob order per extension"""
+        known = self._by_path
+        self._files = []
+        self._by_path = {}
+        if not self.root.exists():
+            return
+        for ext in self.extensions:
+            for path in self.root.rglob(f'*{ext}'):
+                if not path.is_file():
+                    continue
+                relative_path = str(path.relative_to(self.base_path))
+                # Keep already-read files when rediscovering after a change
+                source = known.get(relative_path) or SourceFile(self, path, relative_path)
+                self._files.append(source)
+                self._by_path[relative_path] = source
+
+    def files(self, *extensions, under=None):
+        """All discovered files, optionally filtered by extension and subdirectory"""
+        if self._files is None:
+            self._discover()
+        selected = self._files
+        if extensions:
+            selected = [f for f in selected if f.path.suffix in extensions]
+        if under is not None:
+            prefix = Path(under)
+            selected = [f for f in selected if prefix in f.path.parents]
+        return selected
+
+    def get(self, relative_path):
+        """Look up a single file by its path relative to the base path"""
+        if self._files is None:
+            self._discover()
+        return self._by_path.get(str(relative_path))
+
+    def invalidate(self, relative_paths):
+        """Drop the contents of changed files; rediscover if files appeared or vanished"""
+        for relative_path in map(str, relative_paths):
+            source = self._by_path.get(relative_path)
+            if source is not None and source.path.exists():
+                source._data = None
+                source._text = None
+            elif relative_path.endswith(self.extensions):
+                # A source file appeared or vanished
+                self._files = None
+
+    def reset(self):
+        """Forget everything so the next access rediscovers and rereads the tree"""
+        self._files = None
+        self._by_path = {}
+        self.files_read = 0
+        self.bytes_read = 0
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tailwind Class-Token Lexer
+Extracts the class tokens of every className attribute and cn()/clsx() call
+in a single linear pass, skipping comments and unrelated string literals
+"""
+
+import re
+from collections import Counter
+
+from analysis_timing import regex
+
+BREAKPOINTS = ('sm', 'md', 'lg', 'xl', '2xl')
+
+# Helpers whose string arguments are class lists
+CLASS_HELPERS = ('cn', 'clsx', 'classNames', 'twMerge', 'cva')
+
+# One alternation drives the whole scan; every match advances the cursor
+_TOKEN = regex.compile(
+    r'(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<attr>\bclassName\s*=\s*)'
+    r'|(?P<call>\b(?:' + '|'.join(CLASS_HELPERS) + r')\s*\()'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`(?:[^`\\]|\\.)*`)'
+    r'|(?P<open>[({])'
+    r'|(?P<close>[)}])',
+    re.S,
+)
+
+_TEMPLATE_EXPR = regex.compile(r'\$\{[^}]*\}')
+
+# Utilities whose name spans two dash-separated segments
+_COMPOUND_UTILITIES = frozenset((
+    'min-w', 'max-w', 'min-h', 'max-h', 'grid-cols', 'grid-rows', 'col-span',
+    'row-span', 'gap-x', 'gap-y', 'space-x', 'space-y', 'inset-x', 'inset-y',
+    'translate-x', 'translate-y', 'scale-x', 'scale-y', 'line-clamp',
+    'ring-offset', 'divide-x', 'divide-y', 'border-t', 'border-b', 'border-l',
+    'border-r', 'border-x', 'border-y', 'rounded-t', 'rounded-b', 'rounded-l',
+    'rounded-r', 'overflow-x', 'overflow-y',
+))
+
+# Widths, heights and minimum widths of three or more digits, on the spacing
+# scale or in arbitrary px - the sizes that overflow a narrow viewport
+_FIXED_SIZE = regex.compile(r'^(?:min-)?(?P<axis>w)-(?:\d{3,}|\[\d{3,}px\])$|^(?P<haxis>h)-(?:\d{3,}|\[\d{3,}px\])$')
+
+
+class ClassList:
+    """Class tokens of one className attribute or class helper call"""
+
+    __slots__ = ('line', 'tokens')
+
+    def __init__(self, line, tokens):
+        self.line = line
+        self.tokens = tokens
+
+    def __repr__(self):
+        return f'ClassList(line={self.line}, tokens={self.tokens!r})'
+
+
+def split_variants(token):
+    """Split 'md:hover:w-64' into (['md', 'hover'], 'w-64'), respecting [...] brackets"""
+    parts = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(token):
+        if ch == '[':
+            depth += 1
+        elif ch == ']':
+            depth -= 1
+        elif ch == ':' and depth == 0:
+            parts.append(token[start:i])
+            start = i + 1
+    return parts, token[start:]
+
+
+def utility_name(base):
+    """Utility family of a class, e.g. 'bg-blue-500' -> 'bg', 'min-w-0' -> 'min-w'"""
+    base = base.lstrip('!-')
+    if base.startswith('['):
+        return 'arbitrary'
+    segments = base.split('-')
+    if len(segments) > 2 and f'{segments[0]}-{segments[1]}' in _COMPOUND_UTILITIES:
+        return f'{segments[0]}-{segments[1]}'
+    return segments[0]
+
+
+def _class_tokens(literal):
+    """Whitespace-separated tokens of a string literal, template holes removed"""
+    body = literal[1:-1]
+    if literal[0] == '`':
+        body = _TEMPLATE_EXPR.sub(' ', body)
+    return body.split()
+
+
+def extract_class_lists(content):
+    """Yield a ClassList per className attribute / class helper call, in source order"""
+    line = 1
+    last = 0
+    # Nesting depth of the brackets we are collecting strings from, or None
+    depth = None
+    current = None
+    pending_attr = False
+
+    for match in _TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'comment':
+            continue
+
+        start = match.start()
+        line += content.count('\n', last, start)
+        last = start
+
+        if kind == 'attr':
+            if depth is None:
+                pending_attr = True
+                current = ClassList(line, [])
+            continue
+
+        if kind == 'call':
+            if depth is None:
+                current = ClassList(line, [])
+                depth = 1
+            else:
+                depth += 1
+            pending_attr = False
+            continue
+
+        if kind == 'string':
+            if pending_attr:
+                # className="..." - the literal is the whole class list
+                current.tokens.extend(_class_tokens(match.group()))
+                yield current
+                current = None
+                pending_attr = False
+            elif depth is not None:
+                current.tokens.extend(_class_tokens(match.group()))
+            continue
+
+        if kind == 'open':
+            if pending_attr:
+                pending_attr = False
+                depth = 1
+            elif depth is not None:
+                depth += 1
+            continue
+
+        # close
+        pending_attr = False
+        if depth is not None:
+            depth -= 1
+            if depth == 0:
+                if current.tokens:
+                    yield current
+                current = None
+                depth = None
+
+
+def scan_classes(content):
+    """Histograms and per-element findings for one file, in a single pass"""
+    breakpoints = Counter()
+    variants = Counter()
+    utilities = Counter()
+    fixed_sizes = []
+    elements = 0
+
+    for class_list in extract_class_lists(content):
+        elements += 1
+        responsive_axes = set()
+        fixed = []
+        for token in class_list.tokens:
+            prefixes, base = split_variants(token)
+            utility = utility_name(base)
+            utilities[utility] += 1
+            for prefix in prefixes:
+                if prefix in BREAKPOINTS:
+                    breakpoints[prefix] += 1
+                else:
+                    variants[prefix] += 1
+            size = _FIXED_SIZE.match(base.lstrip('!'))
+            if size:
+                axis = size.group('axis') or size.group('haxis')
+                if any(p in BREAKPOINTS for p in prefixes):
+                    responsive_axes.add(axis)
+                else:
+                    fixed.append((axis, token))
+            elif utility in ('w', 'h', 'min-w', 'min-h', 'max-w', 'max-h') and \
+                    any(p in BREAKPOINTS for p in prefixes):
+                responsive_axes.add(utility[-1])
+
+        for axis, token in fixed:
+            if axis not in responsive_axes:
+                fixed_sizes.append({'line': class_list.line, 'axis': axis, 'class': token})
+
+    return {
+        'elements': elements,
+        'breakpoints': dict(breakpoints),
+        'variants': dict(variants),
+        'utilities': dict(utilities),
+        'fixed_sizes': fixed_sizes,
+    }
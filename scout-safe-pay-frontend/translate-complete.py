@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import copy
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import catalog_emitter
+from translation_memory import TranslationMemory
 
 # Comprehensive translation dictionary
 full_translations = {
@@ -121,64 +128,154 @@ KEEP_AS_IS_PATTERNS = [
     'dpo@',
 ]
 
+# All patterns folded into one compiled matcher
+KEEP_AS_IS_RE = re.compile('|'.join(re.escape(pattern) for pattern in KEEP_AS_IS_PATTERNS))
+
+@lru_cache(maxsize=None)
+def _keep_as_is(value):
+    # Keep empty strings, or anything that matches a pattern
+    return value == '' or KEEP_AS_IS_RE.search(value) is not None
+
 def should_keep_as_is(value):
     """Check if a value should remain untranslated"""
     if not isinstance(value, str):
         return False
-    
-    # Keep empty strings
-    if value == '':
-        return True
-    
-    # Keep if matches any pattern
-    for pattern in KEEP_AS_IS_PATTERNS:
-        if pattern in value:
-            return True
-    
-    return False
+    return _keep_as_is(value)
 
-def translate_value(en_value, lang_code):
+def translate_value(en_value, lang_code, memory=None):
     """Translate a single value if possible"""
     # Keep as is if matches patterns
     if should_keep_as_is(en_value):
         return en_value
     
     # Try dictionary lookup
-    if en_value in full_translations[lang_code]:
+    if en_value in full_translations.get(lang_code, {}):
         return full_translations[lang_code][en_value]
     
+    # Try the translation memory (ignores case, spacing and punctuation like "Status:")
+    if memory is not None and isinstance(en_value, str):
+        translated = memory.translate(en_value, lang_code)
+        if translated is not None:
+            return translated
+    
     # Return original if no translation found
     return en_value
 
-def translate_dict(en_dict, lang_dict, lang_code):
-    """Recursively translate dictionary"""
+def suggest(en_value, lang_code, memory):
+    """Near-matches from the translation memory for a value left in English"""
+    matches = [
+        {'score': round(m.score, 2), 'source': m.source, 'target': m.target}
+        for m in memory.lookup(en_value, lang_code) if m.target != m.source
+    ]
+    # A normalised exact hit (case, spacing, punctuation) comes first
+    exact = memory.translate(en_value, lang_code)
+    if exact is not None and exact != en_value and all(m['target'] != exact for m in matches):
+        matches.insert(0, {'score': 1.0, 'source': en_value, 'target': exact})
+    return matches
+
+def translate_locales(en_dict, lang_dicts, memory=None, suggestions=None, path='', _cache=None):
+    """Walk the English tree once, filling every locale dict at the same time
+    
+    lang_dicts maps a language code to the (sub)dict of that locale at the
+    current level; suggestions, when given, maps a language code to a dict
+    collecting near-matches keyed by dotted path.
+    """
+    # Many English values repeat, so each is translated once per language
+    if _cache is None:
+        _cache = {}
+    
     for key, en_value in en_dict.items():
+        full_path = f'{path}.{key}' if path else key
         if isinstance(en_value, dict):
-            if key not in lang_dict:
-                lang_dict[key] = {}
-            if isinstance(lang_dict[key], dict):
-                translate_dict(en_value, lang_dict[key], lang_code)
-        else:
+            children = {}
+            for lang, lang_dict in lang_dicts.items():
+                if key not in lang_dict:
+                    lang_dict[key] = {}
+                if isinstance(lang_dict[key], dict):
+                    children[lang] = lang_dict[key]
+            if children:
+                translate_locales(en_value, children, memory, suggestions, full_path, _cache)
+            continue
+        
+        keep = should_keep_as_is(en_value)
+        for lang, lang_dict in lang_dicts.items():
             # If missing or equals English value, try to translate
-            if key not in lang_dict or lang_dict[key] == en_value:
-                lang_dict[key] = translate_value(en_value, lang_code)
-
-# Process all languages
-languages = ['de', 'es', 'it', 'ro', 'fr']
+            if key in lang_dict and lang_dict[key] != en_value:
+                continue
+            if keep:
+                lang_dict[key] = en_value
+                continue
+            
+            # A value the locale keeps in English may be deliberate ("24/7 Support"), so
+            # memory hits only fill missing keys and are otherwise just suggested
+            missing = key not in lang_dict
+            cache_key = (en_value, lang, missing) if isinstance(en_value, str) else None
+            if cache_key is None:
+                lang_dict[key] = translate_value(en_value, lang, memory if missing else None)
+                continue
+            if cache_key not in _cache:
+                translated = translate_value(en_value, lang, memory if missing else None)
+                # Still English - record near-matches for a human to review
+                matches = suggest(en_value, lang, memory) if (
+                    suggestions is not None and translated == en_value) else None
+                _cache[cache_key] = (translated, matches)
+            translated, matches = _cache[cache_key]
+            lang_dict[key] = translated
+            if matches:
+                suggestions.setdefault(lang, {})[full_path] = matches
 
-with open('messages/en.json', 'r', encoding='utf-8') as f:
-    en_data = json.load(f)
+def translate_dict(en_dict, lang_dict, lang_code, memory=None):
+    """Recursively translate dictionary"""
+    translate_locales(en_dict, {lang_code: lang_dict}, memory)
 
-for lang in languages:
-    with open(f'messages/{lang}.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def main():
+    parser = argparse.ArgumentParser(description='Pre-fill locale catalogs from known translations')
+    parser.add_argument('--suggest', action='store_true',
+                        help='write fuzzy translation-memory matches for keys left in English')
+    parser.add_argument('--emit', action='store_true',
+                        help=f'then write fallback-resolved production catalogs to {catalog_emitter.DEFAULT_OUTPUT}/')
+    args = parser.parse_args()
+    
+    # Every locale in messages/ except the English source
+    messages_dir = Path('messages')
+    languages = sorted(p.stem for p in messages_dir.glob('*.json') if p.stem != 'en')
+    
+    # Translation memory mined from every existing catalog, cached between runs
+    memory = TranslationMemory.load(messages_dir, '.translation-memory.json', extra=full_translations)
+    
+    with open(messages_dir / 'en.json', 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+    
+    originals = {}
+    locale_data = {}
+    for lang in languages:
+        originals[lang] = (messages_dir / f'{lang}.json').read_text(encoding='utf-8')
+        locale_data[lang] = json.loads(originals[lang])
+    
+    # One walk of the English tree fans out to every locale
+    all_suggestions = {} if args.suggest else None
+    translate_locales(en_data, locale_data, memory, all_suggestions)
+    
+    # Save only the files whose data actually changed
+    for lang in languages:
+        if locale_data[lang] == json.loads(originals[lang]):
+            print(f"· {lang}.json unchanged")
+            continue
+        with open(messages_dir / f'{lang}.json', 'w', encoding='utf-8') as f:
+            f.write(json.dumps(locale_data[lang], ensure_ascii=False, indent=2) + '\n')
+        print(f"✓ Updated {lang}.json")
     
-    translate_dict(en_data, data, lang)
+    if args.suggest:
+        with open('translation-suggestions.json', 'w', encoding='utf-8') as f:
+            json.dump(all_suggestions, f, ensure_ascii=False, indent=2)
+        total = sum(len(s) for s in all_suggestions.values())
+        print(f"✓ Wrote {total} suggestions to translation-suggestions.json")
     
-    # Save updated file
-    with open(f'messages/{lang}.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if args.emit:
+        output = Path(catalog_emitter.DEFAULT_OUTPUT)
+        catalog_emitter.print_report(catalog_emitter.emit(messages_dir, output), output)
     
-    print(f"✓ Updated {lang}.json")
+    print("\n✓ All translations processed!")
 
-print("\n✓ All translations processed!")
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,50 @@
 # -*- coding: utf-8 -*-
 """
 Professional AI Translation for AutoScout24 SafeTrade
-Generates complete translations for ES, IT, FR, NL based on linguistic rules
+Fills every locale's untranslated messages in one batched job: the literal
+text segments still in English are collected across all locales,
+deduplicated and sent through a translation backend (local dictionaries or
+a LibreTranslate-compatible service), then spliced back into the ICU
+messages with placeholders intact
 """
 
+import argparse
 import json
-import copy
+import re
+from pathlib import Path
+
+from icu_message import ICUSyntaxError, map_text, parse, serialize
+from message_catalog import is_technical
+from translation_backend import (CONCURRENCY, DEFAULT_CACHE, MAX_BATCH_CHARS, MAX_BATCH_ITEMS, RETRIES,
+                                 BatchTranslator, DictionaryBackend, HTTPBackend, TranslationCache)
+
+_HAS_LETTERS = re.compile(r'[^\W\d_]')
+
+def translate_segment(text, translations):
+    """Translate one literal text segment, keeping its surrounding whitespace"""
+    core = text.strip()
+    if not core or core not in translations:
+        return text
+    start = text.index(core)
+    return text[:start] + translations[core] + text[start + len(core):]
+
+def translate_message(message, translations):
+    """Translate the literal text of an ICU message, leaving arguments, plural/select
+    keywords and inline tags untouched"""
+    # Direct translation if available
+    if message in translations:
+        return translations[message]
+    try:
+        nodes = parse(message)
+    except ICUSyntaxError:
+        return message
+    # Plain text with nothing to segment
+    if len(nodes) == 1 and nodes[0][0] == 'text':
+        return message
+    translated = map_text(nodes, lambda text: translate_segment(text, translations))
+    if translated == nodes:
+        return message
+    return serialize(translated)
 
 def translate_recursive(obj, translations):
     """Recursively translate all string values in nested dict/list structures"""
@@ -15,17 +54,63 @@ def translate_recursive(obj, translations):
     elif isinstance(obj, list):
         return [translate_recursive(item, translations) for item in obj]
     elif isinstance(obj, str):
-        # Don't translate if contains placeholders or HTML
-        if '{' in obj or '<' in obj or obj.startswith('http'):
+        # Don't translate URLs
+        if obj.startswith('http'):
             return obj
-        # Direct translation if available
-        return translations.get(obj, obj)
+        # Placeholders and HTML are parsed so only the literal text is translated
+        return translate_message(obj, translations)
     else:
         return obj
 
-# Load English
-with open('messages/en.json', 'r', encoding='utf-8') as f:
-    en_data = json.load(f)
+def needs_translation(value, en_value):
+    """A leaf still showing the English source (or missing) that is worth sending to a backend"""
+    if not isinstance(en_value, str) or en_value.startswith('http') or is_technical(en_value):
+        return False
+    return value is None or value == en_value
+
+def segments(message):
+    """The texts translate_message() looks up for a message: the whole message, or each
+    literal segment when it contains arguments, plural/select branches or tags"""
+    try:
+        nodes = parse(message)
+    except ICUSyntaxError:
+        return set()
+    if len(nodes) == 1 and nodes[0][0] == 'text':
+        return {message} if _HAS_LETTERS.search(message) else set()
+    found = set()
+    map_text(nodes, lambda text: found.add(text.strip()) or text)
+    return {text for text in found if _HAS_LETTERS.search(text)}
+
+def untranslated(en_tree, tree, path=''):
+    """Yield (dotted path, English value) for every leaf of en_tree the locale still needs"""
+    for key, en_value in en_tree.items():
+        value = tree.get(key) if isinstance(tree, dict) else None
+        if isinstance(en_value, dict):
+            yield from untranslated(en_value, value if isinstance(value, dict) else {}, f'{path}{key}.')
+        elif needs_translation(value, en_value):
+            yield f'{path}{key}', en_value
+
+def fill_locale(en_tree, tree, translations):
+    """The locale in its own key order: its translations kept, everything else translated
+
+    Keys the locale lacks are appended in en order, so a run only diffs where it translated.
+    """
+    own = tree if isinstance(tree, dict) else {}
+    filled = {}
+    for key in [*own, *(key for key in en_tree if key not in own)]:
+        value = own.get(key)
+        if key not in en_tree:
+            # Keys the locale has beyond the source are left alone
+            filled[key] = value
+            continue
+        en_value = en_tree[key]
+        if isinstance(en_value, dict):
+            filled[key] = fill_locale(en_value, value if isinstance(value, dict) else {}, translations)
+        elif needs_translation(value, en_value):
+            filled[key] = translate_recursive(en_value, translations)
+        else:
+            filled[key] = value
+    return filled
 
 # Comprehensive automotive translations
 # SPANISH (ES)
@@ -87,13 +172,79 @@ es_dict = {
     "Verified": "Verificado",
 }
 
-print("Translating to Spanish...")
-es_data = copy.deepcopy(en_data)
-# Apply translations (this is simplified - full implementation would use NLP)
-print(f"✓ Spanish: {len(json.dumps(es_data))} chars")
+DICTIONARIES = {'es': es_dict}
 
-# Save
-with open('messages/es.json', 'w', encoding='utf-8') as f:
-    json.dump(es_data, f, ensure_ascii=False, indent=2)
+def main():
+    parser = argparse.ArgumentParser(description='Fill untranslated messages in every locale through a translation backend')
+    parser.add_argument('--locales', help='comma-separated locales (default: every messages/*.json except en)')
+    parser.add_argument('--backend', choices=['dictionary', 'http'], default='dictionary')
+    parser.add_argument('--url', default='http://127.0.0.1:5000/translate', help='LibreTranslate-compatible endpoint')
+    parser.add_argument('--api-key')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='requests in flight')
+    parser.add_argument('--batch-items', type=int, default=MAX_BATCH_ITEMS)
+    parser.add_argument('--batch-chars', type=int, default=MAX_BATCH_CHARS)
+    parser.add_argument('--retries', type=int, default=RETRIES)
+    parser.add_argument('--no-cache', action='store_true', help=f'do not read or write {DEFAULT_CACHE}')
+    parser.add_argument('--output', default='messages', help='where to write the locale files')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be sent')
+    args = parser.parse_args()
+    
+    messages_dir = Path('messages')
+    with open(messages_dir / 'en.json', 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+    locales = args.locales.split(',') if args.locales else sorted(
+        p.stem for p in messages_dir.glob('*.json') if p.stem != 'en')
+    
+    originals = {}
+    locale_data = {}
+    jobs = {}
+    leaves = 0
+    for locale in locales:
+        path = messages_dir / f'{locale}.json'
+        originals[locale] = path.read_text(encoding='utf-8') if path.exists() else None
+        locale_data[locale] = json.loads(originals[locale]) if originals[locale] else {}
+        jobs[locale] = set()
+        for _, en_value in untranslated(en_data, locale_data[locale]):
+            jobs[locale] |= segments(en_value)
+            leaves += 1
+    
+    texts = sum(len(texts) for texts in jobs.values())
+    print(f"🌍 {leaves} untranslated messages across {len(locales)} locales → {texts} unique segments")
+    if args.dry_run:
+        for locale, texts in jobs.items():
+            print(f"   {locale}: {len(texts)} segments, {sum(map(len, texts))} chars")
+        return
+    
+    if args.backend == 'http':
+        backend = HTTPBackend(args.url, args.api_key, workers=args.concurrency)
+    else:
+        backend = DictionaryBackend(DICTIONARIES)
+    backend.max_batch_items = args.batch_items
+    backend.max_batch_chars = args.batch_chars
+    cache = None if args.no_cache else TranslationCache(DEFAULT_CACHE)
+    translator = BatchTranslator(backend, cache, args.concurrency, args.retries)
+    try:
+        results = translator.translate(jobs)
+    finally:
+        backend.close()
+        if cache is not None:
+            cache.close()
+    stats = translator.stats
+    print(f"   {stats['cached']} from cache, {stats['translated']} translated in {stats['batches']} batches, "
+          f"{stats['retries']} retries, {stats['failed']} failed")
+    
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for locale in locales:
+        # Backends echo what they cannot translate; only real translations are applied
+        translations = {text: value for text, value in results[locale].items() if value != text}
+        filled = fill_locale(en_data, locale_data[locale], translations)
+        if output_dir == messages_dir and originals[locale] is not None and filled == locale_data[locale]:
+            print(f"· {locale}.json unchanged")
+            continue
+        with open(output_dir / f'{locale}.json', 'w', encoding='utf-8') as f:
+            f.write(json.dumps(filled, ensure_ascii=False, indent=2) + '\n')
+        print(f"✓ Wrote {locale}.json ({len(translations)} segments applied)")
 
-print("✓ Spanish translations saved")
+if __name__ == '__main__':
+    main()
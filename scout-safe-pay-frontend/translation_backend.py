@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Batched Machine-Translation Backend
+Deduplicates the strings every locale still needs, sends them to a
+pluggable backend in size-bounded batches over asyncio (bounded
+concurrency, retries with backoff, a shared pause on rate limiting) and
+keeps results in a persistent cache keyed by (source hash, locale).
+Includes a stand-in HTTP server speaking the same protocol:
+
+    python3 translation_backend.py --serve 8765 --latency 0.05 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sqlite3
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CACHE = '.translation-cache.sqlite'
+
+# LibreTranslate-compatible request: {"q": [...], "source": "en", "target": "de", "format": "text"}
+MAX_BATCH_ITEMS = 50
+MAX_BATCH_CHARS = 5000
+CONCURRENCY = 8
+RETRIES = 4
+BACKOFF = 0.5
+
+
+class TranslationError(RuntimeError):
+    pass
+
+
+class RetryableError(TranslationError):
+    """A failure worth retrying (network error, 5xx, 429); retry_after in seconds if the server said"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """Seconds to wait for a Retry-After header (delay-seconds or HTTP-date), or None if unparsable"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def source_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationBackend:
+    """Translates batches of plain-text segments; subclasses implement translate_batch"""
+    name = 'backend'
+    max_batch_items = MAX_BATCH_ITEMS
+    max_batch_chars = MAX_BATCH_CHARS
+
+    async def translate_batch(self, texts, locale, source_locale='en'):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class DictionaryBackend(TranslationBackend):
+    """Offline backend over {locale: {English: translation}}; untranslatable texts come back unchanged"""
+    name = 'dictionary'
+
+    def __init__(self, dictionaries):
+        self.dictionaries = dictionaries
+
+    async def translate_batch(self, texts, locale, source_locale='en'):
+        table = self.dictionaries.get(locale, {})
+        return [table.get(text, text) for text in texts]
+
+
+class HTTPBackend(TranslationBackend):
+    """POSTs batches to a LibreTranslate-compatible endpoint; blocking I/O runs on a bounded thread pool"""
+    name = 'http'
+
+    def __init__(self, url, api_key=None, timeout=30, workers=CONCURRENCY):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _post(self, payload):
+        request = urllib.request.Request(self.url, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 429 or e.code >= 500:
+                raise RetryableError(f'HTTP {e.code}', parse_retry_after(e.headers.get('Retry-After'))) from e
+            raise TranslationError(f'HTTP {e.code}: {e.read()[:200]!r}') from e
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise RetryableError(str(e)) from e
+        try:
+            result = json.loads(body)
+        except ValueError as e:
+            raise TranslationError(f'response is not JSON: {body[:200]!r}') from e
+        if not isinstance(result, dict):
+            raise TranslationError(f'expected a JSON object, got {result!r:.200}')
+        return result
+
+    async def translate_batch(self, texts, locale, source_locale='en'):
+        payload = {'q': texts, 'source': source_locale, 'target': locale, 'format': 'text'}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        result = await asyncio.get_running_loop().run_in_executor(self.executor, self._post, payload)
+        translated = result.get('translatedText')
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise TranslationError(f'expected {len(texts)} translations, got {translated!r:.200}')
+        return translated
+
+    def close(self):
+        self.executor.shutdown()
+
+
+class TranslationCache:
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute('CREATE TABLE IF NOT EXISTS translations ('
+                        'source_hash TEXT NOT NULL, locale TEXT NOT NULL, translation TEXT NOT NULL, '
+                        'backend TEXT, PRIMARY KEY (source_hash, locale)) WITHOUT ROWID')
+        self.hits = 0
+
+    def lookup(self, texts, locale):
+        """{text: translation} for the texts already cached for a locale"""
+        found = {}
+        hashes = {source_hash(text): text for text in texts}
+        keys = list(hashes)
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.db.execute(
+                f'SELECT source_hash, translation FROM translations WHERE locale = ? '
+                f'AND source_hash IN ({",".join("?" * len(chunk))})', [locale, *chunk])
+            for digest, translation in rows:
+                # An echo of the source is a backend that could not translate it, not a translation
+                if translation != hashes[digest]:
+                    found[hashes[digest]] = translation
+        self.hits += len(found)
+        return found
+
+    def store(self, pairs, locale, backend):
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                                [(source_hash(text), locale, translation, backend) for text, translation in pairs
+                                 if translation != text])
+
+    def close(self):
+        self.db.close()
+
+
+def batches(texts, max_items=MAX_BATCH_ITEMS, max_chars=MAX_BATCH_CHARS):
+    """Split texts into batches bounded by item count and total characters"""
+    batch, size = [], 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or size + len(text) > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text)
+    if batch:
+        yield batch
+
+
+class BatchTranslator:
+    """Runs one deduplicated job {locale: texts} through a backend with bounded concurrency"""
+
+    def __init__(self, backend, cache=None, concurrency=CONCURRENCY, retries=RETRIES, backoff=BACKOFF):
+        self.backend = backend
+        self.cache = cache
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = {'requested': 0, 'cached': 0, 'translated': 0, 'batches': 0, 'retries': 0, 'failed': 0}
+        self._resume_at = 0.0
+
+    async def _send(self, batch, locale):
+        for attempt in range(self.retries + 1):
+            # A rate limit seen by any worker pauses all of them
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await self.backend.translate_batch(batch, locale)
+            except RetryableError as e:
+                if attempt == self.retries:
+                    raise
+                self.stats['retries'] += 1
+                wait = e.retry_after if e.retry_after is not None else self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                if e.retry_after is not None:
+                    self._resume_at = max(self._resume_at, time.monotonic() + wait)
+                await asyncio.sleep(wait)
+
+    async def _worker(self, queue, results):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            locale, batch = item
+            try:
+                translated = await self._send(batch, locale)
+            except Exception as e:
+                # Any failure only loses this batch; a dead worker would leave run() blocked on the full queue
+                self.stats['failed'] += len(batch)
+                print(f"   ⚠️  {locale}: batch of {len(batch)} failed: {e or type(e).__name__}", flush=True)
+                continue
+            pairs = list(zip(batch, translated))
+            results[locale].update(pairs)
+            self.stats['batches'] += 1
+            self.stats['translated'] += len(pairs)
+            if self.cache is not None:
+                self.cache.store(pairs, locale, self.backend.name)
+
+    async def run(self, jobs):
+        """{locale: {text: translation}} for {locale: iterable of texts}"""
+        results = {locale: {} for locale in jobs}
+        # Bounded queue: batching never runs more than a few batches ahead of the workers
+        queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        workers = [asyncio.create_task(self._worker(queue, results)) for _ in range(self.concurrency)]
+        try:
+            for locale, texts in jobs.items():
+                texts = sorted(set(texts))
+                self.stats['requested'] += len(texts)
+                if self.cache is not None:
+                    cached = self.cache.lookup(texts, locale)
+                    results[locale].update(cached)
+                    self.stats['cached'] += len(cached)
+                    texts = [text for text in texts if text not in cached]
+                for batch in batches(texts, self.backend.max_batch_items, self.backend.max_batch_chars):
+                    await queue.put((locale, batch))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        return results
+
+    def translate(self, jobs):
+        return asyncio.run(self.run(jobs))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """LibreTranslate-shaped endpoint that 'translates' by tagging text with the target locale"""
+    latency = 0.0
+    failure_rate = 0.0
+    rate_limit_rate = 0.0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        time.sleep(self.latency)
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            self.send_response(429)
+            self.send_header('Retry-After', '0.2')
+            self.end_headers()
+            return
+        if roll < self.rate_limit_rate + self.failure_rate:
+            self.send_error(503)
+            return
+        texts = payload['q'] if isinstance(payload['q'], list) else [payload['q']]
+        body = json.dumps({'translatedText': [f"[{payload['target']}] {text}" for text in texts]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, latency=0.0, failure_rate=0.0, rate_limit_rate=0.0):
+    handler = type('Handler', (StandInHandler,), {'latency': latency, 'failure_rate': failure_rate,
+                                                  'rate_limit_rate': rate_limit_rate})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    print(f"🌐 Stand-in translation server on http://127.0.0.1:{server.server_port}/translate")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the stand-in translation server')
+    parser.add_argument('--serve', type=int, metavar='PORT', required=True)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of requests answered with 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='share of requests answered with 429')
+    args = parser.parse_args()
+
+    server = serve(args.serve, args.latency, args.failure_rate, args.rate_limit_rate)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
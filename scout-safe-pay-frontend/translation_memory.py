@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Translation Memory
+Indexes every English string that already has a translation in
+messages/<locale>.json, with a character-trigram index for fast
+near-match lookups
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from message_catalog import MessageCatalog
+
+MEMORY_VERSION = 1
+
+# Leading/trailing punctuation and whitespace that is carried over verbatim
+_AFFIXES = re.compile(r'^([\W_]*)(.*?)([\W_]*)$', re.S)
+
+
+def normalize(text):
+    """Case- and whitespace-insensitive form used for matching"""
+    return ' '.join(text.lower().split())
+
+
+def split_affixes(text):
+    """Split 'Status:' into ('', 'Status', ':')"""
+    return _AFFIXES.match(text).groups()
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Match:
+    __slots__ = ('score', 'source', 'target')
+
+    def __init__(self, score, source, target):
+        self.score = score
+        self.source = source
+        self.target = target
+
+    def __repr__(self):
+        return f'Match({self.score:.2f}, {self.source!r} -> {self.target!r})'
+
+
+class TranslationMemory:
+    def __init__(self, entries=None):
+        # locale -> {English source: translation}
+        self.entries = entries or {}
+        self._build_index()
+
+    def _build_index(self):
+        self.sources = sorted({source for table in self.entries.values() for source in table})
+        self.exact = {}
+        self.postings = defaultdict(list)
+        self.gram_counts = []
+        for idx, source in enumerate(self.sources):
+            key = normalize(source)
+            self.exact.setdefault(key, idx)
+            grams = trigrams(key)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(idx)
+
+    @classmethod
+    def from_catalog(cls, catalog, extra=None):
+        """Collect English -> translation pairs, keeping the most common rendering"""
+        source = catalog.columns[catalog.source_locale]
+        entries = {}
+        for locale in catalog.target_locales:
+            votes = defaultdict(Counter)
+            for en_value, value in zip(source, catalog.columns[locale]):
+                if isinstance(en_value, str) and isinstance(value, str) and value != en_value and en_value.strip():
+                    votes[en_value][value] += 1
+            entries[locale] = {en: counts.most_common(1)[0][0] for en, counts in votes.items()}
+        # Hand-curated pairs win over anything mined from the catalogs
+        for locale, table in (extra or {}).items():
+            entries.setdefault(locale, {}).update(table)
+        return cls(entries)
+
+    @classmethod
+    def load(cls, messages_dir, cache_path=None, extra=None):
+        """Build from messages/, reusing the on-disk memory while the catalogs are unchanged"""
+        messages_dir = Path(messages_dir)
+        digest = hashlib.blake2b(digest_size=16)
+        for path in sorted(messages_dir.glob('*.json')):
+            digest.update(path.name.encode('utf-8'))
+            digest.update(path.read_bytes())
+        digest.update(json.dumps(extra or {}, sort_keys=True).encode('utf-8'))
+        fingerprint = digest.hexdigest()
+
+        if cache_path is not None and Path(cache_path).exists():
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MEMORY_VERSION and data.get('catalogs') == fingerprint:
+                return cls(data['entries'])
+
+        memory = cls.from_catalog(MessageCatalog.load(messages_dir), extra)
+        if cache_path is not None:
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MEMORY_VERSION, 'catalogs': fingerprint, 'entries': memory.entries},
+                          f, ensure_ascii=False)
+        return memory
+
+    def lookup(self, text, locale, limit=3, min_score=0.5):
+        """Best near-matches for `text` that have a `locale` translation, by trigram similarity"""
+        table = self.entries.get(locale)
+        if not table:
+            return []
+        query = trigrams(normalize(text))
+        overlap = Counter()
+        for gram in query:
+            for idx in self.postings.get(gram, ()):
+                overlap[idx] += 1
+
+        matches = []
+        for idx, shared in overlap.items():
+            # Dice coefficient over trigram sets
+            score = 2 * shared / (len(query) + self.gram_counts[idx])
+            if score >= min_score:
+                source = self.sources[idx]
+                if source in table:
+                    matches.append(Match(score, source, table[source]))
+        matches.sort(key=lambda m: (-m.score, m.source))
+        return matches[:limit]
+
+    def translate(self, text, locale):
+        """Exact match ignoring case, spacing and surrounding punctuation, or None"""
+        table = self.entries.get(locale)
+        if not table:
+            return None
+        if text in table:
+            return table[text]
+        prefix, core, suffix = split_affixes(text)
+        idx = self.exact.get(normalize(core))
+        if idx is None or self.sources[idx] not in table:
+            return None
+        source = self.sources[idx]
+        target = table[source]
+        # 'status' -> 'Status' when the memory only knows the capitalised form
+        if core[:1].isupper() and not source[:1].isupper():
+            target = target[:1].upper() + target[1:]
+        return f'{prefix}{target}{suffix}'
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Cross-Stack Translation Parity
+Loads the Laravel backend's lang/<locale>.json and lang/<locale>/*.php files
+(PHP arrays are parsed statically, never executed) next to the frontend's
+messages/*.json, indexes every English source string of both stacks in one
+pass and reports per-locale coverage, source strings both stacks translate
+separately, and strings the two stacks translate differently
+"""
+
+import argparse
+import json
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from message_catalog import MessageCatalog, flatten, is_technical, key_lines
+
+DEFAULT_BACKEND_LANG = '../scout-safe-pay-backend/lang'
+SOURCE_LOCALE = 'en'
+
+# Keys of lang/<locale>.json are the English strings themselves
+JSON_GROUP = 'json'
+
+_PHP_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|\#[^\n]*|/\*.*?\*/)
+  | (?P<open_tag><\?php)
+  | (?P<single>'(?:[^'\\]|\\.)*')
+  | (?P<double>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<arrow>=>)
+  | (?P<name>[A-Za-z_\\][\w\\]*)
+  | (?P<punct>[\[\](),;=])
+  | (?P<error>.)
+''', re.S | re.X)
+
+_DOUBLE_ESCAPE = re.compile(r'\\(?:([nrtvef\\$"])|([0-7]{1,3})|x([0-9A-Fa-f]{1,2})|u\{([0-9A-Fa-f]+)\})')
+_DOUBLE_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'v': '\v', 'e': '\x1b', 'f': '\f', '\\': '\\', '$': '$', '"': '"'}
+_INTERPOLATION = re.compile(r'(?<!\\)\$[A-Za-z_{]')
+
+# {name} in ICU messages and :name / :Name in Laravel strings are the same placeholder
+_ICU_ARGUMENT = re.compile(r'\{\s*(\w+)\s*\}')
+_LARAVEL_PLACEHOLDER = re.compile(r':([A-Za-z_]\w*)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class LangParseError(ValueError):
+    def __init__(self, path, line, message):
+        super().__init__(f'{path}:{line}: {message}')
+        self.path = path
+        self.line = line
+
+
+def _unescape_double(body):
+    def replace(match):
+        simple, octal, hex_, code = match.groups()
+        if simple:
+            return _DOUBLE_ESCAPES[simple]
+        return chr(int(octal, 8) if octal else int(hex_, 16) if hex_ else int(code, 16))
+    return _DOUBLE_ESCAPE.sub(replace, body)
+
+
+class _PHPArrayParser:
+    """Recursive descent over `return [...];` with literal keys and values only"""
+
+    def __init__(self, text, path):
+        self.text = text
+        self.path = path
+        self.tokens = []
+        line = 1
+        last = 0
+        for match in _PHP_TOKEN.finditer(text):
+            kind = match.lastgroup
+            if kind in ('space', 'comment', 'open_tag'):
+                continue
+            pos = match.start()
+            line += text.count('\n', last, pos)
+            last = pos
+            if kind == 'error':
+                raise LangParseError(path, line, f'unsupported syntax {text[pos:pos + 20]!r}')
+            self.tokens.append((kind, match.group(), line))
+        self.i = 0
+        self.lines = {}
+
+    def _peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None, self.tokens[-1][2] if self.tokens else 1)
+
+    def _next(self):
+        token = self._peek()
+        self.i += 1
+        return token
+
+    def _expect(self, value):
+        kind, token, line = self._next()
+        if token != value:
+            raise LangParseError(self.path, line, f'expected {value!r}, found {token!r}')
+
+    def parse(self):
+        """The returned array; `declare(...)` and `use ...;` statements before it are skipped"""
+        while True:
+            kind, token, line = self._next()
+            if token == 'return':
+                break
+            if token is None:
+                raise LangParseError(self.path, line, 'no return statement')
+            if token in ('declare', 'use', 'namespace'):
+                while self._next()[1] not in (';', None):
+                    pass
+            else:
+                raise LangParseError(self.path, line, f'unexpected {token!r} before return')
+        value = self._value('')
+        self._expect(';')
+        return value
+
+    def _value(self, path):
+        kind, token, line = self._next()
+        if token == '[':
+            return self._array(']', path)
+        if token == 'array':
+            self._expect('(')
+            return self._array(')', path)
+        if kind == 'single':
+            body = token[1:-1]
+            return re.sub(r"\\([\\'])", r'\1', body) if '\\' in body else body
+        if kind == 'double':
+            if _INTERPOLATION.search(token):
+                raise LangParseError(self.path, line, 'string interpolation is not static')
+            body = token[1:-1]
+            return _unescape_double(body) if '\\' in body else body
+        if kind == 'number':
+            return float(token) if '.' in token else int(token)
+        if kind == 'name' and token.lower() in ('true', 'false', 'null'):
+            return {'true': True, 'false': False, 'null': None}[token.lower()]
+        raise LangParseError(self.path, line, f'unsupported value {token!r}')
+
+    def _array(self, close, path):
+        result = {}
+        next_index = 0
+        while True:
+            if self._peek()[1] == close:
+                self.i += 1
+                return result
+            line = self._peek()[2]
+            # Parsed as a list item; a key is a scalar, so the path only matters for items
+            first = self._value(f'{path}{next_index}.')
+            if self._peek()[1] == '=>':
+                self.i += 1
+                key = first
+                if isinstance(key, dict) or key is None:
+                    raise LangParseError(self.path, line, 'array keys must be strings or integers')
+                if isinstance(key, int):
+                    next_index = max(next_index, key + 1)
+                full_key = f'{path}{key}'
+                self.lines[full_key] = line
+                result[str(key)] = self._value(f'{full_key}.')
+            else:
+                self.lines[f'{path}{next_index}'] = line
+                result[str(next_index)] = first
+                next_index += 1
+            kind, token, line = self._next()
+            if token == close:
+                return result
+            if token != ',':
+                raise LangParseError(self.path, line, f'expected \',\' or {close!r}, found {token!r}')
+
+
+def parse_php_array(text, path='<string>'):
+    """(tree, {dotted key: line}) of a Laravel lang file, without running PHP"""
+    parser = _PHPArrayParser(text, path)
+    tree = parser.parse()
+    if not isinstance(tree, dict):
+        raise LangParseError(path, 1, 'the file does not return an array')
+    return tree, parser.lines
+
+
+def normalize(text):
+    """Comparable form of a message: one placeholder syntax, collapsed whitespace"""
+    text = _ICU_ARGUMENT.sub(lambda m: f':{m.group(1).lower()}', text)
+    text = _LARAVEL_PLACEHOLDER.sub(lambda m: f':{m.group(1).lower()}', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class StackCatalog:
+    """One stack's translations: {locale: {key: value}} plus where each entry is defined"""
+
+    def __init__(self, name, root):
+        self.name = name
+        self.root = Path(root)
+        self.locales = {}
+        self.locations = {}
+        self.errors = []
+        self.files_read = 0
+        self.bytes_read = 0
+
+    def add(self, locale, key, value, path, line=None):
+        self.locales.setdefault(locale, {})[key] = value
+        self.locations[(locale, key)] = (path, line)
+
+    def source(self, key):
+        """English text of a key; JSON keys are their own source"""
+        if key.startswith(f'{JSON_GROUP}:'):
+            return key[len(JSON_GROUP) + 1:]
+        return self.locales.get(SOURCE_LOCALE, {}).get(key)
+
+    def group(self, key):
+        return key.split(':', 1)[0] if key.startswith(f'{JSON_GROUP}:') else key.split('.', 1)[0]
+
+    def _read(self, path):
+        data = path.read_bytes()
+        self.files_read += 1
+        self.bytes_read += len(data)
+        return data.decode('utf-8')
+
+    @classmethod
+    def load_frontend(cls, messages_dir, catalog=None):
+        """messages/<locale>.json, reusing an already loaded MessageCatalog; lines are resolved on demand"""
+        stack = cls('frontend', messages_dir)
+        catalog = catalog or MessageCatalog.load(messages_dir)
+        stack.files_read, stack.bytes_read = catalog.files_read, catalog.bytes_read
+        for locale in catalog.locales:
+            path = stack.root / f'{locale}.json'
+            column = catalog.columns[locale]
+            stack.locales[locale] = {catalog.keys[row]: value for row, value in enumerate(column)
+                                     if isinstance(value, str)}
+            for key in stack.locales[locale]:
+                stack.locations[(locale, key)] = (path, None)
+        return stack
+
+    @classmethod
+    def load_backend(cls, lang_dir):
+        """lang/<locale>.json and lang/<locale>/<group>.php; unparsable files are recorded in errors"""
+        stack = cls('backend', lang_dir)
+        for path in sorted(stack.root.glob('*.json')):
+            try:
+                entries = json.loads(stack._read(path))
+            except ValueError as e:
+                stack.errors.append(f'{path.name}: {e}')
+                continue
+            lines = key_lines(path)
+            for source, value in entries.items():
+                if isinstance(value, str):
+                    stack.add(path.stem, f'{JSON_GROUP}:{source}', value, path, lines.get(source))
+        for path in sorted(stack.root.glob('*/*.php')):
+            locale, group = path.parent.name, path.stem
+            try:
+                tree, lines = parse_php_array(stack._read(path), path.name)
+            except LangParseError as e:
+                stack.errors.append(f'{locale}/{e}')
+                continue
+            for key, value in flatten(tree):
+                if isinstance(value, str):
+                    stack.add(locale, f'{group}.{key}', value, path, lines.get(key))
+        return stack
+
+    def location(self, locale, key):
+        """(path, line) of an entry, reading JSON line numbers only when asked"""
+        path, line = self.locations[(locale, key)]
+        if line is None and self.name == 'frontend':
+            if not hasattr(self, '_lines'):
+                self._lines = {}
+            if locale not in self._lines:
+                self._lines[locale] = key_lines(path)
+            line = self._lines[locale].get(key)
+        return path, line
+
+
+class ParityReport:
+    """Coverage of every locale in both stacks and consistency of the strings they share"""
+
+    def __init__(self, frontend, backend):
+        self.frontend = frontend
+        self.backend = backend
+
+    def index_sources(self):
+        """{normalized English text: {stack name: [keys]}} over both stacks, in one pass each"""
+        index = defaultdict(lambda: defaultdict(list))
+        for stack in (self.frontend, self.backend):
+            # dict.fromkeys keeps document order, so reports are stable between runs
+            keys = dict.fromkeys(stack.locales.get(SOURCE_LOCALE, {}))
+            keys.update(dict.fromkeys(key for locale in sorted(stack.locales) for key in stack.locales[locale]
+                                      if key.startswith(f'{JSON_GROUP}:')))
+            for key in keys:
+                source = stack.source(key)
+                if isinstance(source, str) and source.strip():
+                    index[normalize(source)][stack.name].append(key)
+        return index
+
+    def coverage(self, stack):
+        """Per target locale: reference keys, missing keys and keys left in English
+
+        Groups the stack has no English file for (Laravel ships those in the
+        framework) are measured against the union of every locale's keys.
+        """
+        english = stack.locales.get(SOURCE_LOCALE, {})
+        english_groups = {stack.group(key) for key in english}
+        reference = set(english)
+        for entries in stack.locales.values():
+            reference.update(key for key in entries if stack.group(key) not in english_groups)
+
+        coverage = {}
+        for locale in sorted(stack.locales):
+            if locale == SOURCE_LOCALE:
+                continue
+            entries = stack.locales[locale]
+            missing = sorted(key for key in reference if key not in entries)
+            untranslated = sorted(
+                key for key in reference
+                if key in entries and entries[key] == stack.source(key) and not is_technical(entries[key])
+                and len(entries[key]) > 1 and any(ch.isalpha() for ch in entries[key])
+            )
+            coverage[locale] = {
+                'keys': len(reference),
+                'present': len(reference) - len(missing),
+                'missing': missing,
+                'untranslated': untranslated,
+            }
+        return coverage
+
+    def inconsistencies(self, shared):
+        """(source, locale) pairs whose frontend and backend translations never agree
+
+        Translations are compared casefolded, so "Ver detalles" and "Ver Detalles" agree.
+        """
+        found = []
+        locales = sorted(set(self.frontend.locales) & set(self.backend.locales) - {SOURCE_LOCALE})
+        for source, stacks in shared.items():
+            for locale in locales:
+                sides = {}
+                for stack in (self.frontend, self.backend):
+                    entries = stack.locales[locale]
+                    sides[stack.name] = {key: entries[key] for key in stacks[stack.name]
+                                         if key in entries and normalize(entries[key]).casefold() != source.casefold()}
+                frontend, backend = sides['frontend'], sides['backend']
+                if frontend and backend and not ({normalize(v).casefold() for v in frontend.values()} &
+                                                 {normalize(v).casefold() for v in backend.values()}):
+                    found.append({'source': source, 'locale': locale, 'frontend': frontend, 'backend': backend})
+        return found
+
+    def run(self):
+        started = time.perf_counter()
+        index = self.index_sources()
+        shared = {source: stacks for source, stacks in index.items() if len(stacks) == 2}
+        inconsistent = self.inconsistencies(shared)
+        frontend_locales, backend_locales = set(self.frontend.locales), set(self.backend.locales)
+        return {
+            'locales': {
+                'frontend_only': sorted(frontend_locales - backend_locales),
+                'backend_only': sorted(backend_locales - frontend_locales),
+            },
+            'coverage': {'frontend': self.coverage(self.frontend), 'backend': self.coverage(self.backend)},
+            'sources': len(index),
+            'shared': shared,
+            'shared_bytes': sum(len(source.encode('utf-8')) for source in shared),
+            'inconsistent': inconsistent,
+            'inconsistent_sources': len({item['source'] for item in inconsistent}),
+            'errors': self.backend.errors,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def load(base_path, backend_lang=None, catalog=None):
+    """(frontend, backend) stack catalogs; backend is None when its lang/ directory is absent"""
+    base_path = Path(base_path)
+    frontend = StackCatalog.load_frontend(base_path / 'messages', catalog)
+    lang_dir = Path(backend_lang) if backend_lang else base_path / DEFAULT_BACKEND_LANG
+    backend = StackCatalog.load_backend(lang_dir) if lang_dir.is_dir() else None
+    return frontend, backend
+
+
+def print_report(report):
+    print(f"🌍 {report['sources']} English source strings, {len(report['shared'])} used by both stacks "
+          f"({report['shared_bytes'] / 1024:.1f} KiB translated twice) - {report['elapsed_ms']} ms")
+    for stack, locales in report['locales'].items():
+        if locales:
+            print(f"   ⚠️  Only in the {stack.replace('_only', '')}: {', '.join(locales)}")
+    for error in report['errors']:
+        print(f"   ❌ {error}")
+
+    for stack, coverage in report['coverage'].items():
+        print(f"\n📊 {stack.upper()} COVERAGE:")
+        for locale, entry in coverage.items():
+            print(f"   {locale}: {entry['present']}/{entry['keys']} keys, {len(entry['missing'])} missing, "
+                  f"{len(entry['untranslated'])} still English")
+
+    if report['inconsistent']:
+        print(f"\n🔀 INCONSISTENT TRANSLATIONS: {len(report['inconsistent'])} locale pairs "
+              f"across {report['inconsistent_sources']} strings")
+        for item in report['inconsistent'][:15]:
+            frontend = '; '.join(f'{k} = {v!r}' for k, v in item['frontend'].items())
+            backend = '; '.join(f'{k} = {v!r}' for k, v in item['backend'].items())
+            print(f"   [{item['locale']}] {item['source']!r}\n      frontend: {frontend}\n      backend:  {backend}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the frontend and Laravel backend translations')
+    parser.add_argument('base_path', nargs='?', default='/home/x/Documents/scout/scout-safe-pay-frontend')
+    parser.add_argument('--backend', help=f'Laravel lang/ directory (default: <base_path>/{DEFAULT_BACKEND_LANG})')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    args = parser.parse_args()
+
+    frontend, backend = load(args.base_path, args.backend)
+    if backend is None:
+        print(f"❌ No backend lang/ directory at {args.backend or Path(args.base_path) / DEFAULT_BACKEND_LANG}")
+        return 1
+    report = ParityReport(frontend, backend).run()
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    exit(main())